@@ -0,0 +1,425 @@
+import math
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy
+import psutil
+
+import faceswap_colab.processors.choices
+from faceswap_colab import logger, profiler, state_manager, translator
+from faceswap_colab.audio import create_empty_audio_frame
+from faceswap_colab.cli_helper import render_table
+from faceswap_colab.face_analyser import create_faces, resolve_face_attributes
+from faceswap_colab.face_helper import WARP_TEMPLATE_SET
+from faceswap_colab.face_store import clear_static_faces, create_frame_key, create_vision_hash, set_static_faces
+from faceswap_colab.json import read_json, write_json
+from faceswap_colab.processors.core import get_processors_modules
+from faceswap_colab.processors.types import ProcessorInputs
+from faceswap_colab.types import BenchmarkAnalysisSet, BenchmarkResolution, BenchmarkSuiteKey, BenchmarkSuiteSet, Face, FaceAttribute, Resolution, VisionFrame
+from faceswap_colab.vision import extract_vision_mask, pack_resolution, read_image, read_static_image, write_image
+
+BENCHMARK_SUITE_RSS_INTERVAL : float = 0.01
+BENCHMARK_SUITE_FACE_SCALE : float = 0.8
+BENCHMARK_SUITE_FACE_ATTRIBUTES : List[FaceAttribute] = [ 'embedding', 'classification' ]
+BENCHMARK_SUITE_ANALYSIS_CONFIGURATIONS : Dict[str, Dict[str, Any]] =\
+{
+	'face_enhancer': {},
+	'face_enhancer/one':
+	{
+		'face_selector_mode': 'one'
+	},
+	'face_enhancer/reference':
+	{
+		'face_selector_mode': 'reference'
+	},
+	'face_enhancer/gender':
+	{
+		'face_selector_gender': 'female'
+	},
+	'face_enhancer/race':
+	{
+		'face_selector_race': 'white'
+	},
+	'face_enhancer/age':
+	{
+		'face_selector_age_start': 20,
+		'face_selector_age_end': 40
+	},
+	'face_swapper':
+	{
+		'processors': [ 'face_swapper' ]
+	},
+	'face_swapper/gender':
+	{
+		'processors': [ 'face_swapper' ],
+		'face_selector_gender': 'female'
+	}
+}
+
+
+def run() -> List[BenchmarkSuiteSet]:
+	benchmark_suites = []
+	temp_directory_path = tempfile.mkdtemp(dir = state_manager.get_item('temp_path'))
+	random_generator = numpy.random.default_rng(0)
+	source_face = create_synthetic_face(random_generator, (256, 256), 384)
+	source_path = os.path.join(temp_directory_path, 'source.png')
+
+	write_image(source_path, random_generator.integers(0, 255, (512, 512, 3), dtype = numpy.uint8))
+	set_static_faces(create_vision_hash(read_static_image(source_path)), [ source_face ])
+	state_manager.init_item('source_paths', [ source_path ])
+	state_manager.init_item('face_selector_mode', 'many')
+
+	for processor_module in get_processors_modules(state_manager.get_item('processors')):
+		processor_name = processor_module.__name__.split('.')[-2]
+
+		for model_name in resolve_model_names(processor_name):
+			state_manager.init_item(processor_name + '_model', model_name)
+
+			if processor_module.pre_check():
+				for benchmark_resolution in state_manager.get_item('benchmark_resolutions'):
+					for thread_count in state_manager.get_item('benchmark_thread_counts'):
+						for face_count in state_manager.get_item('benchmark_face_counts'):
+							benchmark_suites.append(cycle(processor_module, benchmark_resolution, thread_count, face_count, source_face, temp_directory_path))
+
+			processor_module.clear_inference_pool()
+
+	shutil.rmtree(temp_directory_path, ignore_errors = True)
+	clear_static_faces()
+	return benchmark_suites
+
+
+def resolve_model_names(processor_name : str) -> List[Optional[str]]:
+	processor_models = getattr(faceswap_colab.processors.choices, processor_name + '_models', [])
+	model_names = [ model_name for model_name in state_manager.get_item('benchmark_models') or [] if model_name in processor_models ]
+
+	if model_names:
+		return model_names
+	return [ state_manager.get_item(processor_name + '_model') ]
+
+
+def cycle(processor_module : ModuleType, benchmark_resolution : BenchmarkResolution, thread_count : int, face_count : int, source_face : Face, temp_directory_path : str) -> BenchmarkSuiteSet:
+	processor_name = processor_module.__name__.split('.')[-2]
+	cycle_count = state_manager.get_item('benchmark_cycle_count')
+	frame_total = cycle_count * thread_count
+	resolution = resolve_resolution(benchmark_resolution)
+	random_generator = numpy.random.default_rng(0)
+	target_vision_frames = []
+	state_manager.init_item('execution_thread_count', thread_count)
+
+	io_start_time = perf_counter()
+
+	for frame_number in range(frame_total):
+		temp_frame_path = os.path.join(temp_directory_path, str(frame_number) + '.' + state_manager.get_item('temp_frame_format'))
+		write_image(temp_frame_path, create_synthetic_frame(random_generator, resolution))
+		target_vision_frames.append(read_image(temp_frame_path))
+
+	io_time = perf_counter() - io_start_time
+
+	target_vision_keys = [ create_frame_key(pack_resolution(resolution) + '/' + str(face_count), frame_number) for frame_number in range(frame_total) ]
+
+	for target_vision_key in target_vision_keys:
+		set_static_faces(target_vision_key, create_synthetic_faces(random_generator, resolution, face_count))
+
+	process_frame(processor_module, target_vision_frames[0], target_vision_keys[0], source_face)
+	stop_event = threading.Event()
+	peak_rss = [ psutil.Process().memory_info().rss ]
+	rss_thread = threading.Thread(target = sample_peak_rss, args = (stop_event, peak_rss), daemon = True)
+	rss_thread.start()
+	profiler.clear_profiler()
+	profiler.enable_profiler()
+	process_start_time = perf_counter()
+
+	with ThreadPoolExecutor(max_workers = thread_count, initializer = state_manager.set_state_snapshot, initargs = (state_manager.create_state_snapshot(),)) as executor:
+		for future in [ executor.submit(process_frame, processor_module, target_vision_frame, target_vision_key, source_face) for target_vision_frame, target_vision_key in zip(target_vision_frames, target_vision_keys) ]:
+			future.result()
+
+	process_time = perf_counter() - process_start_time
+	profiler.disable_profiler()
+	stop_event.set()
+	rss_thread.join()
+
+	return\
+	{
+		'processor': processor_name,
+		'model': str(state_manager.get_item(processor_name + '_model')),
+		'resolution': pack_resolution(resolution),
+		'thread_count': thread_count,
+		'face_count': face_count,
+		'cycle_count': cycle_count,
+		'process_time': round(process_time / frame_total * 1000, 3),
+		'io_time': round(io_time / frame_total * 1000, 3),
+		'relative_fps': round(frame_total / process_time, 2),
+		'peak_rss': round(peak_rss[0] / 1024 / 1024, 2),
+		'stages': profiler.summarize_profiler()
+	}
+
+
+def run_analysis() -> List[BenchmarkAnalysisSet]:
+	benchmark_analyses = []
+
+	for configuration_name, configuration_items in BENCHMARK_SUITE_ANALYSIS_CONFIGURATIONS.items():
+		state_manager.init_item('processors', [ 'face_enhancer' ])
+		state_manager.init_item('face_selector_mode', 'many')
+		state_manager.init_item('face_selector_gender', None)
+		state_manager.init_item('face_selector_race', None)
+		state_manager.init_item('face_selector_age_start', None)
+		state_manager.init_item('face_selector_age_end', None)
+
+		for key, value in configuration_items.items():
+			state_manager.init_item(key, value) #type:ignore[arg-type]
+
+		for benchmark_resolution in state_manager.get_item('benchmark_resolutions'):
+			for face_count in state_manager.get_item('benchmark_face_counts'):
+				benchmark_analyses.append(cycle_analysis(configuration_name, benchmark_resolution, face_count))
+
+	return benchmark_analyses
+
+
+def cycle_analysis(configuration_name : str, benchmark_resolution : BenchmarkResolution, face_count : int) -> BenchmarkAnalysisSet:
+	cycle_count = state_manager.get_item('benchmark_cycle_count')
+	resolution = resolve_resolution(benchmark_resolution)
+	random_generator = numpy.random.default_rng(0)
+	face_attributes = resolve_face_attributes()
+	target_vision_frame = create_synthetic_frame(random_generator, resolution)
+	target_faces = create_synthetic_faces(random_generator, resolution, face_count)
+
+	analyse_faces(target_vision_frame, target_faces, BENCHMARK_SUITE_FACE_ATTRIBUTES)
+	analysis_time = cycle_analyse_faces(target_vision_frame, target_faces, face_attributes, cycle_count)
+	full_analysis_time = cycle_analyse_faces(target_vision_frame, target_faces, BENCHMARK_SUITE_FACE_ATTRIBUTES, cycle_count)
+
+	return\
+	{
+		'configuration': configuration_name,
+		'face_attributes': ','.join(face_attributes) or 'none',
+		'resolution': pack_resolution(resolution),
+		'face_count': face_count,
+		'cycle_count': cycle_count,
+		'analysis_time': round(analysis_time / cycle_count * 1000, 3),
+		'relative_fps': round(cycle_count / analysis_time, 2),
+		'full_fps': round(cycle_count / full_analysis_time, 2)
+	}
+
+
+def cycle_analyse_faces(target_vision_frame : VisionFrame, target_faces : List[Face], face_attributes : List[FaceAttribute], cycle_count : int) -> float:
+	start_time = perf_counter()
+
+	for _ in range(cycle_count):
+		analyse_faces(target_vision_frame, target_faces, face_attributes)
+
+	return perf_counter() - start_time
+
+
+def analyse_faces(target_vision_frame : VisionFrame, target_faces : List[Face], face_attributes : List[FaceAttribute]) -> List[Face]:
+	bounding_boxes = numpy.array([ target_face.bounding_box for target_face in target_faces ])
+	face_scores = numpy.array([ target_face.score_set.get('detector') for target_face in target_faces ])
+	face_landmarks_5 = numpy.array([ target_face.landmark_set.get('5') for target_face in target_faces ])
+	return create_faces(target_vision_frame, bounding_boxes, face_scores, face_landmarks_5, face_attributes)
+
+
+def process_frame(processor_module : ModuleType, target_vision_frame : VisionFrame, target_vision_key : str, source_face : Face) -> VisionFrame:
+	processor_inputs : ProcessorInputs =\
+	{
+		'reference_vision_frame': target_vision_frame,
+		'reference_face': None,
+		'source_vision_frames': [],
+		'source_face': source_face,
+		'source_audio_frame': create_empty_audio_frame(),
+		'source_voice_frame': create_empty_audio_frame(),
+		'target_vision_frame': target_vision_frame,
+		'target_vision_key': target_vision_key,
+		'temp_vision_frame': target_vision_frame.copy(),
+		'temp_vision_mask': extract_vision_mask(target_vision_frame)
+	}
+	temp_vision_frame, _ = processor_module.process_frame(processor_inputs)
+	return temp_vision_frame
+
+
+def sample_peak_rss(stop_event : threading.Event, peak_rss : List[int]) -> None:
+	process = psutil.Process()
+
+	while not stop_event.wait(BENCHMARK_SUITE_RSS_INTERVAL):
+		peak_rss[0] = max(peak_rss[0], process.memory_info().rss)
+
+
+def resolve_resolution(benchmark_resolution : BenchmarkResolution) -> Resolution:
+	height = int(benchmark_resolution.rstrip('p'))
+	width = height * 16 // 9 // 2 * 2
+	return width, height
+
+
+def create_synthetic_frame(random_generator : numpy.random.Generator, resolution : Resolution) -> VisionFrame:
+	width, height = resolution
+	return random_generator.integers(0, 255, (height, width, 3), dtype = numpy.uint8)
+
+
+def create_synthetic_faces(random_generator : numpy.random.Generator, resolution : Resolution, face_count : int) -> List[Face]:
+	width, height = resolution
+	grid_size = max(1, math.ceil(math.sqrt(face_count)))
+	cell_width = width / grid_size
+	cell_height = height / grid_size
+	face_size = min(cell_width, cell_height) * BENCHMARK_SUITE_FACE_SCALE
+	faces = []
+
+	for index in range(face_count):
+		face_center = ((index % grid_size + 0.5) * cell_width, (index // grid_size + 0.5) * cell_height)
+		faces.append(create_synthetic_face(random_generator, face_center, face_size))
+
+	return faces
+
+
+def create_synthetic_face(random_generator : numpy.random.Generator, face_center : Tuple[float, float], face_size : float) -> Face:
+	center_x, center_y = face_center
+	face_landmark_5 = (WARP_TEMPLATE_SET.get('arcface_112_v2') - 0.5) * face_size + face_center
+	face_angles = numpy.linspace(0, 2 * numpy.pi, 68, endpoint = False)
+	face_landmark_68 = numpy.stack([ center_x + numpy.cos(face_angles) * face_size * 0.45, center_y + numpy.sin(face_angles) * face_size * 0.45 ], axis = -1)
+	face_embedding = random_generator.standard_normal(512)
+
+	return Face(
+		bounding_box = numpy.array([ center_x - face_size / 2, center_y - face_size / 2, center_x + face_size / 2, center_y + face_size / 2 ]),
+		score_set =
+		{
+			'detector': 1.0,
+			'landmarker': 1.0
+		},
+		landmark_set =
+		{
+			'5': face_landmark_5,
+			'5/68': face_landmark_5,
+			'68': face_landmark_68,
+			'68/5': face_landmark_68
+		},
+		angle = 0,
+		embedding = face_embedding,
+		embedding_norm = face_embedding / numpy.linalg.norm(face_embedding),
+		gender = 'female',
+		age = range(20, 30),
+		race = 'white'
+	)
+
+
+def create_benchmark_suite_key(benchmark_suite : BenchmarkSuiteSet) -> BenchmarkSuiteKey:
+	return benchmark_suite.get('processor'), benchmark_suite.get('model'), benchmark_suite.get('resolution'), benchmark_suite.get('thread_count'), benchmark_suite.get('face_count')
+
+
+def read_benchmark_suites(benchmark_path : str) -> List[BenchmarkSuiteSet]:
+	benchmark_content = read_json(benchmark_path)
+
+	if benchmark_content:
+		return benchmark_content.get('benchmark_suites', [])
+	return []
+
+
+def write_benchmark_suites(benchmark_path : str, benchmark_suites : List[BenchmarkSuiteSet]) -> bool:
+	return write_json(benchmark_path,
+	{
+		'benchmark_suites': benchmark_suites
+	})
+
+
+def render() -> None:
+	benchmark_suites = run()
+	headers =\
+	[
+		'processor',
+		'model',
+		'resolution',
+		'thread_count',
+		'face_count',
+		'cycle_count',
+		'process_time',
+		'io_time',
+		'relative_fps',
+		'peak_rss'
+	]
+	contents = [ [ benchmark_suite.get(header) for header in headers ] for benchmark_suite in benchmark_suites ]
+	render_table(headers, contents)
+	render_stages(benchmark_suites)
+	render_analysis(run_analysis())
+
+	if state_manager.get_item('benchmark_compare_path'):
+		render_compare(read_benchmark_suites(state_manager.get_item('benchmark_compare_path')), benchmark_suites)
+
+	if state_manager.get_item('benchmark_output_path'):
+		if write_benchmark_suites(state_manager.get_item('benchmark_output_path'), benchmark_suites):
+			logger.info(translator.get('writing_benchmark_succeeded').format(benchmark_path = state_manager.get_item('benchmark_output_path')), __name__)
+		else:
+			logger.error(translator.get('writing_benchmark_failed').format(benchmark_path = state_manager.get_item('benchmark_output_path')), __name__)
+
+
+def render_stages(benchmark_suites : List[BenchmarkSuiteSet]) -> None:
+	headers =\
+	[
+		'processor',
+		'resolution',
+		'thread_count',
+		'face_count',
+		'stage_name',
+		'call_count',
+		'average_time',
+		'p90_time'
+	]
+	contents = []
+
+	for benchmark_suite in benchmark_suites:
+		for profiler_summary in benchmark_suite.get('stages'):
+			contents.append([ benchmark_suite.get('processor'), benchmark_suite.get('resolution'), benchmark_suite.get('thread_count'), benchmark_suite.get('face_count'), profiler_summary.get('stage_name'), profiler_summary.get('call_count'), profiler_summary.get('average_time'), profiler_summary.get('p90_time') ])
+
+	if contents:
+		render_table(headers, contents)
+
+
+def render_analysis(benchmark_analyses : List[BenchmarkAnalysisSet]) -> None:
+	headers =\
+	[
+		'configuration',
+		'face_attributes',
+		'resolution',
+		'face_count',
+		'cycle_count',
+		'analysis_time',
+		'relative_fps',
+		'full_fps',
+		'difference'
+	]
+	contents = []
+
+	for benchmark_analysis in benchmark_analyses:
+		difference = (benchmark_analysis.get('relative_fps') / benchmark_analysis.get('full_fps') - 1) * 100
+		contents.append([ benchmark_analysis.get(header) for header in headers[:-1] ] + [ '{:+.1f}%'.format(difference) ])
+
+	if contents:
+		render_table(headers, contents)
+
+
+def render_compare(previous_benchmark_suites : List[BenchmarkSuiteSet], benchmark_suites : List[BenchmarkSuiteSet]) -> None:
+	previous_benchmark_suite_set : Dict[BenchmarkSuiteKey, BenchmarkSuiteSet] = { create_benchmark_suite_key(benchmark_suite): benchmark_suite for benchmark_suite in previous_benchmark_suites }
+	headers =\
+	[
+		'processor',
+		'model',
+		'resolution',
+		'thread_count',
+		'face_count',
+		'previous_fps',
+		'relative_fps',
+		'difference'
+	]
+	contents = []
+
+	for benchmark_suite in benchmark_suites:
+		previous_benchmark_suite = previous_benchmark_suite_set.get(create_benchmark_suite_key(benchmark_suite))
+
+		if previous_benchmark_suite and previous_benchmark_suite.get('relative_fps'):
+			difference = (benchmark_suite.get('relative_fps') / previous_benchmark_suite.get('relative_fps') - 1) * 100
+			contents.append(list(create_benchmark_suite_key(benchmark_suite)) + [ previous_benchmark_suite.get('relative_fps'), benchmark_suite.get('relative_fps'), '{:+.1f}%'.format(difference) ])
+
+	if contents:
+		render_table(headers, contents)
+	else:
+		logger.warn(translator.get('comparing_benchmark_skipped').format(benchmark_path = state_manager.get_item('benchmark_compare_path')), __name__)
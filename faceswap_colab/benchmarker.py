@@ -6,7 +6,7 @@ from time import perf_counter
 from typing import Iterator, List
 
 import faceswap_colab.choices
-from faceswap_colab import content_analyser, core, state_manager
+from faceswap_colab import content_analyser, core, profiler, state_manager
 from faceswap_colab.cli_helper import render_table
 from faceswap_colab.download import conditional_download, resolve_download_url
 from faceswap_colab.face_store import clear_static_faces
@@ -43,6 +43,7 @@ def run() -> Iterator[List[BenchmarkCycleSet]]:
 	state_manager.init_item('video_memory_strategy', 'tolerant')
 
 	benchmarks = []
+	profiler.clear_profiler()
 	target_paths = [ faceswap_colab.choices.benchmark_set.get(benchmark_resolution) for benchmark_resolution in benchmark_resolutions if benchmark_resolution in faceswap_colab.choices.benchmark_set ]
 
 	for target_path in target_paths:
@@ -60,6 +61,8 @@ def cycle(cycle_count : int) -> BenchmarkCycleSet:
 	if state_manager.get_item('benchmark_mode') == 'warm':
 		core.conditional_process()
 
+	profiler.enable_profiler()
+
 	for index in range(cycle_count):
 		if state_manager.get_item('benchmark_mode') == 'cold':
 			content_analyser.analyse_image.cache_clear()
@@ -71,6 +74,8 @@ def cycle(cycle_count : int) -> BenchmarkCycleSet:
 		end_time = perf_counter()
 		process_times.append(end_time - start_time)
 
+	profiler.disable_profiler()
+
 	average_run = round(statistics.mean(process_times), 2)
 	fastest_run = round(min(process_times), 2)
 	slowest_run = round(max(process_times), 2)
@@ -109,3 +114,21 @@ def render() -> None:
 
 	contents = [ list(benchmark_set.values()) for benchmark_set in benchmarks ]
 	render_table(headers, contents)
+	render_profiler()
+
+
+def render_profiler() -> None:
+	headers =\
+	[
+		'stage_name',
+		'call_count',
+		'total_time',
+		'average_time',
+		'p50_time',
+		'p90_time',
+		'p99_time'
+	]
+	contents = [ list(profiler_summary.values()) for profiler_summary in profiler.summarize_profiler() ]
+
+	if contents:
+		render_table(headers, contents)
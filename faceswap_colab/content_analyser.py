@@ -1,19 +1,31 @@
+import math
 from functools import lru_cache
-from typing import List, Tuple
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy
+from numpy.typing import NDArray
 from tqdm import tqdm
 
 from faceswap_colab import inference_manager, state_manager, translator
-from faceswap_colab.common_helper import is_macos
+from faceswap_colab.common_helper import get_first, is_macos
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from faceswap_colab.execution import has_execution_provider
 from faceswap_colab.filesystem import resolve_relative_path
 from faceswap_colab.thread_helper import conditional_thread_semaphore
-from faceswap_colab.types import Detection, DownloadScope, DownloadSet, ExecutionProvider, Fps, InferencePool, ModelSet, VisionFrame
+from faceswap_colab.types import ContentAnalyserStatistics, ContentAnalysis, Detection, DownloadScope, DownloadSet, ExecutionProvider, Fps, InferencePool, ModelSet, VisionFrame
 from faceswap_colab.vision import detect_video_fps, fit_contain_frame, read_image, read_video_frame
 
 STREAM_COUNTER = 0
+CONTENT_ANALYSIS_RATE : float = 10.0
+CONTENT_ANALYSIS_BATCH : int = 8
+CONTENT_ANALYSER_LATENCY_SET : Dict[str, float] = {}
+CONTENT_ANALYSER_LATENCY_SMOOTHING : float = 0.2
+CONTENT_ANALYSER_STATISTICS : ContentAnalyserStatistics =\
+{
+	'run_count': 0,
+	'save_count': 0
+}
 
 
 @lru_cache()
@@ -166,59 +178,148 @@ def analyse_image(image_path : str) -> bool:
 def analyse_video(video_path : str, trim_frame_start : int, trim_frame_end : int) -> bool:
 	video_fps = detect_video_fps(video_path)
 	frame_range = range(trim_frame_start, trim_frame_end)
-	rate = 0.0
-	total = 0
-	counter = 0
+	content_analysis = create_content_analysis(len(frame_range), video_fps)
 
 	with tqdm(total = len(frame_range), desc = translator.get('analysing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
 
 		for frame_number in frame_range:
-			if frame_number % int(video_fps) == 0:
-				vision_frame = read_video_frame(video_path, frame_number)
-				total += 1
+			if resolve_content_analysis(content_analysis) is not None:
+				break
 
-				if analyse_frame(vision_frame):
-					counter += 1
+			if is_content_sample(frame_number - trim_frame_start, video_fps):
+				collect_content_frame(content_analysis, read_video_frame(video_path, frame_number))
 
-			if counter > 0 and total > 0:
-				rate = counter / total * 100
-
-			progress.set_postfix(rate = rate)
+			progress.set_postfix(rate = calculate_content_rate(content_analysis))
 			progress.update()
 
-	return bool(rate > 10.0)
+	return finalize_content_analysis(content_analysis)
+
+
+def create_content_analysis(frame_total : int, video_fps : Fps) -> ContentAnalysis:
+	return\
+	{
+		'sample_total': math.ceil(frame_total / max(int(video_fps), 1)),
+		'sample_count': 0,
+		'nsfw_count': 0,
+		'vision_frames': []
+	}
+
+
+def is_content_sample(frame_number : int, video_fps : Fps) -> bool:
+	return frame_number % max(int(video_fps), 1) == 0
+
+
+def collect_content_frame(content_analysis : ContentAnalysis, vision_frame : VisionFrame) -> None:
+	if resolve_content_analysis(content_analysis) is None:
+		content_analysis.get('vision_frames').append(vision_frame)
+
+		if len(content_analysis.get('vision_frames')) >= CONTENT_ANALYSIS_BATCH:
+			flush_content_analysis(content_analysis)
+
+
+def flush_content_analysis(content_analysis : ContentAnalysis) -> None:
+	vision_frames = content_analysis.get('vision_frames')
+
+	if vision_frames:
+		content_analysis['sample_count'] += len(vision_frames)
+		content_analysis['nsfw_count'] += int(numpy.sum(detect_nsfw_frames(vision_frames)))
+		vision_frames.clear()
+
+
+def resolve_content_analysis(content_analysis : ContentAnalysis) -> Optional[bool]:
+	sample_limit = content_analysis.get('sample_total') * CONTENT_ANALYSIS_RATE / 100
+	sample_remain = max(content_analysis.get('sample_total') - content_analysis.get('sample_count'), 0)
+
+	if content_analysis.get('nsfw_count') > sample_limit:
+		return True
+	if content_analysis.get('nsfw_count') + sample_remain <= sample_limit:
+		return False
+	return None
+
+
+def calculate_content_rate(content_analysis : ContentAnalysis) -> float:
+	if content_analysis.get('sample_count') > 0:
+		return content_analysis.get('nsfw_count') / content_analysis.get('sample_count') * 100
+	return 0.0
+
+
+def finalize_content_analysis(content_analysis : ContentAnalysis) -> bool:
+	flush_content_analysis(content_analysis)
+	return resolve_content_analysis(content_analysis) is True or calculate_content_rate(content_analysis) > CONTENT_ANALYSIS_RATE
 
 
 def detect_nsfw(vision_frame : VisionFrame) -> bool:
-	is_nsfw_1 = detect_with_nsfw_1(vision_frame)
-	is_nsfw_2 = detect_with_nsfw_2(vision_frame)
-	is_nsfw_3 = detect_with_nsfw_3(vision_frame)
+	return bool(get_first(detect_nsfw_frames([ vision_frame ])))
+
+
+def detect_nsfw_frames(vision_frames : List[VisionFrame]) -> NDArray[Any]:
+	nsfw_votes = numpy.zeros(len(vision_frames), dtype = numpy.int32)
+	safe_votes = numpy.zeros(len(vision_frames), dtype = numpy.int32)
+
+	for model_name in sort_nsfw_models():
+		vote_indices = numpy.flatnonzero((nsfw_votes < 2) & (safe_votes < 2))
+		CONTENT_ANALYSER_STATISTICS['run_count'] += len(vote_indices)
+		CONTENT_ANALYSER_STATISTICS['save_count'] += len(vision_frames) - len(vote_indices)
+
+		if len(vote_indices) > 0:
+			is_nsfw = detect_with_nsfw_model([ vision_frames[vote_index] for vote_index in vote_indices ], model_name)
+			nsfw_votes[vote_indices] += is_nsfw
+			safe_votes[vote_indices] += ~is_nsfw
+
+	return nsfw_votes >= 2
+
+
+def sort_nsfw_models() -> List[str]:
+	return sorted([ 'nsfw_1', 'nsfw_2', 'nsfw_3' ], key = lambda model_name: CONTENT_ANALYSER_LATENCY_SET.get(model_name, 0.0))
 
-	return is_nsfw_1 and is_nsfw_2 or is_nsfw_1 and is_nsfw_3 or is_nsfw_2 and is_nsfw_3
 
+def detect_with_nsfw_model(vision_frames : List[VisionFrame], model_name : str) -> NDArray[Any]:
+	start_time = perf_counter()
 
-def detect_with_nsfw_1(vision_frame : VisionFrame) -> bool:
-	detect_vision_frame = prepare_detect_frame(vision_frame, 'nsfw_1')
-	detection = forward_nsfw(detect_vision_frame, 'nsfw_1')
-	detection_score = numpy.max(numpy.amax(detection[:, 4:], axis = 1))
-	return bool(detection_score > 0.2)
+	if model_name == 'nsfw_1':
+		is_nsfw = detect_with_nsfw_1(vision_frames)
+	if model_name == 'nsfw_2':
+		is_nsfw = detect_with_nsfw_2(vision_frames)
+	if model_name == 'nsfw_3':
+		is_nsfw = detect_with_nsfw_3(vision_frames)
 
+	frame_latency = (perf_counter() - start_time) / len(vision_frames)
+	model_latency = CONTENT_ANALYSER_LATENCY_SET.get(model_name, frame_latency)
+	CONTENT_ANALYSER_LATENCY_SET[model_name] = model_latency + (frame_latency - model_latency) * CONTENT_ANALYSER_LATENCY_SMOOTHING
+	return is_nsfw.astype(bool)
 
-def detect_with_nsfw_2(vision_frame : VisionFrame) -> bool:
-	detect_vision_frame = prepare_detect_frame(vision_frame, 'nsfw_2')
-	detection = forward_nsfw(detect_vision_frame, 'nsfw_2')
-	detection_score = detection[0] - detection[1]
-	return bool(detection_score > 0.25)
 
+def get_content_analyser_statistics() -> ContentAnalyserStatistics:
+	return CONTENT_ANALYSER_STATISTICS
 
-def detect_with_nsfw_3(vision_frame : VisionFrame) -> bool:
-	detect_vision_frame = prepare_detect_frame(vision_frame, 'nsfw_3')
-	detection = forward_nsfw(detect_vision_frame, 'nsfw_3')
-	detection_score = (detection[2] + detection[3]) - (detection[0] + detection[1])
-	return bool(detection_score > 10.5)
 
+def clear_content_analyser_statistics() -> None:
+	CONTENT_ANALYSER_STATISTICS['run_count'] = 0
+	CONTENT_ANALYSER_STATISTICS['save_count'] = 0
 
-def forward_nsfw(vision_frame : VisionFrame, model_name : str) -> Detection:
+
+def detect_with_nsfw_1(vision_frames : List[VisionFrame]) -> NDArray[Any]:
+	detect_vision_frames = prepare_detect_frames(vision_frames, 'nsfw_1')
+	detections = forward_nsfw(detect_vision_frames, 'nsfw_1')
+	detection_scores = numpy.amax(detections[:, 4:], axis = (1, 2))
+	return detection_scores > 0.2
+
+
+def detect_with_nsfw_2(vision_frames : List[VisionFrame]) -> NDArray[Any]:
+	detect_vision_frames = prepare_detect_frames(vision_frames, 'nsfw_2')
+	detections = forward_nsfw(detect_vision_frames, 'nsfw_2')
+	detection_scores = detections[:, 0] - detections[:, 1]
+	return detection_scores > 0.25
+
+
+def detect_with_nsfw_3(vision_frames : List[VisionFrame]) -> NDArray[Any]:
+	detect_vision_frames = prepare_detect_frames(vision_frames, 'nsfw_3')
+	detections = forward_nsfw(detect_vision_frames, 'nsfw_3')
+	detection_scores = (detections[:, 2] + detections[:, 3]) - (detections[:, 0] + detections[:, 1])
+	return detection_scores > 10.5
+
+
+def forward_nsfw(vision_frames : VisionFrame, model_name : str) -> Detection:
 	content_analyser = get_inference_pool().get(model_name)
 	
 	if content_analyser is None:
@@ -229,31 +330,32 @@ def forward_nsfw(vision_frame : VisionFrame, model_name : str) -> Detection:
 		if content_analyser is None:
 			# Si aún no se puede cargar, devolver detección segura (no NSFW)
 			if model_name == 'nsfw_1':
-				return numpy.zeros((1, 85))  # Formato esperado para nsfw_1
+				return numpy.zeros((len(vision_frames), 85, 1))  # Formato esperado para nsfw_1: 4 valores de caja + 81 clases
 			else:
-				return numpy.array([1.0, 0.0, 0.0, 0.0])  # Formato esperado para nsfw_2/3
+				return numpy.tile([ 1.0, 0.0, 0.0, 0.0 ], (len(vision_frames), 1))  # Formato esperado para nsfw_2/3
 
-	with conditional_thread_semaphore():
-		detection = content_analyser.run(None,
-		{
-			'input': vision_frame
-		})[0]
+	batch_size = inference_manager.detect_batch_size(content_analyser) or len(vision_frames)
+	detections = []
 
-	if model_name in [ 'nsfw_2', 'nsfw_3' ]:
-		return detection[0]
+	for batch_start in range(0, len(vision_frames), batch_size):
+		batch_end = batch_start + batch_size
+		detections.append(inference_manager.run_inference(content_analyser,
+		{
+			'input': vision_frames[batch_start:batch_end]
+		}, conditional_thread_semaphore())[0])
 
-	return detection
+	return numpy.concatenate(detections)
 
 
-def prepare_detect_frame(temp_vision_frame : VisionFrame, model_name : str) -> VisionFrame:
+def prepare_detect_frames(temp_vision_frames : List[VisionFrame], model_name : str) -> VisionFrame:
 	model_set = create_static_model_set('full').get(model_name)
 	model_size = model_set.get('size')
 	model_mean = model_set.get('mean')
 	model_standard_deviation = model_set.get('standard_deviation')
 
-	detect_vision_frame = fit_contain_frame(temp_vision_frame, model_size)
-	detect_vision_frame = detect_vision_frame[:, :, ::-1] / 255.0
-	detect_vision_frame -= model_mean
-	detect_vision_frame /= model_standard_deviation
-	detect_vision_frame = numpy.expand_dims(detect_vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
-	return detect_vision_frame
+	detect_vision_frames = numpy.stack([ fit_contain_frame(temp_vision_frame, model_size) for temp_vision_frame in temp_vision_frames ])
+	detect_vision_frames = detect_vision_frames[:, :, :, ::-1] / 255.0
+	detect_vision_frames -= model_mean
+	detect_vision_frames /= model_standard_deviation
+	detect_vision_frames = detect_vision_frames.transpose(0, 3, 1, 2).astype(numpy.float32)
+	return detect_vision_frames
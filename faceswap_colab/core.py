@@ -5,7 +5,7 @@ import signal
 import sys
 from time import time
 
-from faceswap_colab import benchmarker, cli_helper, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, hash_helper, logger, state_manager, translator, voice_extractor
+from faceswap_colab import benchmark_suite, benchmarker, cli_helper, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, hash_helper, logger, state_manager, translator, voice_extractor
 from faceswap_colab.args import apply_args, collect_job_args, reduce_job_args, reduce_step_args
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources
 from faceswap_colab.exit_helper import hard_exit, signal_exit
@@ -51,9 +51,14 @@ def route(args : Args) -> None:
 		hard_exit(error_code)
 
 	if state_manager.get_item('command') == 'benchmark':
-		if not common_pre_check() or not processors_pre_check() or not benchmarker.pre_check():
+		if not common_pre_check() or not processors_pre_check():
 			hard_exit(2)
-		benchmarker.render()
+		if state_manager.get_item('benchmark_suite'):
+			benchmark_suite.render()
+		else:
+			if not benchmarker.pre_check():
+				hard_exit(2)
+			benchmarker.render()
 
 	if state_manager.get_item('command') in [ 'job-list', 'job-create', 'job-submit', 'job-submit-all', 'job-delete', 'job-delete-all', 'job-add-step', 'job-remix-step', 'job-insert-step', 'job-remove-step' ]:
 		if not job_manager.init_jobs(state_manager.get_item('jobs_path')):
@@ -2,36 +2,65 @@ from typing import List, Optional
 
 import numpy
 
+import faceswap_colab.choices
 from faceswap_colab import state_manager
 from faceswap_colab.common_helper import get_first
-from faceswap_colab.face_classifier import classify_face
-from faceswap_colab.face_detector import detect_faces, detect_faces_by_angle
+from faceswap_colab.face_classifier import classify_faces
+from faceswap_colab.face_detector import detect_faces_by_angles
 from faceswap_colab.face_helper import apply_nms, convert_to_face_landmark_5, estimate_face_angle, get_nms_threshold
-from faceswap_colab.face_landmarker import detect_face_landmark, estimate_face_landmark_68_5
-from faceswap_colab.face_recognizer import calculate_face_embedding
-from faceswap_colab.face_store import get_static_faces, set_static_faces
-from faceswap_colab.types import BoundingBox, Face, FaceLandmark5, FaceLandmarkSet, FaceScoreSet, Score, VisionFrame
+from faceswap_colab.face_landmarker import detect_face_landmarks, estimate_face_landmarks_68_5
+from faceswap_colab.face_recognizer import calculate_face_embeddings
+from faceswap_colab.face_store import get_static_faces, replace_static_faces, resolve_vision_key, set_static_faces
+from faceswap_colab.types import Age, BoundingBoxes, Embedding, Face, FaceAttribute, FaceLandmarks5, FaceLandmarkSet, FaceScoreSet, Gender, Race, Scores, VisionFrame
 
 
-def create_faces(vision_frame : VisionFrame, bounding_boxes : List[BoundingBox], face_scores : List[Score], face_landmarks_5 : List[FaceLandmark5]) -> List[Face]:
+def create_faces(vision_frame : VisionFrame, bounding_boxes : BoundingBoxes, face_scores : Scores, face_landmarks_5 : FaceLandmarks5, face_attributes : List[FaceAttribute]) -> List[Face]:
 	faces = []
 	nms_threshold = get_nms_threshold(state_manager.get_item('face_detector_model'), state_manager.get_item('face_detector_angles'))
 	keep_indices = apply_nms(bounding_boxes, face_scores, state_manager.get_item('face_detector_score'), nms_threshold)
 
-	for index in keep_indices:
-		bounding_box = bounding_boxes[index]
-		face_score = face_scores[index]
-		face_landmark_5 = face_landmarks_5[index]
-		face_landmark_5_68 = face_landmark_5
-		face_landmark_68_5 = estimate_face_landmark_68_5(face_landmark_5_68)
-		face_landmark_68 = face_landmark_68_5
-		face_landmark_score_68 = 0.0
-		face_angle = estimate_face_angle(face_landmark_68_5)
-
-		if state_manager.get_item('face_landmarker_score') > 0:
-			face_landmark_68, face_landmark_score_68 = detect_face_landmark(vision_frame, bounding_box, face_angle)
+	if len(keep_indices) == 0:
+		return faces
+
+	keep_bounding_boxes = bounding_boxes[keep_indices]
+	keep_face_scores = face_scores[keep_indices]
+	keep_face_landmarks_5 = face_landmarks_5[keep_indices]
+	face_landmarks_68_5 = estimate_face_landmarks_68_5(keep_face_landmarks_5)
+	face_angles = [ estimate_face_angle(face_landmark_68_5) for face_landmark_68_5 in face_landmarks_68_5 ]
+	face_landmarks_68 = face_landmarks_68_5
+	face_landmark_scores_68 = [ 0.0 ] * len(keep_indices)
+
+	if state_manager.get_item('face_landmarker_score') > 0:
+		face_landmarks_68, face_landmark_scores_68 = detect_face_landmarks(vision_frame, keep_bounding_boxes, face_angles)
+
+	face_landmarks_5_68 = []
+
+	for face_landmark_5, face_landmark_68, face_landmark_score_68 in zip(keep_face_landmarks_5, face_landmarks_68, face_landmark_scores_68):
 		if face_landmark_score_68 > state_manager.get_item('face_landmarker_score'):
-			face_landmark_5_68 = convert_to_face_landmark_5(face_landmark_68)
+			face_landmarks_5_68.append(convert_to_face_landmark_5(face_landmark_68))
+		else:
+			face_landmarks_5_68.append(face_landmark_5)
+
+	face_embeddings : List[Optional[Embedding]] = [ None ] * len(keep_indices)
+	face_embeddings_norm : List[Optional[Embedding]] = [ None ] * len(keep_indices)
+	genders : List[Optional[Gender]] = [ None ] * len(keep_indices)
+	ages : List[Optional[Age]] = [ None ] * len(keep_indices)
+	races : List[Optional[Race]] = [ None ] * len(keep_indices)
+
+	if 'embedding' in face_attributes:
+		face_embeddings, face_embeddings_norm = calculate_face_embeddings(vision_frame, face_landmarks_5_68)
+	if 'classification' in face_attributes:
+		genders, ages, races = classify_faces(vision_frame, face_landmarks_5_68)
+
+	for index in range(len(keep_indices)):
+		bounding_box = keep_bounding_boxes[index]
+		face_score = keep_face_scores[index]
+		face_landmark_5 = keep_face_landmarks_5[index]
+		face_landmark_5_68 = face_landmarks_5_68[index]
+		face_landmark_68 = face_landmarks_68[index]
+		face_landmark_68_5 = face_landmarks_68_5[index]
+		face_landmark_score_68 = face_landmark_scores_68[index]
+		face_angle = face_angles[index]
 
 		face_landmark_set : FaceLandmarkSet =\
 		{
@@ -45,22 +74,60 @@ def create_faces(vision_frame : VisionFrame, bounding_boxes : List[BoundingBox],
 			'detector': face_score,
 			'landmarker': face_landmark_score_68
 		}
-		face_embedding, face_embedding_norm = calculate_face_embedding(vision_frame, face_landmark_set.get('5/68'))
-		gender, age, race = classify_face(vision_frame, face_landmark_set.get('5/68'))
 		faces.append(Face(
 			bounding_box = bounding_box,
 			score_set = face_score_set,
 			landmark_set = face_landmark_set,
 			angle = face_angle,
-			embedding = face_embedding,
-			embedding_norm = face_embedding_norm,
-			gender = gender,
-			age = age,
-			race = race
+			embedding = face_embeddings[index],
+			embedding_norm = face_embeddings_norm[index],
+			gender = genders[index],
+			age = ages[index],
+			race = races[index]
 		))
 	return faces
 
 
+def complete_faces(vision_frame : VisionFrame, faces : List[Face], face_attributes : List[FaceAttribute]) -> List[Face]:
+	face_landmarks_5_68 = [ face.landmark_set.get('5/68') for face in faces ]
+
+	if 'embedding' in face_attributes and any(face.embedding is None for face in faces):
+		face_embeddings, face_embeddings_norm = calculate_face_embeddings(vision_frame, face_landmarks_5_68)
+		faces = [ face._replace(embedding = face_embedding, embedding_norm = face_embedding_norm) for face, face_embedding, face_embedding_norm in zip(faces, face_embeddings, face_embeddings_norm) ]
+	if 'classification' in face_attributes and any(face.gender is None for face in faces):
+		genders, ages, races = classify_faces(vision_frame, face_landmarks_5_68)
+		faces = [ face._replace(gender = gender, age = age, race = race) for face, gender, age, race in zip(faces, genders, ages, races) ]
+	return faces
+
+
+def has_face_attributes(faces : List[Face], face_attributes : List[FaceAttribute]) -> bool:
+	for face in faces:
+		if 'embedding' in face_attributes and face.embedding is None:
+			return False
+		if 'classification' in face_attributes and face.gender is None:
+			return False
+	return True
+
+
+def resolve_face_attributes() -> List[FaceAttribute]:
+	face_attributes : List[FaceAttribute] = []
+
+	if state_manager.get_item('face_selector_mode') == 'reference' or 'face_swapper' in state_manager.get_item('processors'):
+		face_attributes.append('embedding')
+	if state_manager.get_item('face_selector_gender') or state_manager.get_item('face_selector_race') or has_face_age_filter():
+		face_attributes.append('classification')
+	return face_attributes
+
+
+def has_face_age_filter() -> bool:
+	face_selector_age_start = state_manager.get_item('face_selector_age_start')
+	face_selector_age_end = state_manager.get_item('face_selector_age_end')
+
+	if face_selector_age_start or face_selector_age_end:
+		return face_selector_age_start != faceswap_colab.choices.face_selector_age_range[0] or face_selector_age_end != faceswap_colab.choices.face_selector_age_range[-1]
+	return False
+
+
 def get_one_face(faces : List[Face], position : int = 0) -> Optional[Face]:
 	if faces:
 		position = min(position, len(faces) - 1)
@@ -84,8 +151,8 @@ def get_average_face(faces : List[Face]) -> Optional[Face]:
 			score_set = first_face.score_set,
 			landmark_set = first_face.landmark_set,
 			angle = first_face.angle,
-			embedding = numpy.mean(face_embeddings, axis = 0),
-			embedding_norm = numpy.mean(face_embeddings_norm, axis = 0),
+			embedding = numpy.mean(face_embeddings, axis = 0) if first_face.embedding is not None else None,
+			embedding_norm = numpy.mean(face_embeddings_norm, axis = 0) if first_face.embedding_norm is not None else None,
 			gender = first_face.gender,
 			age = first_face.age,
 			race = first_face.race
@@ -93,34 +160,28 @@ def get_average_face(faces : List[Face]) -> Optional[Face]:
 	return None
 
 
-def get_many_faces(vision_frames : List[VisionFrame]) -> List[Face]:
+def get_many_faces(vision_frames : List[VisionFrame], vision_keys : Optional[List[Optional[str]]] = None) -> List[Face]:
 	many_faces : List[Face] = []
-
-	for vision_frame in vision_frames:
-		if numpy.any(vision_frame):
-			static_faces = get_static_faces(vision_frame)
-			if static_faces:
-				many_faces.extend(static_faces)
-			else:
-				all_bounding_boxes = []
-				all_face_scores = []
-				all_face_landmarks_5 = []
-
-				for face_detector_angle in state_manager.get_item('face_detector_angles'):
-					if face_detector_angle == 0:
-						bounding_boxes, face_scores, face_landmarks_5 = detect_faces(vision_frame)
-					else:
-						bounding_boxes, face_scores, face_landmarks_5 = detect_faces_by_angle(vision_frame, face_detector_angle)
-					all_bounding_boxes.extend(bounding_boxes)
-					all_face_scores.extend(face_scores)
-					all_face_landmarks_5.extend(face_landmarks_5)
-
-				if all_bounding_boxes and all_face_scores and all_face_landmarks_5 and state_manager.get_item('face_detector_score') > 0:
-					faces = create_faces(vision_frame, all_bounding_boxes, all_face_scores, all_face_landmarks_5)
-
-					if faces:
-						many_faces.extend(faces)
-						set_static_faces(vision_frame, faces)
+	face_attributes = resolve_face_attributes()
+
+	for vision_frame, vision_key in zip(vision_frames, vision_keys or [ None ] * len(vision_frames)):
+		vision_key = resolve_vision_key(vision_frame, vision_key)
+		static_faces = get_static_faces(vision_key)
+
+		if static_faces is not None:
+			if not has_face_attributes(static_faces, face_attributes):
+				static_faces = complete_faces(vision_frame, static_faces, face_attributes)
+				replace_static_faces(vision_key, static_faces)
+			many_faces.extend(static_faces)
+		elif numpy.any(vision_frame):
+			all_bounding_boxes, all_face_scores, all_face_landmarks_5 = detect_faces_by_angles(vision_frame, state_manager.get_item('face_detector_angles'))
+
+			if len(all_bounding_boxes) > 0 and state_manager.get_item('face_detector_score') > 0:
+				faces = create_faces(vision_frame, all_bounding_boxes, all_face_scores, all_face_landmarks_5, face_attributes)
+
+				if faces:
+					many_faces.extend(faces)
+					set_static_faces(vision_key, faces)
 	return many_faces
 
 
@@ -71,33 +71,41 @@ def pre_check() -> bool:
 
 
 def classify_face(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[Gender, Age, Race]:
+	genders, ages, races = classify_faces(temp_vision_frame, [ face_landmark_5 ])
+	return genders[0], ages[0], races[0]
+
+
+def classify_faces(temp_vision_frame : VisionFrame, face_landmarks_5 : List[FaceLandmark5]) -> Tuple[List[Gender], List[Age], List[Race]]:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
 	model_mean = get_model_options().get('mean')
 	model_standard_deviation = get_model_options().get('standard_deviation')
-	crop_vision_frame, _ = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
-	crop_vision_frame = crop_vision_frame.astype(numpy.float32)[:, :, ::-1] / 255.0
-	crop_vision_frame -= model_mean
-	crop_vision_frame /= model_standard_deviation
-	crop_vision_frame = crop_vision_frame.transpose(2, 0, 1)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
-	gender_id, age_id, race_id = forward(crop_vision_frame)
-	gender = categorize_gender(gender_id[0])
-	age = categorize_age(age_id[0])
-	race = categorize_race(race_id[0])
-	return gender, age, race
-
-
-def forward(crop_vision_frame : VisionFrame) -> Tuple[List[int], List[int], List[int]]:
+	crop_vision_frames = []
+
+	for face_landmark_5 in face_landmarks_5:
+		crop_vision_frame, _ = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
+		crop_vision_frames.append(crop_vision_frame)
+
+	crop_vision_frames = numpy.stack(crop_vision_frames).astype(numpy.float32)[:, :, :, ::-1] / 255.0
+	crop_vision_frames -= model_mean
+	crop_vision_frames /= model_standard_deviation
+	crop_vision_frames = crop_vision_frames.transpose(0, 3, 1, 2)
+	gender_ids, age_ids, race_ids = forward(crop_vision_frames)
+	genders = [ categorize_gender(gender_id) for gender_id in gender_ids ]
+	ages = [ categorize_age(age_id) for age_id in age_ids ]
+	races = [ categorize_race(race_id) for race_id in race_ids ]
+	return genders, ages, races
+
+
+def forward(crop_vision_frames : VisionFrame) -> Tuple[List[int], List[int], List[int]]:
 	face_classifier = get_inference_pool().get('face_classifier')
 
-	with conditional_thread_semaphore():
-		race_id, gender_id, age_id = face_classifier.run(None,
-		{
-			'input': crop_vision_frame
-		})
+	race_ids, gender_ids, age_ids = inference_manager.run_chunked_inference(face_classifier,
+	{
+		'input': crop_vision_frames
+	}, conditional_thread_semaphore())
 
-	return gender_id, age_id, race_id
+	return gender_ids, age_ids, race_ids
 
 
 def categorize_gender(gender_id : int) -> Gender:
@@ -1,17 +1,28 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from functools import lru_cache
-from typing import List, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy
 
 from faceswap_colab import inference_manager, state_manager
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
-from faceswap_colab.face_helper import create_rotation_matrix_and_size, create_static_anchors, distance_to_bounding_box, distance_to_face_landmark_5, normalize_bounding_box, transform_bounding_box, transform_points
+from faceswap_colab.face_helper import create_rotation_matrix_and_size, create_static_anchors, distance_to_bounding_box, distance_to_face_landmark_5, normalize_bounding_boxes, transform_bounding_boxes, transform_points
 from faceswap_colab.filesystem import resolve_relative_path
-from faceswap_colab.thread_helper import thread_semaphore
-from faceswap_colab.types import Angle, BoundingBox, Detection, DownloadScope, DownloadSet, FaceLandmark5, InferencePool, Margin, ModelSet, Score, VisionFrame
+from faceswap_colab.types import Angle, BoundingBoxes, Detection, DownloadScope, DownloadSet, FaceDetection, FaceDetectorModel, FaceLandmarks5, InferencePool, Margin, Matrix, ModelSet, Scores, VisionFrame
 from faceswap_colab.vision import restrict_frame, unpack_resolution
 
+FACE_DETECTOR_SEMAPHORE_SET : Dict[FaceDetectorModel, threading.Semaphore] =\
+{
+	'retinaface': threading.Semaphore(),
+	'scrfd': threading.Semaphore(),
+	'yolo_face': threading.Semaphore(),
+	'yunet': threading.Semaphore()
+}
+FACE_DETECTOR_EXECUTOR : ThreadPoolExecutor = ThreadPoolExecutor(max_workers = 3, thread_name_prefix = 'face_detector')
+
 
 @lru_cache()
 def create_static_model_set(download_scope : DownloadScope) -> ModelSet:
@@ -151,40 +162,55 @@ def pre_check() -> bool:
 	return conditional_download_hashes(model_hash_set) and conditional_download_sources(model_source_set)
 
 
-def detect_faces(vision_frame : VisionFrame) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
-	margin_top, margin_right, margin_bottom, margin_left = prepare_margin(vision_frame)
-	margin_vision_frame = numpy.pad(vision_frame, ((margin_top, margin_bottom), (margin_left, margin_right), (0, 0)))
-	all_bounding_boxes : List[BoundingBox] = []
-	all_face_scores : List[Score] = []
-	all_face_landmarks_5 : List[FaceLandmark5] = []
+def detect_faces_by_angles(vision_frame : VisionFrame, face_angles : List[Angle]) -> FaceDetection:
+	margin_vision_frames = []
+	margins = []
+	rotation_inverse_matrices = []
+	all_bounding_boxes : List[BoundingBoxes] = []
+	all_face_scores : List[Scores] = []
+	all_face_landmarks_5 : List[FaceLandmarks5] = []
+
+	for face_angle in face_angles:
+		rotation_vision_frame, rotation_inverse_matrix = rotate_detect_frame(vision_frame, face_angle)
+		margin_top, margin_right, margin_bottom, margin_left = prepare_margin(rotation_vision_frame)
+		margin_vision_frames.append(numpy.pad(rotation_vision_frame, ((margin_top, margin_bottom), (margin_left, margin_right), (0, 0))))
+		margins.append((margin_top, margin_right, margin_bottom, margin_left))
+		rotation_inverse_matrices.append(rotation_inverse_matrix)
+
+	model_face_detections = detect_with_models(margin_vision_frames)
+
+	for index, (margin_top, _, _, margin_left) in enumerate(margins):
+		rotation_inverse_matrix = rotation_inverse_matrices[index]
+
+		for face_detections in model_face_detections:
+			bounding_boxes, face_scores, face_landmarks_5 = face_detections[index]
+			bounding_boxes = normalize_bounding_boxes(bounding_boxes) - numpy.array([ margin_left, margin_top, margin_left, margin_top ])
+			face_landmarks_5 = face_landmarks_5 - numpy.array([ margin_left, margin_top ])
+
+			if rotation_inverse_matrix is not None and len(bounding_boxes) > 0:
+				bounding_boxes = transform_bounding_boxes(bounding_boxes, rotation_inverse_matrix)
+				face_landmarks_5 = transform_points(face_landmarks_5, rotation_inverse_matrix).reshape(-1, 5, 2)
+
+			all_bounding_boxes.append(bounding_boxes)
+			all_face_scores.append(face_scores)
+			all_face_landmarks_5.append(face_landmarks_5)
 
-	if state_manager.get_item('face_detector_model') in [ 'many', 'retinaface' ]:
-		bounding_boxes, face_scores, face_landmarks_5 = detect_with_retinaface(margin_vision_frame, state_manager.get_item('face_detector_size'))
-		all_bounding_boxes.extend(bounding_boxes)
-		all_face_scores.extend(face_scores)
-		all_face_landmarks_5.extend(face_landmarks_5)
+	return concatenate_face_detections(all_bounding_boxes, all_face_scores, all_face_landmarks_5)
 
-	if state_manager.get_item('face_detector_model') in [ 'many', 'scrfd' ]:
-		bounding_boxes, face_scores, face_landmarks_5 = detect_with_scrfd(margin_vision_frame, state_manager.get_item('face_detector_size'))
-		all_bounding_boxes.extend(bounding_boxes)
-		all_face_scores.extend(face_scores)
-		all_face_landmarks_5.extend(face_landmarks_5)
 
-	if state_manager.get_item('face_detector_model') in [ 'many', 'yolo_face' ]:
-		bounding_boxes, face_scores, face_landmarks_5 = detect_with_yolo_face(margin_vision_frame, state_manager.get_item('face_detector_size'))
-		all_bounding_boxes.extend(bounding_boxes)
-		all_face_scores.extend(face_scores)
-		all_face_landmarks_5.extend(face_landmarks_5)
+def concatenate_face_detections(bounding_boxes : List[BoundingBoxes], face_scores : List[Scores], face_landmarks_5 : List[FaceLandmarks5]) -> FaceDetection:
+	if bounding_boxes:
+		return numpy.concatenate(bounding_boxes), numpy.concatenate(face_scores), numpy.concatenate(face_landmarks_5)
+	return numpy.empty((0, 4)), numpy.empty(0), numpy.empty((0, 5, 2))
 
-	if state_manager.get_item('face_detector_model') == 'yunet':
-		bounding_boxes, face_scores, face_landmarks_5 = detect_with_yunet(margin_vision_frame, state_manager.get_item('face_detector_size'))
-		all_bounding_boxes.extend(bounding_boxes)
-		all_face_scores.extend(face_scores)
-		all_face_landmarks_5.extend(face_landmarks_5)
 
-	all_bounding_boxes = [ normalize_bounding_box(all_bounding_box) - numpy.array([ margin_left, margin_top, margin_left, margin_top ]) for all_bounding_box in all_bounding_boxes ]
-	all_face_landmarks_5 = [ all_face_landmark_5 - numpy.array([ margin_left, margin_top ]) for all_face_landmark_5 in all_face_landmarks_5 ]
-	return all_bounding_boxes, all_face_scores, all_face_landmarks_5
+def rotate_detect_frame(vision_frame : VisionFrame, face_angle : Angle) -> Tuple[VisionFrame, Optional[Matrix]]:
+	if face_angle == 0:
+		return vision_frame, None
+
+	rotation_matrix, rotation_size = create_rotation_matrix_and_size(face_angle, vision_frame.shape[:2][::-1])
+	rotation_vision_frame = cv2.warpAffine(vision_frame, rotation_matrix, rotation_size)
+	return rotation_vision_frame, cv2.invertAffineTransform(rotation_matrix)
 
 
 def prepare_margin(vision_frame : VisionFrame) -> Margin:
@@ -195,17 +221,87 @@ def prepare_margin(vision_frame : VisionFrame) -> Margin:
 	return margin_top, margin_right, margin_bottom, margin_left
 
 
-def detect_faces_by_angle(vision_frame : VisionFrame, face_angle : Angle) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
-	rotation_matrix, rotation_size = create_rotation_matrix_and_size(face_angle, vision_frame.shape[:2][::-1])
-	rotation_vision_frame = cv2.warpAffine(vision_frame, rotation_matrix, rotation_size)
-	rotation_inverse_matrix = cv2.invertAffineTransform(rotation_matrix)
-	bounding_boxes, face_scores, face_landmarks_5 = detect_faces(rotation_vision_frame)
-	bounding_boxes = [ transform_bounding_box(bounding_box, rotation_inverse_matrix) for bounding_box in bounding_boxes ]
-	face_landmarks_5 = [ transform_points(face_landmark_5, rotation_inverse_matrix) for face_landmark_5 in face_landmarks_5 ]
-	return bounding_boxes, face_scores, face_landmarks_5
+def resolve_face_detector_models() -> List[FaceDetectorModel]:
+	if state_manager.get_item('face_detector_model') == 'many':
+		return [ 'retinaface', 'scrfd', 'yolo_face' ]
+	return [ state_manager.get_item('face_detector_model') ]
+
+
+def detect_with_models(vision_frames : List[VisionFrame]) -> List[List[FaceDetection]]:
+	face_detector_models = resolve_face_detector_models()
+	face_detector_size = state_manager.get_item('face_detector_size')
+
+	if len(face_detector_models) > 1:
+		execution_device_id = inference_manager.get_execution_device_id()
+		futures = [ FACE_DETECTOR_EXECUTOR.submit(copy_context().run, detect_with_pinned_model, execution_device_id, face_detector_model, vision_frames, face_detector_size) for face_detector_model in face_detector_models ]
+		return [ future.result() for future in futures ]
+
+	return [ detect_with_model(face_detector_model, vision_frames, face_detector_size) for face_detector_model in face_detector_models ]
+
+
+def detect_with_pinned_model(execution_device_id : int, face_detector_model : FaceDetectorModel, vision_frames : List[VisionFrame], face_detector_size : str) -> List[FaceDetection]:
+	inference_manager.pin_execution_device(execution_device_id)
+	return detect_with_model(face_detector_model, vision_frames, face_detector_size)
+
+
+def detect_with_model(face_detector_model : FaceDetectorModel, vision_frames : List[VisionFrame], face_detector_size : str) -> List[FaceDetection]:
+	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
+	normalize_range = resolve_normalize_range(face_detector_model)
+	detect_vision_frames = []
+	ratios = []
+	face_detections = []
+
+	for vision_frame in vision_frames:
+		temp_vision_frame = restrict_frame(vision_frame, (face_detector_width, face_detector_height))
+		ratios.append((vision_frame.shape[0] / temp_vision_frame.shape[0], vision_frame.shape[1] / temp_vision_frame.shape[1]))
+		detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
+		detect_vision_frames.append(normalize_detect_frame(detect_vision_frame, normalize_range))
+
+	for detection, (ratio_height, ratio_width) in zip(forward_detect_frames(face_detector_model, detect_vision_frames), ratios):
+		face_detections.append(decode_with_model(face_detector_model, detection, face_detector_size, ratio_height, ratio_width))
+
+	return face_detections
+
+
+def resolve_normalize_range(face_detector_model : FaceDetectorModel) -> Sequence[int]:
+	if face_detector_model in [ 'retinaface', 'scrfd' ]:
+		return [ -1, 1 ]
+	if face_detector_model == 'yolo_face':
+		return [ 0, 1 ]
+	return [ 0, 255 ]
+
+
+def forward_detect_frames(face_detector_model : FaceDetectorModel, detect_vision_frames : List[VisionFrame]) -> List[Detection]:
+	face_detector = get_inference_pool().get(face_detector_model)
 
+	if len(detect_vision_frames) > 1 and face_detector and inference_manager.has_batch_outputs(face_detector):
+		detection = forward_with_model(face_detector_model, numpy.concatenate(detect_vision_frames))
+		return [ [ detection_value[index:index + 1] for detection_value in detection ] for index in range(len(detect_vision_frames)) ]
 
-def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
+	return [ forward_with_model(face_detector_model, detect_vision_frame) for detect_vision_frame in detect_vision_frames ]
+
+
+def forward_with_model(face_detector_model : FaceDetectorModel, detect_vision_frame : VisionFrame) -> Detection:
+	if face_detector_model == 'retinaface':
+		return forward_with_retinaface(detect_vision_frame)
+	if face_detector_model == 'scrfd':
+		return forward_with_scrfd(detect_vision_frame)
+	if face_detector_model == 'yolo_face':
+		return forward_with_yolo_face(detect_vision_frame)
+	return forward_with_yunet(detect_vision_frame)
+
+
+def decode_with_model(face_detector_model : FaceDetectorModel, detection : Detection, face_detector_size : str, ratio_height : float, ratio_width : float) -> FaceDetection:
+	if face_detector_model == 'retinaface':
+		return decode_with_retinaface(detection, face_detector_size, ratio_height, ratio_width)
+	if face_detector_model == 'scrfd':
+		return decode_with_scrfd(detection, face_detector_size, ratio_height, ratio_width)
+	if face_detector_model == 'yolo_face':
+		return decode_with_yolo_face(detection, face_detector_size, ratio_height, ratio_width)
+	return decode_with_yunet(detection, face_detector_size, ratio_height, ratio_width)
+
+
+def decode_with_retinaface(detection : Detection, face_detector_size : str, ratio_height : float, ratio_width : float) -> FaceDetection:
 	bounding_boxes = []
 	face_scores = []
 	face_landmarks_5 = []
@@ -214,12 +310,6 @@ def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str)
 	anchor_total = 2
 	face_detector_score = state_manager.get_item('face_detector_score')
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
-	temp_vision_frame = restrict_frame(vision_frame, (face_detector_width, face_detector_height))
-	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
-	ratio_width = vision_frame.shape[1] / temp_vision_frame.shape[1]
-	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	detect_vision_frame = normalize_detect_frame(detect_vision_frame, [ -1, 1 ])
-	detection = forward_with_retinaface(detect_vision_frame)
 
 	for index, feature_stride in enumerate(feature_strides):
 		face_scores_raw = detection[index]
@@ -228,29 +318,17 @@ def detect_with_retinaface(vision_frame : VisionFrame, face_detector_size : str)
 		if numpy.any(keep_indices):
 			stride_height = face_detector_height // feature_stride
 			stride_width = face_detector_width // feature_stride
-			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)
-			bounding_boxes_raw = detection[index + feature_map_channel] * feature_stride
-			face_landmarks_5_raw = detection[index + feature_map_channel * 2] * feature_stride
+			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)[keep_indices]
+			bounding_boxes_raw = detection[index + feature_map_channel][keep_indices] * feature_stride
+			face_landmarks_5_raw = detection[index + feature_map_channel * 2][keep_indices] * feature_stride
+			bounding_boxes.append(distance_to_bounding_box(anchors, bounding_boxes_raw) * [ ratio_width, ratio_height, ratio_width, ratio_height ])
+			face_scores.append(face_scores_raw[keep_indices, 0])
+			face_landmarks_5.append(distance_to_face_landmark_5(anchors, face_landmarks_5_raw) * [ ratio_width, ratio_height ])
 
-			for bounding_box_raw in distance_to_bounding_box(anchors, bounding_boxes_raw)[keep_indices]:
-				bounding_boxes.append(numpy.array(
-				[
-					bounding_box_raw[0] * ratio_width,
-					bounding_box_raw[1] * ratio_height,
-					bounding_box_raw[2] * ratio_width,
-					bounding_box_raw[3] * ratio_height
-				]))
+	return concatenate_face_detections(bounding_boxes, face_scores, face_landmarks_5)
 
-			for face_score_raw in face_scores_raw[keep_indices]:
-				face_scores.append(face_score_raw[0])
 
-			for face_landmark_raw_5 in distance_to_face_landmark_5(anchors, face_landmarks_5_raw)[keep_indices]:
-				face_landmarks_5.append(face_landmark_raw_5 * [ ratio_width, ratio_height ])
-
-	return bounding_boxes, face_scores, face_landmarks_5
-
-
-def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
+def decode_with_scrfd(detection : Detection, face_detector_size : str, ratio_height : float, ratio_width : float) -> FaceDetection:
 	bounding_boxes = []
 	face_scores = []
 	face_landmarks_5 = []
@@ -259,12 +337,6 @@ def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> T
 	anchor_total = 2
 	face_detector_score = state_manager.get_item('face_detector_score')
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
-	temp_vision_frame = restrict_frame(vision_frame, (face_detector_width, face_detector_height))
-	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
-	ratio_width = vision_frame.shape[1] / temp_vision_frame.shape[1]
-	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	detect_vision_frame = normalize_detect_frame(detect_vision_frame, [ -1, 1 ])
-	detection = forward_with_scrfd(detect_vision_frame)
 
 	for index, feature_stride in enumerate(feature_strides):
 		face_scores_raw = detection[index]
@@ -273,67 +345,35 @@ def detect_with_scrfd(vision_frame : VisionFrame, face_detector_size : str) -> T
 		if numpy.any(keep_indices):
 			stride_height = face_detector_height // feature_stride
 			stride_width = face_detector_width // feature_stride
-			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)
-			bounding_boxes_raw = detection[index + feature_map_channel] * feature_stride
-			face_landmarks_5_raw = detection[index + feature_map_channel * 2] * feature_stride
-
-			for bounding_box_raw in distance_to_bounding_box(anchors, bounding_boxes_raw)[keep_indices]:
-				bounding_boxes.append(numpy.array(
-				[
-					bounding_box_raw[0] * ratio_width,
-					bounding_box_raw[1] * ratio_height,
-					bounding_box_raw[2] * ratio_width,
-					bounding_box_raw[3] * ratio_height
-				]))
-
-			for face_score_raw in face_scores_raw[keep_indices]:
-				face_scores.append(face_score_raw[0])
-
-			for face_landmark_raw_5 in distance_to_face_landmark_5(anchors, face_landmarks_5_raw)[keep_indices]:
-				face_landmarks_5.append(face_landmark_raw_5 * [ ratio_width, ratio_height ])
+			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)[keep_indices]
+			bounding_boxes_raw = detection[index + feature_map_channel][keep_indices] * feature_stride
+			face_landmarks_5_raw = detection[index + feature_map_channel * 2][keep_indices] * feature_stride
+			bounding_boxes.append(distance_to_bounding_box(anchors, bounding_boxes_raw) * [ ratio_width, ratio_height, ratio_width, ratio_height ])
+			face_scores.append(face_scores_raw[keep_indices, 0])
+			face_landmarks_5.append(distance_to_face_landmark_5(anchors, face_landmarks_5_raw) * [ ratio_width, ratio_height ])
 
-	return bounding_boxes, face_scores, face_landmarks_5
+	return concatenate_face_detections(bounding_boxes, face_scores, face_landmarks_5)
 
 
-def detect_with_yolo_face(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
+def decode_with_yolo_face(detection : Detection, face_detector_size : str, ratio_height : float, ratio_width : float) -> FaceDetection:
 	bounding_boxes = []
 	face_scores = []
 	face_landmarks_5 = []
 	face_detector_score = state_manager.get_item('face_detector_score')
-	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
-	temp_vision_frame = restrict_frame(vision_frame, (face_detector_width, face_detector_height))
-	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
-	ratio_width = vision_frame.shape[1] / temp_vision_frame.shape[1]
-	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	detect_vision_frame = normalize_detect_frame(detect_vision_frame, [ 0, 1 ])
-	detection = forward_with_yolo_face(detect_vision_frame)
 	detection = numpy.squeeze(detection).T
 	bounding_boxes_raw, face_scores_raw, face_landmarks_5_raw = numpy.split(detection, [ 4, 5 ], axis = 1)
 	keep_indices = numpy.where(face_scores_raw > face_detector_score)[0]
 
 	if numpy.any(keep_indices):
 		bounding_boxes_raw, face_scores_raw, face_landmarks_5_raw = bounding_boxes_raw[keep_indices], face_scores_raw[keep_indices], face_landmarks_5_raw[keep_indices]
+		bounding_boxes.append(numpy.concatenate([ bounding_boxes_raw[:, :2] - bounding_boxes_raw[:, 2:] / 2, bounding_boxes_raw[:, :2] + bounding_boxes_raw[:, 2:] / 2 ], axis = 1) * [ ratio_width, ratio_height, ratio_width, ratio_height ])
+		face_scores.append(face_scores_raw.ravel())
+		face_landmarks_5.append(face_landmarks_5_raw.reshape(-1, 5, 3)[:, :, :2] * [ ratio_width, ratio_height ])
 
-		for bounding_box_raw in bounding_boxes_raw:
-			bounding_boxes.append(numpy.array(
-			[
-				(bounding_box_raw[0] - bounding_box_raw[2] / 2) * ratio_width,
-				(bounding_box_raw[1] - bounding_box_raw[3] / 2) * ratio_height,
-				(bounding_box_raw[0] + bounding_box_raw[2] / 2) * ratio_width,
-				(bounding_box_raw[1] + bounding_box_raw[3] / 2) * ratio_height
-			]))
-
-		face_scores = face_scores_raw.ravel().tolist()
-		face_landmarks_5_raw[:, 0::3] = (face_landmarks_5_raw[:, 0::3]) * ratio_width
-		face_landmarks_5_raw[:, 1::3] = (face_landmarks_5_raw[:, 1::3]) * ratio_height
-
-		for face_landmark_raw_5 in face_landmarks_5_raw:
-			face_landmarks_5.append(numpy.array(face_landmark_raw_5.reshape(-1, 3)[:, :2]))
+	return concatenate_face_detections(bounding_boxes, face_scores, face_landmarks_5)
 
-	return bounding_boxes, face_scores, face_landmarks_5
 
-
-def detect_with_yunet(vision_frame : VisionFrame, face_detector_size : str) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
+def decode_with_yunet(detection : Detection, face_detector_size : str, ratio_height : float, ratio_width : float) -> FaceDetection:
 	bounding_boxes = []
 	face_scores = []
 	face_landmarks_5 = []
@@ -342,12 +382,6 @@ def detect_with_yunet(vision_frame : VisionFrame, face_detector_size : str) -> T
 	anchor_total = 1
 	face_detector_score = state_manager.get_item('face_detector_score')
 	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
-	temp_vision_frame = restrict_frame(vision_frame, (face_detector_width, face_detector_height))
-	ratio_height = vision_frame.shape[0] / temp_vision_frame.shape[0]
-	ratio_width = vision_frame.shape[1] / temp_vision_frame.shape[1]
-	detect_vision_frame = prepare_detect_frame(temp_vision_frame, face_detector_size)
-	detect_vision_frame = normalize_detect_frame(detect_vision_frame, [ 0, 255 ])
-	detection = forward_with_yunet(detect_vision_frame)
 
 	for index, feature_stride in enumerate(feature_strides):
 		face_scores_raw = (detection[index] * detection[index + feature_map_channel]).reshape(-1)
@@ -369,16 +403,8 @@ def detect_with_yunet(vision_frame : VisionFrame, face_detector_size : str) -> T
 				bounding_boxes_center[:, 1] + bounding_boxes_size[:, 1] / 2
 			], axis = -1)
 
-			for bounding_box_raw in bounding_boxes_raw[keep_indices]:
-				bounding_boxes.append(numpy.array(
-				[
-					bounding_box_raw[0] * ratio_width,
-					bounding_box_raw[1] * ratio_height,
-					bounding_box_raw[2] * ratio_width,
-					bounding_box_raw[3] * ratio_height
-				]))
-
-			face_scores.extend(face_scores_raw[keep_indices])
+			bounding_boxes.append(bounding_boxes_raw[keep_indices] * [ ratio_width, ratio_height, ratio_width, ratio_height ])
+			face_scores.append(face_scores_raw[keep_indices])
 			face_landmarks_5_raw = numpy.concatenate(
 			[
 				face_landmarks_5_raw[:, [0, 1]] * feature_stride + anchors,
@@ -388,10 +414,9 @@ def detect_with_yunet(vision_frame : VisionFrame, face_detector_size : str) -> T
 				face_landmarks_5_raw[:, [8, 9]] * feature_stride + anchors
 			], axis = -1).reshape(-1, 5, 2)
 
-			for face_landmark_raw_5 in face_landmarks_5_raw[keep_indices]:
-				face_landmarks_5.append(face_landmark_raw_5 * [ ratio_width, ratio_height ])
+			face_landmarks_5.append(face_landmarks_5_raw[keep_indices] * [ ratio_width, ratio_height ])
 
-	return bounding_boxes, face_scores, face_landmarks_5
+	return concatenate_face_detections(bounding_boxes, face_scores, face_landmarks_5)
 
 
 def forward_with_retinaface(detect_vision_frame : VisionFrame) -> Detection:
@@ -405,11 +430,10 @@ def forward_with_retinaface(detect_vision_frame : VisionFrame) -> Detection:
 		if face_detector is None:
 			return []
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
-		{
-			'input': detect_vision_frame
-		})
+	detection = inference_manager.run_inference(face_detector,
+	{
+		'input': detect_vision_frame
+	}, FACE_DETECTOR_SEMAPHORE_SET.get('retinaface'))
 
 	return detection
 
@@ -425,11 +449,10 @@ def forward_with_scrfd(detect_vision_frame : VisionFrame) -> Detection:
 		if face_detector is None:
 			return []
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
-		{
-			'input': detect_vision_frame
-		})
+	detection = inference_manager.run_inference(face_detector,
+	{
+		'input': detect_vision_frame
+	}, FACE_DETECTOR_SEMAPHORE_SET.get('scrfd'))
 
 	return detection
 
@@ -445,11 +468,10 @@ def forward_with_yolo_face(detect_vision_frame : VisionFrame) -> Detection:
 		if face_detector is None:
 			return []
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
-		{
-			'input': detect_vision_frame
-		})
+	detection = inference_manager.run_inference(face_detector,
+	{
+		'input': detect_vision_frame
+	}, FACE_DETECTOR_SEMAPHORE_SET.get('yolo_face'))
 
 	return detection
 
@@ -465,11 +487,10 @@ def forward_with_yunet(detect_vision_frame : VisionFrame) -> Detection:
 		if face_detector is None:
 			return []
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
-		{
-			'input': detect_vision_frame
-		})
+	detection = inference_manager.run_inference(face_detector,
+	{
+		'input': detect_vision_frame
+	}, FACE_DETECTOR_SEMAPHORE_SET.get('yunet'))
 
 	return detection
 
@@ -5,7 +5,8 @@ import cv2
 import numpy
 from cv2.typing import Size
 
-from faceswap_colab.types import Anchors, Angle, BoundingBox, Distance, FaceDetectorModel, FaceLandmark5, FaceLandmark68, Mask, Matrix, Points, Scale, Score, Translation, VisionFrame, WarpTemplate, WarpTemplateSet
+from faceswap_colab.profiler import profile
+from faceswap_colab.types import Anchors, Angle, BoundingBox, BoundingBoxes, Distance, FaceDetectorModel, FaceLandmark5, FaceLandmark68, Mask, Matrix, Points, Scale, Scores, Translation, VisionFrame, WarpTemplate, WarpTemplateSet
 
 WARP_TEMPLATE_SET : WarpTemplateSet =\
 {
@@ -98,19 +99,31 @@ def warp_face_by_translation(temp_vision_frame : VisionFrame, translation : Tran
 	return crop_vision_frame, affine_matrix
 
 
+@profile()
 def paste_back(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_vision_mask : Mask, affine_matrix : Matrix) -> VisionFrame:
+	temp_vision_frame = temp_vision_frame.copy()
+	blend_paste_back(temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix)
+	return temp_vision_frame
+
+
+@profile()
+def blend_paste_back(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_vision_mask : Mask, affine_matrix : Matrix) -> None:
 	paste_bounding_box, paste_matrix = calculate_paste_area(temp_vision_frame, crop_vision_frame, affine_matrix)
 	x1, y1, x2, y2 = paste_bounding_box
 	paste_width = x2 - x1
 	paste_height = y2 - y1
-	inverse_vision_mask = cv2.warpAffine(crop_vision_mask, paste_matrix, (paste_width, paste_height)).clip(0, 1)
-	inverse_vision_mask = numpy.expand_dims(inverse_vision_mask, axis = -1)
+	inverse_vision_mask = cv2.warpAffine(crop_vision_mask.astype(numpy.float32, copy = False), paste_matrix, (paste_width, paste_height))
+	inverse_vision_mask = numpy.clip(inverse_vision_mask, 0, 1, out = inverse_vision_mask)
 	inverse_vision_frame = cv2.warpAffine(crop_vision_frame, paste_matrix, (paste_width, paste_height), borderMode = cv2.BORDER_REPLICATE)
-	temp_vision_frame = temp_vision_frame.copy()
 	paste_vision_frame = temp_vision_frame[y1:y2, x1:x2]
-	paste_vision_frame = paste_vision_frame * (1 - inverse_vision_mask) + inverse_vision_frame * inverse_vision_mask
-	temp_vision_frame[y1:y2, x1:x2] = paste_vision_frame.astype(temp_vision_frame.dtype)
-	return temp_vision_frame
+
+	if paste_vision_frame.dtype == numpy.uint8 and inverse_vision_frame.dtype == numpy.uint8:
+		temp_vision_frame[y1:y2, x1:x2] = cv2.blendLinear(inverse_vision_frame, paste_vision_frame, inverse_vision_mask, 1 - inverse_vision_mask)
+	else:
+		inverse_vision_mask = numpy.expand_dims(inverse_vision_mask, axis = -1)
+		paste_vision_frame = paste_vision_frame.astype(numpy.float32)
+		paste_vision_frame += (inverse_vision_frame - paste_vision_frame) * inverse_vision_mask
+		temp_vision_frame[y1:y2, x1:x2] = paste_vision_frame.astype(temp_vision_frame.dtype)
 
 
 def calculate_paste_area(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, affine_matrix : Matrix) -> Tuple[BoundingBox, Matrix]:
@@ -161,6 +174,10 @@ def normalize_bounding_box(bounding_box : BoundingBox) -> BoundingBox:
 	return numpy.array([ x1, y1, x2, y2 ])
 
 
+def normalize_bounding_boxes(bounding_boxes : BoundingBoxes) -> BoundingBoxes:
+	return numpy.concatenate([ numpy.minimum(bounding_boxes[:, :2], bounding_boxes[:, 2:]), numpy.maximum(bounding_boxes[:, :2], bounding_boxes[:, 2:]) ], axis = 1)
+
+
 def transform_points(points : Points, matrix : Matrix) -> Points:
 	points = points.reshape(-1, 1, 2)
 	points = cv2.transform(points, matrix) #type:ignore[assignment]
@@ -182,6 +199,12 @@ def transform_bounding_box(bounding_box : BoundingBox, matrix : Matrix) -> Bound
 	return normalize_bounding_box(numpy.array([ x1, y1, x2, y2 ]))
 
 
+def transform_bounding_boxes(bounding_boxes : BoundingBoxes, matrix : Matrix) -> BoundingBoxes:
+	points = bounding_boxes[:, [ 0, 1, 2, 1, 2, 3, 0, 3 ]]
+	points = transform_points(points, matrix).reshape(-1, 4, 2)
+	return numpy.concatenate([ numpy.min(points, axis = 1), numpy.max(points, axis = 1) ], axis = 1)
+
+
 def distance_to_bounding_box(points : Points, distance : Distance) -> BoundingBox:
 	x1 = points[:, 0] - distance[:, 0]
 	y1 = points[:, 1] - distance[:, 1]
@@ -228,9 +251,24 @@ def estimate_face_angle(face_landmark_68 : FaceLandmark68) -> Angle:
 	return face_angle
 
 
-def apply_nms(bounding_boxes : List[BoundingBox], scores : List[Score], score_threshold : float, nms_threshold : float) -> Sequence[int]:
-	bounding_boxes_norm = [ (x1, y1, x2 - x1, y2 - y1) for (x1, y1, x2, y2) in bounding_boxes ]
-	keep_indices = cv2.dnn.NMSBoxes(bounding_boxes_norm, scores, score_threshold = score_threshold, nms_threshold = nms_threshold)
+def apply_nms(bounding_boxes : BoundingBoxes, scores : Scores, score_threshold : float, nms_threshold : float) -> Sequence[int]:
+	x1, y1, x2, y2 = bounding_boxes.reshape(-1, 4).T
+	areas = (x2 - x1) * (y2 - y1)
+	score_indices = numpy.where(scores > score_threshold)[0]
+	score_indices = score_indices[numpy.argsort(-scores[score_indices], kind = 'stable')]
+	keep_indices = []
+
+	while score_indices.size > 0:
+		keep_index = score_indices[0]
+		score_indices = score_indices[1:]
+		keep_indices.append(int(keep_index))
+		intersection_width = numpy.clip(numpy.minimum(x2[keep_index], x2[score_indices]) - numpy.maximum(x1[keep_index], x1[score_indices]), 0, None)
+		intersection_height = numpy.clip(numpy.minimum(y2[keep_index], y2[score_indices]) - numpy.maximum(y1[keep_index], y1[score_indices]), 0, None)
+		intersections = intersection_width * intersection_height
+		unions = areas[keep_index] + areas[score_indices] - intersections
+		overlaps = numpy.divide(intersections, unions, out = numpy.zeros_like(intersections), where = unions > 0)
+		score_indices = score_indices[overlaps <= nms_threshold]
+
 	return keep_indices
 
 
@@ -8,6 +8,7 @@ import faceswap_colab.choices
 from faceswap_colab import inference_manager, state_manager
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from faceswap_colab.filesystem import resolve_relative_path
+from faceswap_colab.profiler import profile
 from faceswap_colab.thread_helper import conditional_thread_semaphore
 from faceswap_colab.types import DownloadScope, DownloadSet, FaceLandmark68, FaceMaskArea, FaceMaskRegion, InferencePool, Mask, ModelSet, Padding, VisionFrame
 
@@ -185,6 +186,7 @@ def pre_check() -> bool:
 	return conditional_download_hashes(model_hash_set) and conditional_download_sources(model_source_set)
 
 
+@profile()
 def create_box_mask(crop_vision_frame : VisionFrame, face_mask_blur : float, face_mask_padding : Padding) -> Mask:
 	crop_size = crop_vision_frame.shape[:2][::-1]
 	blur_amount = int(crop_size[0] * 0.5 * face_mask_blur)
@@ -200,6 +202,7 @@ def create_box_mask(crop_vision_frame : VisionFrame, face_mask_blur : float, fac
 	return box_mask
 
 
+@profile()
 def create_occlusion_mask(crop_vision_frame : VisionFrame) -> Mask:
 	temp_masks = []
 
@@ -223,6 +226,7 @@ def create_occlusion_mask(crop_vision_frame : VisionFrame) -> Mask:
 	return occlusion_mask
 
 
+@profile()
 def create_area_mask(crop_vision_frame : VisionFrame, face_landmark_68 : FaceLandmark68, face_mask_areas : List[FaceMaskArea]) -> Mask:
 	crop_size = crop_vision_frame.shape[:2][::-1]
 	landmark_points = []
@@ -238,6 +242,7 @@ def create_area_mask(crop_vision_frame : VisionFrame, face_landmark_68 : FaceLan
 	return area_mask
 
 
+@profile()
 def create_region_mask(crop_vision_frame : VisionFrame, face_mask_regions : List[FaceMaskRegion]) -> Mask:
 	model_name = state_manager.get_item('face_parser_model')
 	model_size = create_static_model_set('full').get(model_name).get('size')
@@ -257,11 +262,10 @@ def create_region_mask(crop_vision_frame : VisionFrame, face_mask_regions : List
 def forward_occlude_face(prepare_vision_frame : VisionFrame, model_name : str) -> Mask:
 	face_occluder = get_inference_pool().get(model_name)
 
-	with conditional_thread_semaphore():
-		occlusion_mask : Mask = face_occluder.run(None,
-		{
-			'input': prepare_vision_frame
-		})[0][0]
+	occlusion_mask : Mask = inference_manager.run_inference(face_occluder,
+	{
+		'input': prepare_vision_frame
+	}, conditional_thread_semaphore())[0][0]
 
 	return occlusion_mask
 
@@ -270,10 +274,9 @@ def forward_parse_face(prepare_vision_frame : VisionFrame) -> Mask:
 	model_name = state_manager.get_item('face_parser_model')
 	face_parser = get_inference_pool().get(model_name)
 
-	with conditional_thread_semaphore():
-		region_mask : Mask = face_parser.run(None,
-		{
-			'input': prepare_vision_frame
-		})[0][0]
+	region_mask : Mask = inference_manager.run_inference(face_parser,
+	{
+		'input': prepare_vision_frame
+	}, conditional_thread_semaphore())[0][0]
 
 	return region_mask
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Tuple
+from typing import List, Tuple
 
 import numpy
 
@@ -69,25 +69,33 @@ def pre_check() -> bool:
 
 
 def calculate_face_embedding(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmark5) -> Tuple[Embedding, Embedding]:
+	face_embeddings, face_embeddings_norm = calculate_face_embeddings(temp_vision_frame, [ face_landmark_5 ])
+	return face_embeddings[0], face_embeddings_norm[0]
+
+
+def calculate_face_embeddings(temp_vision_frame : VisionFrame, face_landmarks_5 : List[FaceLandmark5]) -> Tuple[List[Embedding], List[Embedding]]:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
-	crop_vision_frame, matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
-	crop_vision_frame = crop_vision_frame / 127.5 - 1
-	crop_vision_frame = crop_vision_frame[:, :, ::-1].transpose(2, 0, 1).astype(numpy.float32)
-	crop_vision_frame = numpy.expand_dims(crop_vision_frame, axis = 0)
-	face_embedding = forward(crop_vision_frame)
-	face_embedding = face_embedding.ravel()
-	face_embedding_norm = face_embedding / numpy.linalg.norm(face_embedding)
-	return face_embedding, face_embedding_norm
+	crop_vision_frames = []
+
+	for face_landmark_5 in face_landmarks_5:
+		crop_vision_frame, _ = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
+		crop_vision_frames.append(crop_vision_frame)
 
+	crop_vision_frames = numpy.stack(crop_vision_frames) / 127.5 - 1
+	crop_vision_frames = crop_vision_frames[:, :, :, ::-1].transpose(0, 3, 1, 2).astype(numpy.float32)
+	face_embeddings = forward(crop_vision_frames)
+	face_embeddings = face_embeddings.reshape(len(face_landmarks_5), -1)
+	face_embeddings_norm = face_embeddings / numpy.linalg.norm(face_embeddings, axis = 1, keepdims = True)
+	return list(face_embeddings), list(face_embeddings_norm)
 
-def forward(crop_vision_frame : VisionFrame) -> Embedding:
+
+def forward(crop_vision_frames : VisionFrame) -> Embedding:
 	face_recognizer = get_inference_pool().get('face_recognizer')
 
-	with conditional_thread_semaphore():
-		face_embedding = face_recognizer.run(None,
-		{
-			'input': crop_vision_frame
-		})[0]
+	face_embeddings = inference_manager.run_chunked_inference(face_recognizer,
+	{
+		'input': crop_vision_frames
+	}, conditional_thread_semaphore())[0]
 
-	return face_embedding
+	return face_embeddings
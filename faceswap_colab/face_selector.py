@@ -1,14 +1,15 @@
-from typing import List
+from typing import List, Optional
 
 import numpy
 
 from faceswap_colab import state_manager
-from faceswap_colab.face_analyser import get_many_faces, get_one_face
+from faceswap_colab.common_helper import get_first
+from faceswap_colab.face_analyser import get_average_face, get_many_faces, get_one_face, has_face_age_filter
 from faceswap_colab.types import Face, FaceSelectorOrder, Gender, Race, Score, VisionFrame
 
 
-def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : VisionFrame) -> List[Face]:
-	target_faces = get_many_faces([ target_vision_frame ])
+def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : VisionFrame, reference_face : Optional[Face] = None, target_vision_key : Optional[str] = None) -> List[Face]:
+	target_faces = get_many_faces([ target_vision_frame ], [ target_vision_key ])
 
 	if state_manager.get_item('face_selector_mode') == 'many':
 		return sort_and_filter_faces(target_faces)
@@ -19,9 +20,7 @@ def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : Vis
 			return [ target_face ]
 
 	if state_manager.get_item('face_selector_mode') == 'reference':
-		reference_faces = get_many_faces([ reference_vision_frame ])
-		reference_faces = sort_and_filter_faces(reference_faces)
-		reference_face = get_one_face(reference_faces, state_manager.get_item('reference_face_position'))
+		reference_face = reference_face or extract_reference_face(reference_vision_frame)
 		if reference_face:
 			match_faces = find_match_faces([ reference_face ], target_faces, state_manager.get_item('reference_face_distance'))
 			return match_faces
@@ -29,6 +28,26 @@ def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : Vis
 	return []
 
 
+def extract_reference_face(reference_vision_frame : VisionFrame) -> Optional[Face]:
+	reference_faces = get_many_faces([ reference_vision_frame ])
+	reference_faces = sort_and_filter_faces(reference_faces)
+	return get_one_face(reference_faces, state_manager.get_item('reference_face_position'))
+
+
+def extract_source_face(source_vision_frames : List[VisionFrame]) -> Optional[Face]:
+	source_faces = []
+
+	if source_vision_frames:
+		for source_vision_frame in source_vision_frames:
+			temp_faces = get_many_faces([ source_vision_frame ])
+			temp_faces = sort_faces_by_order(temp_faces, 'large-small')
+
+			if temp_faces:
+				source_faces.append(get_first(temp_faces))
+
+	return get_average_face(source_faces)
+
+
 def find_match_faces(reference_faces : List[Face], target_faces : List[Face], face_distance : float) -> List[Face]:
 	match_faces : List[Face] = []
 
@@ -48,7 +67,7 @@ def compare_faces(face : Face, reference_face : Face, face_distance : float) ->
 
 
 def calculate_face_distance(face : Face, reference_face : Face) -> float:
-	if hasattr(face, 'embedding_norm') and hasattr(reference_face, 'embedding_norm'):
+	if face.embedding_norm is not None and reference_face.embedding_norm is not None:
 		return 1 - numpy.dot(face.embedding_norm, reference_face.embedding_norm)
 	return 0
 
@@ -61,7 +80,7 @@ def sort_and_filter_faces(faces : List[Face]) -> List[Face]:
 			faces = filter_faces_by_gender(faces, state_manager.get_item('face_selector_gender'))
 		if state_manager.get_item('face_selector_race'):
 			faces = filter_faces_by_race(faces, state_manager.get_item('face_selector_race'))
-		if state_manager.get_item('face_selector_age_start') or state_manager.get_item('face_selector_age_end'):
+		if has_face_age_filter():
 			faces = filter_faces_by_age(faces, state_manager.get_item('face_selector_age_start'), state_manager.get_item('face_selector_age_end'))
 	return faces
 
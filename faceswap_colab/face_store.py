@@ -1,28 +1,87 @@
+from collections import OrderedDict
 from typing import List, Optional
 
 from faceswap_colab.hash_helper import create_hash
+from faceswap_colab.thread_helper import thread_lock
 from faceswap_colab.types import Face, FaceStore, VisionFrame
 
 FACE_STORE : FaceStore =\
 {
-	'static_faces': {}
+	'static_faces': OrderedDict(),
+	'static_bytes': 0,
+	'hit_count': 0,
+	'miss_count': 0,
+	'evict_count': 0
 }
+FACE_STORE_BYTE_LIMIT : int = 64 * 1024 * 1024
 
 
 def get_face_store() -> FaceStore:
 	return FACE_STORE
 
 
-def get_static_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
-	vision_hash = create_hash(vision_frame.tobytes())
-	return FACE_STORE.get('static_faces').get(vision_hash)
+def create_frame_key(target_path : str, frame_number : int) -> str:
+	return target_path + '@' + str(frame_number)
 
 
-def set_static_faces(vision_frame : VisionFrame, faces : List[Face]) -> None:
-	vision_hash = create_hash(vision_frame.tobytes())
-	if vision_hash:
-		FACE_STORE['static_faces'][vision_hash] = faces
+def create_vision_hash(vision_frame : VisionFrame) -> str:
+	vision_height, vision_width = vision_frame.shape[:2]
+	return create_hash(vision_frame.tobytes()) + '-' + str(vision_width) + 'x' + str(vision_height)
+
+
+def resolve_vision_key(vision_frame : VisionFrame, vision_key : Optional[str]) -> str:
+	if vision_key:
+		return vision_key
+	return create_vision_hash(vision_frame)
+
+
+def get_static_faces(vision_hash : str) -> Optional[List[Face]]:
+	with thread_lock():
+		static_faces = FACE_STORE.get('static_faces').get(vision_hash)
+
+		if static_faces is not None:
+			FACE_STORE.get('static_faces').move_to_end(vision_hash)
+			FACE_STORE['hit_count'] += 1
+		else:
+			FACE_STORE['miss_count'] += 1
+		return static_faces
+
+
+def set_static_faces(vision_hash : str, faces : List[Face]) -> None:
+	with thread_lock():
+		if vision_hash and vision_hash not in FACE_STORE.get('static_faces'):
+			FACE_STORE['static_faces'][vision_hash] = faces
+			FACE_STORE['static_bytes'] += estimate_faces_bytes(faces)
+
+			while FACE_STORE.get('static_bytes') > FACE_STORE_BYTE_LIMIT and len(FACE_STORE.get('static_faces')) > 1:
+				_, evict_faces = FACE_STORE.get('static_faces').popitem(last = False)
+				FACE_STORE['static_bytes'] -= estimate_faces_bytes(evict_faces)
+				FACE_STORE['evict_count'] += 1
+
+
+def replace_static_faces(vision_hash : str, faces : List[Face]) -> None:
+	with thread_lock():
+		static_faces = FACE_STORE.get('static_faces').get(vision_hash)
+
+		if static_faces is not None:
+			FACE_STORE['static_faces'][vision_hash] = faces
+			FACE_STORE['static_bytes'] += estimate_faces_bytes(faces) - estimate_faces_bytes(static_faces)
+
+
+def estimate_faces_bytes(faces : List[Face]) -> int:
+	faces_bytes = 0
+
+	for face in faces:
+		for face_value in [ face.bounding_box, face.embedding, face.embedding_norm ] + list(face.landmark_set.values()):
+			faces_bytes += getattr(face_value, 'nbytes', 0)
+
+	return faces_bytes
 
 
 def clear_static_faces() -> None:
-	FACE_STORE['static_faces'].clear()
+	with thread_lock():
+		FACE_STORE['static_faces'].clear()
+		FACE_STORE['static_bytes'] = 0
+		FACE_STORE['hit_count'] = 0
+		FACE_STORE['miss_count'] = 0
+		FACE_STORE['evict_count'] = 0
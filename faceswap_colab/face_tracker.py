@@ -0,0 +1,100 @@
+from typing import List, Optional
+
+import cv2
+import numpy
+
+from faceswap_colab import state_manager
+from faceswap_colab.face_analyser import get_many_faces
+from faceswap_colab.face_helper import transform_bounding_box, transform_points
+from faceswap_colab.face_store import set_static_faces
+from faceswap_colab.types import Face, FaceTracker, Matrix, VisionFrame
+
+FACE_TRACKER : FaceTracker =\
+{
+	'vision_frame': None,
+	'faces': [],
+	'keyframe_number': 0
+}
+FACE_TRACKER_SCENE_CUT : float = 0.7
+FACE_TRACKER_POINT_RATIO : float = 0.5
+
+
+def track_faces(vision_frame : VisionFrame, vision_key : str, frame_number : int) -> List[Face]:
+	tracker_vision_frame = create_tracker_frame(vision_frame)
+	faces = None
+
+	if is_tracking_frame(tracker_vision_frame, frame_number):
+		faces = propagate_faces(FACE_TRACKER.get('vision_frame'), tracker_vision_frame, FACE_TRACKER.get('faces'))
+
+	if faces is None:
+		faces = get_many_faces([ vision_frame[:, :, :3] ], [ vision_key ])
+		FACE_TRACKER['keyframe_number'] = frame_number
+
+	set_static_faces(vision_key, faces)
+	FACE_TRACKER['vision_frame'] = tracker_vision_frame
+	FACE_TRACKER['faces'] = faces
+	return faces
+
+
+def create_tracker_frame(vision_frame : VisionFrame) -> VisionFrame:
+	if vision_frame.shape[2] == 4:
+		return cv2.cvtColor(vision_frame, cv2.COLOR_BGRA2GRAY)
+	return cv2.cvtColor(vision_frame, cv2.COLOR_BGR2GRAY)
+
+
+def is_tracking_frame(tracker_vision_frame : VisionFrame, frame_number : int) -> bool:
+	previous_vision_frame = FACE_TRACKER.get('vision_frame')
+	face_tracker_interval = state_manager.get_item('face_tracker_interval')
+
+	if previous_vision_frame is not None and previous_vision_frame.shape == tracker_vision_frame.shape:
+		return frame_number - FACE_TRACKER.get('keyframe_number') < face_tracker_interval and not detect_scene_cut(previous_vision_frame, tracker_vision_frame)
+	return False
+
+
+def detect_scene_cut(previous_vision_frame : VisionFrame, tracker_vision_frame : VisionFrame) -> bool:
+	previous_histogram = cv2.calcHist([ previous_vision_frame ], [ 0 ], None, [ 64 ], [ 0, 256 ])
+	tracker_histogram = cv2.calcHist([ tracker_vision_frame ], [ 0 ], None, [ 64 ], [ 0, 256 ])
+	return cv2.compareHist(previous_histogram, tracker_histogram, cv2.HISTCMP_CORREL) < FACE_TRACKER_SCENE_CUT
+
+
+def propagate_faces(previous_vision_frame : VisionFrame, tracker_vision_frame : VisionFrame, faces : List[Face]) -> Optional[List[Face]]:
+	propagated_faces = []
+
+	for face in faces:
+		face_landmark_68 = face.landmark_set.get('68').astype(numpy.float32).reshape(-1, 1, 2)
+		track_points, track_status, _ = cv2.calcOpticalFlowPyrLK(previous_vision_frame, tracker_vision_frame, face_landmark_68, None, winSize = (21, 21), maxLevel = 3)
+		track_mask = track_status.ravel() == 1
+
+		if numpy.mean(track_mask) < FACE_TRACKER_POINT_RATIO:
+			return None
+
+		affine_matrix, _ = cv2.estimateAffinePartial2D(face_landmark_68[track_mask], track_points[track_mask])
+
+		if affine_matrix is None:
+			return None
+
+		propagated_faces.append(transform_face(face, affine_matrix))
+
+	return propagated_faces
+
+
+def transform_face(face : Face, affine_matrix : Matrix) -> Face:
+	bounding_box = transform_bounding_box(face.bounding_box, affine_matrix)
+	landmark_set =\
+	{
+		'5': transform_points(face.landmark_set.get('5'), affine_matrix),
+		'5/68': transform_points(face.landmark_set.get('5/68'), affine_matrix),
+		'68': transform_points(face.landmark_set.get('68'), affine_matrix),
+		'68/5': transform_points(face.landmark_set.get('68/5'), affine_matrix)
+	}
+
+	return face._replace(
+		bounding_box = bounding_box,
+		landmark_set = landmark_set
+	)
+
+
+def clear_face_tracker() -> None:
+	FACE_TRACKER['vision_frame'] = None
+	FACE_TRACKER['faces'] = []
+	FACE_TRACKER['keyframe_number'] = 0
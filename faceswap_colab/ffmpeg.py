@@ -124,6 +124,42 @@ def extract_frames(target_path : str, temp_video_resolution : Resolution, temp_v
 		return process.returncode == 0
 
 
+def open_video_decoder(target_path : str, temp_video_resolution : Resolution, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int, pixel_format : str) -> subprocess.Popen[bytes]:
+	commands = ffmpeg_builder.chain(
+		ffmpeg_builder.set_input(target_path),
+		ffmpeg_builder.set_media_resolution(pack_resolution(temp_video_resolution)),
+		ffmpeg_builder.select_frame_range(trim_frame_start, trim_frame_end, temp_video_fps),
+		ffmpeg_builder.prevent_frame_drop(),
+		ffmpeg_builder.pipe_video(pixel_format),
+		ffmpeg_builder.cast_stream()
+	)
+	return open_ffmpeg(commands)
+
+
+def open_video_encoder(target_path : str, temp_video_resolution : Resolution, temp_video_fps : Fps, output_video_resolution : Resolution, output_video_fps : Fps, pixel_format : str) -> subprocess.Popen[bytes]:
+	output_video_encoder = resolve_video_encoder(target_path)
+	output_video_quality = state_manager.get_item('output_video_quality')
+	output_video_preset = state_manager.get_item('output_video_preset')
+	temp_video_path = get_temp_file_path(target_path)
+	commands = ffmpeg_builder.chain(
+		ffmpeg_builder.pipe_video(pixel_format),
+		ffmpeg_builder.set_media_resolution(pack_resolution(temp_video_resolution)),
+		ffmpeg_builder.set_input_fps(temp_video_fps),
+		ffmpeg_builder.set_input('-'),
+		ffmpeg_builder.set_media_resolution(pack_resolution(output_video_resolution)),
+		ffmpeg_builder.set_video_encoder(output_video_encoder),
+		ffmpeg_builder.set_video_quality(output_video_encoder, output_video_quality),
+		ffmpeg_builder.set_video_preset(output_video_encoder, output_video_preset),
+		ffmpeg_builder.concat(
+			ffmpeg_builder.set_video_fps(output_video_fps),
+			ffmpeg_builder.keep_video_alpha(output_video_encoder)
+		),
+		ffmpeg_builder.set_pixel_format(output_video_encoder),
+		ffmpeg_builder.force_output(temp_video_path)
+	)
+	return open_ffmpeg(commands)
+
+
 def copy_image(target_path : str, temp_image_resolution : Resolution) -> bool:
 	temp_image_path = get_temp_file_path(target_path)
 	commands = ffmpeg_builder.chain(
@@ -279,6 +315,12 @@ def fix_audio_encoder(video_format : VideoFormat, audio_encoder : AudioEncoder)
 	return audio_encoder
 
 
+def resolve_video_encoder(target_path : str) -> VideoEncoder:
+	temp_video_path = get_temp_file_path(target_path)
+	temp_video_format = cast(VideoFormat, get_file_format(temp_video_path))
+	return fix_video_encoder(temp_video_format, state_manager.get_item('output_video_encoder'))
+
+
 def fix_video_encoder(video_format : VideoFormat, video_encoder : VideoEncoder) -> VideoEncoder:
 	if video_format in [ 'm4v', 'mpeg', 'mxf', 'wmv' ]:
 		return 'libx264'
@@ -1,72 +1,131 @@
 import importlib
-import random
+import itertools
+import threading
+from collections import OrderedDict
 from time import sleep, time
-from typing import List
+from typing import ContextManager, Dict, Iterator, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
-from onnxruntime import InferenceSession
+import numpy
+from numpy.typing import DTypeLike
+from onnxruntime import InferenceSession, OrtValue
 
 from faceswap_colab import logger, process_manager, state_manager, translator
 from faceswap_colab.app_context import detect_app_context
-from faceswap_colab.common_helper import is_windows
+from faceswap_colab.common_helper import get_first, is_windows
 from faceswap_colab.execution import create_inference_session_providers, has_execution_provider
 from faceswap_colab.exit_helper import fatal_exit
 from faceswap_colab.filesystem import get_file_name, is_file
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.time_helper import calculate_end_time
-from faceswap_colab.types import DownloadSet, ExecutionProvider, InferencePool, InferencePoolSet
+from faceswap_colab.thread_helper import thread_lock
+from faceswap_colab.types import DownloadSet, ExecutionProvider, InferenceBatch, InferenceBinding, InferenceInputs, InferenceOutputs, InferencePool, InferencePoolSet, InferenceRequest, InferenceThreadBindingSet, InferenceValue
 
 INFERENCE_POOL_SET : InferencePoolSet =\
 {
 	'cli': {},
 	'ui': {}
 }
+INFERENCE_BATCH_SET : 'WeakKeyDictionary[InferenceSession, InferenceBatch]' = WeakKeyDictionary()
+INFERENCE_BATCH_TIMEOUT : float = 0.005
+INFERENCE_BINDING_SET : 'WeakKeyDictionary[InferenceSession, InferenceThreadBindingSet]' = WeakKeyDictionary()
+INFERENCE_BINDING_LIMIT : int = 8
+INFERENCE_STAGE_SET : 'WeakKeyDictionary[InferenceSession, str]' = WeakKeyDictionary()
+INFERENCE_BINDING_DEVICES : Dict[str, str] =\
+{
+	'CUDAExecutionProvider': 'cuda',
+	'TensorrtExecutionProvider': 'cuda'
+}
+INFERENCE_BINDING_TYPES : Dict[str, DTypeLike] =\
+{
+	'tensor(bool)': numpy.bool_,
+	'tensor(double)': numpy.float64,
+	'tensor(float)': numpy.float32,
+	'tensor(float16)': numpy.float16,
+	'tensor(int32)': numpy.int32,
+	'tensor(int64)': numpy.int64,
+	'tensor(uint8)': numpy.uint8
+}
+EXECUTION_DEVICE_AFFINITY : threading.local = threading.local()
+EXECUTION_DEVICE_COUNTER : Iterator[int] = itertools.count()
 
 
 def get_inference_pool(module_name : str, model_names : List[str], model_source_set : DownloadSet) -> InferencePool:
 	while process_manager.is_checking():
 		sleep(0.5)
-	execution_device_ids = state_manager.get_item('execution_device_ids')
+	execution_device_id = get_execution_device_id()
 	execution_providers = resolve_execution_providers(module_name)
 	app_context = detect_app_context()
+	inference_context = get_inference_context(module_name, model_names, execution_device_id, execution_providers)
 
-	for execution_device_id in execution_device_ids:
-		inference_context = get_inference_context(module_name, model_names, execution_device_id, execution_providers)
+	if app_context == 'cli' and INFERENCE_POOL_SET.get('ui').get(inference_context):
+		INFERENCE_POOL_SET['cli'][inference_context] = INFERENCE_POOL_SET.get('ui').get(inference_context)
+	if app_context == 'ui' and INFERENCE_POOL_SET.get('cli').get(inference_context):
+		INFERENCE_POOL_SET['ui'][inference_context] = INFERENCE_POOL_SET.get('cli').get(inference_context)
+	if not INFERENCE_POOL_SET.get(app_context).get(inference_context):
+		INFERENCE_POOL_SET[app_context][inference_context] = create_inference_pool(module_name, model_source_set, execution_device_id, execution_providers)
 
-		if app_context == 'cli' and INFERENCE_POOL_SET.get('ui').get(inference_context):
-			INFERENCE_POOL_SET['cli'][inference_context] = INFERENCE_POOL_SET.get('ui').get(inference_context)
-		if app_context == 'ui' and INFERENCE_POOL_SET.get('cli').get(inference_context):
-			INFERENCE_POOL_SET['ui'][inference_context] = INFERENCE_POOL_SET.get('cli').get(inference_context)
-		if not INFERENCE_POOL_SET.get(app_context).get(inference_context):
-			INFERENCE_POOL_SET[app_context][inference_context] = create_inference_pool(model_source_set, execution_device_id, execution_providers)
+	return INFERENCE_POOL_SET.get(app_context).get(inference_context)
 
-	current_inference_context = get_inference_context(module_name, model_names, random.choice(execution_device_ids), execution_providers)
-	return INFERENCE_POOL_SET.get(app_context).get(current_inference_context)
+
+def get_execution_device_id() -> int:
+	execution_device_ids = state_manager.get_item('execution_device_ids')
+	execution_device_id = getattr(EXECUTION_DEVICE_AFFINITY, 'execution_device_id', None)
+
+	if execution_device_id not in execution_device_ids:
+		execution_device_id = execution_device_ids[next(EXECUTION_DEVICE_COUNTER) % len(execution_device_ids)]
+		pin_execution_device(execution_device_id)
+	return execution_device_id
 
 
-def create_inference_pool(model_source_set : DownloadSet, execution_device_id : int, execution_providers : List[ExecutionProvider]) -> InferencePool:
+def pin_execution_device(execution_device_id : int) -> None:
+	EXECUTION_DEVICE_AFFINITY.execution_device_id = execution_device_id
+
+
+def create_inference_pool(module_name : str, model_source_set : DownloadSet, execution_device_id : int, execution_providers : List[ExecutionProvider]) -> InferencePool:
 	inference_pool : InferencePool = {}
 
 	for model_name in model_source_set.keys():
 		model_path = model_source_set.get(model_name).get('path')
 		if is_file(model_path):
 			inference_pool[model_name] = create_inference_session(model_path, execution_device_id, execution_providers)
+			INFERENCE_STAGE_SET[inference_pool.get(model_name)] = create_inference_stage_name(module_name, model_path)
 
 	return inference_pool
 
 
+def create_inference_stage_name(module_name : str, model_path : str) -> str:
+	module_names = [ name for name in module_name.split('.') if name != 'core' ]
+	return 'forward.' + module_names[-1] + '.' + get_file_name(model_path)
+
+
+def get_inference_stage_name(inference_session : InferenceSession) -> str:
+	return INFERENCE_STAGE_SET.get(inference_session, 'forward')
+
+
 def clear_inference_pool(module_name : str, model_names : List[str]) -> None:
 	execution_device_ids = state_manager.get_item('execution_device_ids')
 	execution_providers = resolve_execution_providers(module_name)
 	app_context = detect_app_context()
 
 	if is_windows() and has_execution_provider('directml'):
+		for inference_pool in INFERENCE_POOL_SET.get(app_context).values():
+			clear_inference_bindings(inference_pool)
 		INFERENCE_POOL_SET[app_context].clear()
 
 	for execution_device_id in execution_device_ids:
 		inference_context = get_inference_context(module_name, model_names, execution_device_id, execution_providers)
 		if INFERENCE_POOL_SET.get(app_context).get(inference_context):
+			clear_inference_bindings(INFERENCE_POOL_SET.get(app_context).get(inference_context))
 			del INFERENCE_POOL_SET[app_context][inference_context]
 
 
+def clear_inference_bindings(inference_pool : InferencePool) -> None:
+	with thread_lock():
+		for inference_session in inference_pool.values():
+			INFERENCE_BINDING_SET.pop(inference_session, None)
+
+
 def create_inference_session(model_path : str, execution_device_id : int, execution_providers : List[ExecutionProvider]) -> InferenceSession:
 	model_file_name = get_file_name(model_path)
 	start_time = time()
@@ -82,6 +141,287 @@ def create_inference_session(model_path : str, execution_device_id : int, execut
 		fatal_exit(1)
 
 
+def detect_batch_size(inference_session : InferenceSession) -> Optional[int]:
+	for session_input in inference_session.get_inputs():
+		if session_input.shape and isinstance(session_input.shape[0], int) and session_input.shape[0] > 0:
+			return session_input.shape[0]
+	return None
+
+
+def has_batch_outputs(inference_session : InferenceSession) -> bool:
+	input_shape = get_first(inference_session.get_inputs()).shape
+
+	if input_shape and isinstance(input_shape[0], str):
+		return all(session_output.shape and session_output.shape[0] == input_shape[0] for session_output in inference_session.get_outputs())
+	return False
+
+
+def run_inference(inference_session : InferenceSession, inference_inputs : InferenceInputs, inference_semaphore : ContextManager[None]) -> InferenceOutputs:
+	inference_batch = get_inference_batch(inference_session)
+	batch_size = resolve_batch_size(inference_batch)
+
+	if batch_size > 1:
+		return run_batched_inference(inference_session, inference_batch, inference_inputs, inference_semaphore, batch_size)
+
+	with inference_semaphore:
+		return run_bound_inference(inference_session, inference_inputs)
+
+
+def run_chunked_inference(inference_session : InferenceSession, inference_inputs : InferenceInputs, inference_semaphore : ContextManager[None]) -> InferenceOutputs:
+	input_total = len(get_first(list(inference_inputs.values())))
+	batch_size = detect_batch_size(inference_session) or input_total
+	chunk_outputs = []
+
+	for batch_start in range(0, input_total, batch_size):
+		batch_end = batch_start + batch_size
+		chunk_outputs.append(run_inference(inference_session, { input_name: input_value[batch_start:batch_end] for input_name, input_value in inference_inputs.items() }, inference_semaphore))
+
+	return [ numpy.concatenate(output_values) for output_values in zip(*chunk_outputs) ]
+
+
+def run_bound_inference(inference_session : InferenceSession, inference_inputs : Dict[str, InferenceValue], keep_on_device : bool = False) -> List[InferenceValue]:
+	with profile_stage(get_inference_stage_name(inference_session)):
+		return forward_bound_inference(inference_session, inference_inputs, keep_on_device)
+
+
+def forward_bound_inference(inference_session : InferenceSession, inference_inputs : Dict[str, InferenceValue], keep_on_device : bool) -> List[InferenceValue]:
+	binding_device = resolve_binding_device(inference_session)
+
+	if not binding_device:
+		return inference_session.run(None, { input_name: input_value.numpy() if isinstance(input_value, OrtValue) else input_value for input_name, input_value in inference_inputs.items() })
+
+	device_type, device_id = binding_device
+	inference_binding = get_inference_binding(inference_session, inference_inputs, binding_device)
+	io_binding = inference_binding.get('io_binding')
+
+	for input_name, input_value in inference_inputs.items():
+		if isinstance(input_value, OrtValue):
+			io_binding.bind_ortvalue_input(input_name, input_value)
+		else:
+			inference_binding.get('input_values').get(input_name).update_inplace(numpy.ascontiguousarray(input_value))
+
+	for session_output in inference_session.get_outputs():
+		output_value = inference_binding.get('output_values').get(session_output.name)
+
+		if output_value is not None and not keep_on_device:
+			io_binding.bind_ortvalue_output(session_output.name, output_value)
+		else:
+			io_binding.bind_output(session_output.name, device_type, device_id)
+
+	inference_session.run_with_iobinding(io_binding)
+	output_values = io_binding.get_outputs()
+
+	if keep_on_device:
+		return output_values
+	return [ output_value.numpy() for output_value in output_values ]
+
+
+def get_inference_binding(inference_session : InferenceSession, inference_inputs : Dict[str, InferenceValue], binding_device : Tuple[str, int]) -> InferenceBinding:
+	thread_id = threading.get_ident()
+	binding_signature = create_binding_signature(inference_inputs)
+
+	with thread_lock():
+		thread_binding_set = INFERENCE_BINDING_SET.setdefault(inference_session, {})
+
+		if thread_id not in thread_binding_set:
+			prune_inference_bindings(thread_binding_set)
+			thread_binding_set[thread_id] = OrderedDict()
+		inference_binding_set = thread_binding_set.get(thread_id)
+
+	if binding_signature in inference_binding_set:
+		inference_binding_set.move_to_end(binding_signature)
+	else:
+		inference_binding_set[binding_signature] = create_inference_binding(inference_session, inference_inputs, binding_device)
+
+		while len(inference_binding_set) > INFERENCE_BINDING_LIMIT:
+			inference_binding_set.popitem(last = False)
+
+	return inference_binding_set.get(binding_signature)
+
+
+def create_inference_binding(inference_session : InferenceSession, inference_inputs : Dict[str, InferenceValue], binding_device : Tuple[str, int]) -> InferenceBinding:
+	device_type, device_id = binding_device
+	io_binding = inference_session.io_binding()
+	input_values = {}
+	output_values = {}
+
+	for input_name, input_value in inference_inputs.items():
+		if not isinstance(input_value, OrtValue):
+			input_values[input_name] = OrtValue.ortvalue_from_numpy(numpy.ascontiguousarray(input_value), device_type, device_id)
+			io_binding.bind_ortvalue_input(input_name, input_values.get(input_name))
+
+	for session_output in inference_session.get_outputs():
+		if session_output.type in INFERENCE_BINDING_TYPES and all(isinstance(output_dimension, int) for output_dimension in session_output.shape):
+			output_values[session_output.name] = OrtValue.ortvalue_from_shape_and_type(session_output.shape, INFERENCE_BINDING_TYPES.get(session_output.type), device_type, device_id)
+
+	return\
+	{
+		'io_binding': io_binding,
+		'input_values': input_values,
+		'output_values': output_values
+	}
+
+
+def prune_inference_bindings(thread_binding_set : InferenceThreadBindingSet) -> None:
+	thread_ids = [ thread.ident for thread in threading.enumerate() ]
+
+	for thread_id in list(thread_binding_set.keys()):
+		if thread_id not in thread_ids:
+			del thread_binding_set[thread_id]
+
+
+def create_binding_signature(inference_inputs : Dict[str, InferenceValue]) -> Tuple[Tuple[str, ...], ...]:
+	binding_signature = []
+
+	for input_name, input_value in inference_inputs.items():
+		if isinstance(input_value, OrtValue):
+			binding_signature.append((input_name, str(input_value.shape()), input_value.data_type()))
+		else:
+			input_value = numpy.asarray(input_value)
+			binding_signature.append((input_name, str(input_value.shape), input_value.dtype.str))
+
+	return tuple(binding_signature)
+
+
+def resolve_binding_device(inference_session : InferenceSession) -> Optional[Tuple[str, int]]:
+	execution_provider = get_first(inference_session.get_providers())
+
+	if execution_provider in INFERENCE_BINDING_DEVICES:
+		provider_options = inference_session.get_provider_options().get(execution_provider)
+		return INFERENCE_BINDING_DEVICES.get(execution_provider), int(provider_options.get('device_id', 0))
+	return None
+
+
+def run_batched_inference(inference_session : InferenceSession, inference_batch : InferenceBatch, inference_inputs : InferenceInputs, inference_semaphore : ContextManager[None], batch_size : int) -> InferenceOutputs:
+	inference_condition = inference_batch.get('condition')
+	inference_request : InferenceRequest =\
+	{
+		'inputs': inference_inputs,
+		'outputs': None,
+		'exception': None
+	}
+
+	with inference_condition:
+		inference_batch.get('requests').append(inference_request)
+		inference_condition.notify_all()
+
+		while inference_request.get('outputs') is None and inference_request.get('exception') is None:
+			if inference_batch.get('is_running'):
+				inference_condition.wait()
+			else:
+				inference_batch['is_running'] = True
+				batch_requests = collect_batch_requests(inference_batch, batch_size)
+				inference_condition.release()
+
+				try:
+					forward_batch_requests(inference_session, batch_requests, inference_semaphore)
+				finally:
+					inference_condition.acquire()
+					inference_batch['is_running'] = False
+					inference_condition.notify_all()
+
+	if inference_request.get('exception'):
+		raise inference_request.get('exception')
+	return inference_request.get('outputs')
+
+
+def collect_batch_requests(inference_batch : InferenceBatch, batch_size : int) -> List[InferenceRequest]:
+	inference_condition = inference_batch.get('condition')
+	inference_requests = inference_batch.get('requests')
+	batch_deadline = time() + INFERENCE_BATCH_TIMEOUT
+	batch_requests = []
+	batch_rows = 0
+
+	while count_request_rows(inference_requests) < batch_size and time() < batch_deadline:
+		inference_condition.wait(batch_deadline - time())
+
+	batch_signature = create_request_signature(inference_requests[0])
+
+	for inference_request in list(inference_requests):
+		request_rows = count_request_rows([ inference_request ])
+
+		if batch_requests and batch_rows + request_rows > batch_size:
+			break
+		if create_request_signature(inference_request) == batch_signature:
+			batch_requests.append(inference_request)
+			inference_requests.remove(inference_request)
+			batch_rows += request_rows
+
+	return batch_requests
+
+
+def forward_batch_requests(inference_session : InferenceSession, batch_requests : List[InferenceRequest], inference_semaphore : ContextManager[None]) -> None:
+	try:
+		if len(batch_requests) == 1:
+			batch_inputs = batch_requests[0].get('inputs')
+		else:
+			batch_inputs = {}
+
+			for input_name in batch_requests[0].get('inputs').keys():
+				batch_inputs[input_name] = numpy.concatenate([ numpy.asarray(batch_request.get('inputs').get(input_name)) for batch_request in batch_requests ])
+
+		with inference_semaphore, profile_stage(get_inference_stage_name(inference_session)):
+			batch_outputs = inference_session.run(None, batch_inputs)
+
+		if len(batch_requests) == 1:
+			batch_requests[0]['outputs'] = batch_outputs
+			return
+
+		batch_start = 0
+
+		for batch_request in batch_requests:
+			batch_end = batch_start + count_request_rows([ batch_request ])
+			batch_request['outputs'] = [ batch_output[batch_start:batch_end] for batch_output in batch_outputs ]
+			batch_start = batch_end
+
+	except Exception as exception:
+		for batch_request in batch_requests:
+			batch_request['exception'] = exception
+
+
+def count_request_rows(inference_requests : List[InferenceRequest]) -> int:
+	request_rows = 0
+
+	for inference_request in inference_requests:
+		for input_value in inference_request.get('inputs').values():
+			request_rows += len(input_value)
+			break
+
+	return request_rows
+
+
+def create_request_signature(inference_request : InferenceRequest) -> List[Tuple[str, Tuple[int, ...], str]]:
+	request_signature = []
+
+	for input_name, input_value in inference_request.get('inputs').items():
+		input_value = numpy.asarray(input_value)
+		request_signature.append((input_name, input_value.shape[1:], input_value.dtype.str))
+
+	return request_signature
+
+
+def get_inference_batch(inference_session : InferenceSession) -> InferenceBatch:
+	with thread_lock():
+		if inference_session not in INFERENCE_BATCH_SET:
+			INFERENCE_BATCH_SET[inference_session] =\
+			{
+				'condition': threading.Condition(),
+				'requests': [],
+				'batch_size': detect_batch_size(inference_session),
+				'has_batch_outputs': has_batch_outputs(inference_session),
+				'is_running': False
+			}
+		return INFERENCE_BATCH_SET.get(inference_session)
+
+
+def resolve_batch_size(inference_batch : InferenceBatch) -> int:
+	if inference_batch.get('batch_size') or not inference_batch.get('has_batch_outputs'):
+		return 1
+	execution_batch_size = state_manager.get_item('execution_batch_size') or 1
+	execution_thread_count = state_manager.get_item('execution_thread_count') or 1
+	return min(execution_batch_size, execution_thread_count)
+
+
 def get_inference_context(module_name : str, model_names : List[str], execution_device_id : int, execution_providers : List[ExecutionProvider]) -> str:
 	inference_context = '.'.join([ module_name ] + model_names + [ str(execution_device_id) ] + list(execution_providers))
 	return inference_context
@@ -30,6 +30,7 @@ def init_default_state():
         'face_detector_margin': (0, 0, 0, 0),
         'face_detector_angles': [0],
         'face_detector_score': 0.5,
+        'face_tracker_interval': 1,
         
         # Face landmarker defaults
         'face_landmarker_model': 'many',
@@ -71,11 +72,14 @@ def init_default_state():
         'execution_providers': ['cpu'],
         'execution_device_ids': [0],  # Usar device 0 por defecto (GPU en Colab, CPU si no hay GPU)
         'execution_thread_count': 4,
+        'execution_mode': 'thread',
+        'execution_batch_size': 1,
         'video_memory_strategy': 'moderate',
         'system_memory_limit': 0,
         
         # Other defaults
         'temp_frame_format': 'jpeg',
+        'frame_pipeline': 'stream',
         'keep_temp': False,
         'trim_frame_start': None,
         'trim_frame_end': None,
@@ -83,6 +87,8 @@ def init_default_state():
         'download_providers': ['github'],
         'download_scope': 'lite',
         'halt_on_error': False,
+        'profiler_path': None,
+        'profiler_format': 'json',
         
         # Background remover defaults
         'background_remover_model': 'ben_2',
@@ -93,6 +99,10 @@ def init_default_state():
         'face_swapper_pixel_boost': '128x128',  # Resolución de procesamiento
         'face_swapper_weight': 0.5,  # Balance entre rostro fuente y objetivo
         
+        # Frame enhancer defaults
+        'frame_enhancer_batch_size': 4,  # Tiles por inferencia cuando el modelo acepta lotes dinámicos
+        'frame_enhancer_tile_cache': False,
+        
         # Job defaults
         'job_id': '',
         'job_status': 'drafted',
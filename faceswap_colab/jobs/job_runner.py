@@ -1,3 +1,4 @@
+from faceswap_colab.app_context import use_app_context
 from faceswap_colab.ffmpeg import concat_video
 from faceswap_colab.filesystem import are_images, are_videos, move_file, remove_file
 from faceswap_colab.jobs import job_helper, job_manager
@@ -55,7 +56,10 @@ def retry_jobs(process_step : ProcessStep, halt_on_error : bool) -> bool:
 def run_step(job_id : str, step_index : int, step : JobStep, process_step : ProcessStep) -> bool:
 	step_args = step.get('args')
 
-	if job_manager.set_step_status(job_id, step_index, 'started') and process_step(job_id, step_index, step_args):
+	with use_app_context('cli'):
+		is_processed = job_manager.set_step_status(job_id, step_index, 'started') and process_step(job_id, step_index, step_args)
+
+	if is_processed:
 		output_path = step_args.get('output_path')
 		step_output_path = job_helper.get_step_output_path(job_id, step_index, output_path)
 
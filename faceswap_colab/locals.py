@@ -12,9 +12,13 @@ LOCALS : Locals =\
 		'extracting_frames': 'extracting frames with a resolution of {resolution} and {fps} frames per second',
 		'extracting_frames_succeeded': 'extracting frames succeeded',
 		'extracting_frames_failed': 'extracting frames failed',
+		'streaming_frames': 'streaming frames with a resolution of {resolution} and {fps} frames per second',
+		'streaming_frames_succeeded': 'streaming frames succeeded',
+		'streaming_frames_failed': 'streaming frames failed, falling back to temporary frames',
 		'analysing': 'analysing',
 		'extracting': 'extracting',
 		'streaming': 'streaming',
+		'streaming_statistics': 'latency of {capture_latency}ms, dropped {drop_total} and streamed {frame_total} frames',
 		'processing': 'processing',
 		'merging': 'merging',
 		'downloading': 'downloading',
@@ -34,10 +38,18 @@ LOCALS : Locals =\
 		'restoring_audio_succeeded': 'restoring audio succeeded',
 		'restoring_audio_skipped': 'restoring audio skipped',
 		'clearing_temp': 'clearing temporary resources',
+		'exporting_profiler_succeeded': 'exporting profiler to {profiler_path} succeeded',
+		'exporting_profiler_failed': 'exporting profiler to {profiler_path} failed',
+		'writing_benchmark_succeeded': 'writing benchmark results to {benchmark_path} succeeded',
+		'writing_benchmark_failed': 'writing benchmark results to {benchmark_path} failed',
+		'comparing_benchmark_skipped': 'comparing benchmark skipped as {benchmark_path} has no matching results',
+		'content_analyser_statistics': 'content analyser ran {run_count} model passes and saved {save_count} through early voting',
+		'face_store_statistics': 'face store had {hit_count} hits, {miss_count} misses and {evict_count} evictions',
 		'processing_stopped': 'processing stopped',
 		'processing_image_succeeded': 'processing to image succeeded in {seconds} seconds',
 		'processing_image_failed': 'processing to image failed',
 		'processing_video_succeeded': 'processing to video succeeded in {seconds} seconds',
+		'processing_device_frames': 'device {execution_device_id} processed {frame_total} frames at {fps} frames per second',
 		'processing_video_failed': 'processing to video failed',
 		'choose_image_source': 'choose an image for the source',
 		'choose_audio_source': 'choose an audio for the source',
@@ -113,6 +125,7 @@ LOCALS : Locals =\
 			'face_detector_margin': 'apply top, right, bottom and left margin to the frame',
 			'face_detector_angles': 'specify the angles to rotate the frame before detecting faces',
 			'face_detector_score': 'filter the detected faces based on the confidence score',
+			'face_tracker_interval': 'specify the amount of video frames between full face detections, tracking the faces in between',
 			'face_landmarker_model': 'choose the model responsible for detecting the face landmarks',
 			'face_landmarker_score': 'filter the detected face landmarks based on the confidence score',
 			'face_selector_mode': 'use reference based tracking or simple matching',
@@ -135,6 +148,7 @@ LOCALS : Locals =\
 			'trim_frame_start': 'specify the starting frame of the target video',
 			'trim_frame_end': 'specify the ending frame of the target video',
 			'temp_frame_format': 'specify the temporary resources format',
+			'frame_pipeline': 'stream frames through memory or extract them to the temporary resources',
 			'keep_temp': 'keep the temporary resources after processing',
 			'output_image_quality': 'specify the image quality which translates to the image compression',
 			'output_image_scale': 'specify the image scale based on the target image',
@@ -157,13 +171,23 @@ LOCALS : Locals =\
 			'benchmark_mode': 'choose the benchmark mode',
 			'benchmark_resolutions': 'choose the resolutions for the benchmarks (choices: {choices}, ...)',
 			'benchmark_cycle_count': 'specify the amount of cycles per benchmark',
+			'benchmark_suite': 'run the offline benchmark suite on synthetic frames',
+			'benchmark_models': 'specify the processor models swept by the benchmark suite',
+			'benchmark_thread_counts': 'specify the thread counts swept by the benchmark suite',
+			'benchmark_face_counts': 'specify the face counts swept by the benchmark suite',
+			'benchmark_output_path': 'specify the file to persist the benchmark suite results',
+			'benchmark_compare_path': 'specify the benchmark suite results to compare against',
 			'execution_device_ids': 'specify the devices used for processing',
 			'execution_providers': 'inference using different providers (choices: {choices}, ...)',
 			'execution_thread_count': 'specify the amount of parallel threads while processing',
+			'execution_mode': 'run the parallel frame processing in threads or in separate processes',
+			'execution_batch_size': 'specify the amount of inputs the threads coalesce into one inference',
 			'video_memory_strategy': 'balance fast processing and low VRAM usage',
 			'system_memory_limit': 'limit the available RAM that can be used while processing',
 			'log_level': 'adjust the message severity displayed in the terminal',
 			'halt_on_error': 'halt the program once an error occurred',
+			'profiler_path': 'specify the file to export the per stage timings of each job',
+			'profiler_format': 'choose the format of the exported per stage timings',
 			'run': 'run the program',
 			'headless_run': 'run the program in headless mode',
 			'batch_run': 'run the program in batch mode',
@@ -266,6 +290,8 @@ LOCALS : Locals =\
 			'video_memory_strategy_dropdown': 'VIDEO MEMORY STRATEGY',
 			'webcam_fps_slider': 'WEBCAM FPS',
 			'webcam_image': 'WEBCAM',
+			'webcam_latency_slider': 'WEBCAM LATENCY',
+			'webcam_statistics_textbox': 'WEBCAM STATISTICS',
 			'webcam_device_id_dropdown': 'WEBCAM DEVICE ID',
 			'webcam_mode_radio': 'WEBCAM MODE',
 			'webcam_resolution_dropdown': 'WEBCAM RESOLUTION'
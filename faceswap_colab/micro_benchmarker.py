@@ -0,0 +1,206 @@
+import statistics
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable, List, Sequence, Tuple
+
+import cv2
+import numpy
+
+from faceswap_colab import logger, state_manager
+from faceswap_colab.cli_helper import render_table
+from faceswap_colab.face_detector import decode_with_scrfd
+from faceswap_colab.face_helper import apply_nms, blend_paste_back, calculate_paste_area, create_static_anchors, distance_to_bounding_box, distance_to_face_landmark_5, normalize_bounding_box, normalize_bounding_boxes, paste_back
+from faceswap_colab.types import BoundingBox, Detection, FaceLandmark5, Mask, Matrix, MicroBenchmarkSet, Resolution, Score, VisionFrame
+from faceswap_colab.vision import unpack_resolution
+
+MICRO_BENCHMARK_RESOLUTIONS : List[Resolution] = [ (1920, 1080), (3840, 2160) ]
+MICRO_BENCHMARK_CROP_SIZE : int = 512
+MICRO_BENCHMARK_DETECTOR_SIZE : str = '640x640'
+MICRO_BENCHMARK_DETECTOR_SCORES : List[Score] = [ 0.5, 0.05 ]
+MICRO_BENCHMARK_FACE_COUNT : int = 8
+MICRO_BENCHMARK_NMS_THRESHOLD : float = 0.4
+
+
+def run(cycle_count : int = 20) -> List[MicroBenchmarkSet]:
+	micro_benchmarks = []
+
+	for resolution in MICRO_BENCHMARK_RESOLUTIONS:
+		micro_benchmarks.append(cycle(paste_back_legacy, resolution, cycle_count))
+		micro_benchmarks.append(cycle(paste_back, resolution, cycle_count))
+		micro_benchmarks.append(cycle(blend_paste_back, resolution, cycle_count))
+
+	for face_detector_score in MICRO_BENCHMARK_DETECTOR_SCORES:
+		state_manager.init_item('face_detector_score', face_detector_score)
+		micro_benchmarks.append(cycle_detection(post_process_detection_legacy, cycle_count))
+		micro_benchmarks.append(cycle_detection(post_process_detection, cycle_count))
+
+	return micro_benchmarks
+
+
+def cycle(paste_method : Callable[[VisionFrame, VisionFrame, Mask, Matrix], Any], resolution : Resolution, cycle_count : int) -> MicroBenchmarkSet:
+	temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix = create_paste_inputs(resolution)
+	process_times = []
+
+	for _ in range(cycle_count):
+		start_time = perf_counter()
+		paste_method(temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix)
+		process_times.append(perf_counter() - start_time)
+
+	tracemalloc.start()
+	paste_method(temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix)
+	_, peak_memory = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	return\
+	{
+		'method_name': paste_method.__name__,
+		'resolution': str(resolution[0]) + 'x' + str(resolution[1]),
+		'cycle_count': cycle_count,
+		'average_run': round(statistics.mean(process_times) * 1000, 3),
+		'peak_memory': round(peak_memory / 1024 / 1024, 2)
+	}
+
+
+def cycle_detection(post_process_method : Callable[[Detection], Sequence[int]], cycle_count : int) -> MicroBenchmarkSet:
+	detection = create_detection_inputs()
+	process_times = []
+
+	for _ in range(cycle_count):
+		start_time = perf_counter()
+		post_process_method(detection)
+		process_times.append(perf_counter() - start_time)
+
+	tracemalloc.start()
+	post_process_method(detection)
+	_, peak_memory = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	return\
+	{
+		'method_name': post_process_method.__name__ + '@' + str(state_manager.get_item('face_detector_score')),
+		'resolution': MICRO_BENCHMARK_DETECTOR_SIZE,
+		'cycle_count': cycle_count,
+		'average_run': round(statistics.mean(process_times) * 1000, 3),
+		'peak_memory': round(peak_memory / 1024 / 1024, 2)
+	}
+
+
+def create_detection_inputs() -> Detection:
+	face_detector_width, face_detector_height = unpack_resolution(MICRO_BENCHMARK_DETECTOR_SIZE)
+	random_generator = numpy.random.default_rng(0)
+	face_centers = random_generator.uniform(64, face_detector_width - 64, (MICRO_BENCHMARK_FACE_COUNT, 2))
+	face_sizes = random_generator.uniform(32, 160, MICRO_BENCHMARK_FACE_COUNT)
+	face_scores_raw = []
+	bounding_boxes_raw = []
+	face_landmarks_5_raw = []
+
+	for feature_stride in [ 8, 16, 32 ]:
+		anchors = create_static_anchors(feature_stride, 2, face_detector_height // feature_stride, face_detector_width // feature_stride)
+		face_distances = numpy.linalg.norm(anchors[:, numpy.newaxis] - face_centers, axis = 2) / face_sizes
+		face_indices = numpy.argmin(face_distances, axis = 1)
+		nearest_distances = face_distances[numpy.arange(len(anchors)), face_indices]
+		nearest_centers = face_centers[face_indices]
+		nearest_sizes = face_sizes[face_indices, numpy.newaxis] * random_generator.uniform(0.45, 0.55, (len(anchors), 1))
+		face_scores_raw.append((numpy.exp(-4 * nearest_distances ** 2) * 0.9 + random_generator.uniform(0, 0.1, len(anchors))).reshape(-1, 1).astype(numpy.float32))
+		bounding_boxes_raw.append((numpy.concatenate([ anchors - nearest_centers + nearest_sizes, nearest_centers + nearest_sizes - anchors ], axis = 1) / feature_stride).astype(numpy.float32))
+		face_landmarks_5_raw.append(((numpy.tile(nearest_centers, 5) - numpy.tile(anchors, 5)) / feature_stride + random_generator.normal(0, 0.5, (len(anchors), 10))).astype(numpy.float32))
+
+	return face_scores_raw + bounding_boxes_raw + face_landmarks_5_raw
+
+
+def post_process_detection(detection : Detection) -> Sequence[int]:
+	bounding_boxes, face_scores, _ = decode_with_scrfd(detection, MICRO_BENCHMARK_DETECTOR_SIZE, 1.0, 1.0)
+	bounding_boxes = normalize_bounding_boxes(bounding_boxes)
+	return apply_nms(bounding_boxes, face_scores, state_manager.get_item('face_detector_score'), MICRO_BENCHMARK_NMS_THRESHOLD)
+
+
+def post_process_detection_legacy(detection : Detection) -> Sequence[int]:
+	bounding_boxes, face_scores, _ = decode_with_scrfd_legacy(detection, MICRO_BENCHMARK_DETECTOR_SIZE, 1.0, 1.0)
+	bounding_boxes = [ normalize_bounding_box(bounding_box) for bounding_box in bounding_boxes ]
+	bounding_boxes_norm = [ (x1, y1, x2 - x1, y2 - y1) for (x1, y1, x2, y2) in bounding_boxes ]
+	return cv2.dnn.NMSBoxes(bounding_boxes_norm, face_scores, score_threshold = state_manager.get_item('face_detector_score'), nms_threshold = MICRO_BENCHMARK_NMS_THRESHOLD)
+
+
+def decode_with_scrfd_legacy(detection : Detection, face_detector_size : str, ratio_height : float, ratio_width : float) -> Tuple[List[BoundingBox], List[Score], List[FaceLandmark5]]:
+	bounding_boxes = []
+	face_scores = []
+	face_landmarks_5 = []
+	feature_strides = [ 8, 16, 32 ]
+	feature_map_channel = 3
+	anchor_total = 2
+	face_detector_score = state_manager.get_item('face_detector_score')
+	face_detector_width, face_detector_height = unpack_resolution(face_detector_size)
+
+	for index, feature_stride in enumerate(feature_strides):
+		face_scores_raw = detection[index]
+		keep_indices = numpy.where(face_scores_raw >= face_detector_score)[0]
+
+		if numpy.any(keep_indices):
+			stride_height = face_detector_height // feature_stride
+			stride_width = face_detector_width // feature_stride
+			anchors = create_static_anchors(feature_stride, anchor_total, stride_height, stride_width)
+			bounding_boxes_raw = detection[index + feature_map_channel] * feature_stride
+			face_landmarks_5_raw = detection[index + feature_map_channel * 2] * feature_stride
+
+			for bounding_box_raw in distance_to_bounding_box(anchors, bounding_boxes_raw)[keep_indices]:
+				bounding_boxes.append(numpy.array(
+				[
+					bounding_box_raw[0] * ratio_width,
+					bounding_box_raw[1] * ratio_height,
+					bounding_box_raw[2] * ratio_width,
+					bounding_box_raw[3] * ratio_height
+				]))
+
+			for face_score_raw in face_scores_raw[keep_indices]:
+				face_scores.append(face_score_raw[0])
+
+			for face_landmark_raw_5 in distance_to_face_landmark_5(anchors, face_landmarks_5_raw)[keep_indices]:
+				face_landmarks_5.append(face_landmark_raw_5 * [ ratio_width, ratio_height ])
+
+	return bounding_boxes, face_scores, face_landmarks_5
+
+
+def create_paste_inputs(resolution : Resolution) -> Tuple[VisionFrame, VisionFrame, Mask, Matrix]:
+	temp_width, temp_height = resolution
+	random_generator = numpy.random.default_rng(0)
+	temp_vision_frame = random_generator.integers(0, 255, (temp_height, temp_width, 3), dtype = numpy.uint8)
+	crop_vision_frame = random_generator.integers(0, 255, (MICRO_BENCHMARK_CROP_SIZE, MICRO_BENCHMARK_CROP_SIZE, 3), dtype = numpy.uint8)
+	crop_vision_mask = numpy.zeros((MICRO_BENCHMARK_CROP_SIZE, MICRO_BENCHMARK_CROP_SIZE), dtype = numpy.float32)
+	crop_vision_mask[32:-32, 32:-32] = 1
+	crop_vision_mask = cv2.GaussianBlur(crop_vision_mask, (0, 0), 16)
+	scale = MICRO_BENCHMARK_CROP_SIZE / (temp_height / 2)
+	affine_matrix = numpy.array([ [ scale, 0, -temp_width / 4 * scale ], [ 0, scale, -temp_height / 4 * scale ] ])
+	return temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix
+
+
+def paste_back_legacy(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_vision_mask : Mask, affine_matrix : Matrix) -> VisionFrame:
+	paste_bounding_box, paste_matrix = calculate_paste_area(temp_vision_frame, crop_vision_frame, affine_matrix)
+	x1, y1, x2, y2 = paste_bounding_box
+	paste_width = x2 - x1
+	paste_height = y2 - y1
+	inverse_vision_mask = cv2.warpAffine(crop_vision_mask, paste_matrix, (paste_width, paste_height)).clip(0, 1)
+	inverse_vision_mask = numpy.expand_dims(inverse_vision_mask, axis = -1)
+	inverse_vision_frame = cv2.warpAffine(crop_vision_frame, paste_matrix, (paste_width, paste_height), borderMode = cv2.BORDER_REPLICATE)
+	temp_vision_frame = temp_vision_frame.copy()
+	paste_vision_frame = temp_vision_frame[y1:y2, x1:x2]
+	paste_vision_frame = paste_vision_frame * (1 - inverse_vision_mask) + inverse_vision_frame * inverse_vision_mask
+	temp_vision_frame[y1:y2, x1:x2] = paste_vision_frame.astype(temp_vision_frame.dtype)
+	return temp_vision_frame
+
+
+def render() -> None:
+	headers =\
+	[
+		'method_name',
+		'resolution',
+		'cycle_count',
+		'average_run',
+		'peak_memory'
+	]
+	contents = [ list(micro_benchmark.values()) for micro_benchmark in run() ]
+	render_table(headers, contents)
+
+
+if __name__ == '__main__':
+	logger.init('info')
+	render()
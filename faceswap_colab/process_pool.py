@@ -0,0 +1,117 @@
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.sharedctypes import Synchronized, SynchronizedArray
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.util import Finalize
+from typing import Dict, Optional, Tuple
+
+import numpy
+
+from faceswap_colab import inference_manager, logger, process_manager, state_manager
+from faceswap_colab.app_context import set_app_context
+from faceswap_colab.thread_helper import thread_lock
+from faceswap_colab.types import DeviceFrameTotals, State, StateSnapshot, VisionFrame, WorkerCounter
+
+SHARED_MEMORY_SET : Dict[str, SharedMemory] = {}
+DEVICE_FRAME_TOTALS : Optional[DeviceFrameTotals] = None
+
+
+def create_executor() -> Executor:
+	execution_device_total = len(state_manager.get_item('execution_device_ids'))
+
+	if state_manager.get_item('execution_mode') == 'process':
+		mp_context = multiprocessing.get_context('spawn')
+		worker_counter = mp_context.Value('i', 0)
+		device_frame_totals = mp_context.Array('q', execution_device_total)
+		init_device_frame_totals(device_frame_totals)
+		return ProcessPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), mp_context = mp_context, initializer = init_process, initargs = (dict(state_manager.get_state()), worker_counter, device_frame_totals))
+
+	init_device_frame_totals([ 0 ] * execution_device_total)
+	return ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), initializer = init_worker, initargs = (itertools.count(), state_manager.create_state_snapshot()))
+
+
+def init_process(state : State, worker_counter : Synchronized, device_frame_totals : SynchronizedArray) -> None:
+	for key, value in state.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+
+	logger.init(state_manager.get_item('log_level'))
+	process_manager.start()
+	init_device_frame_totals(device_frame_totals)
+	init_worker(worker_counter, state_manager.create_state_snapshot())
+	Finalize(None, detach_frame_rings, exitpriority = 0)
+
+
+def init_worker(worker_counter : WorkerCounter, state_snapshot : StateSnapshot) -> None:
+	set_app_context('cli')
+	state_manager.set_state_snapshot(state_snapshot)
+	execution_device_ids = state_manager.get_item('execution_device_ids')
+	worker_index = claim_worker_index(worker_counter)
+
+	inference_manager.pin_execution_device(execution_device_ids[worker_index % len(execution_device_ids)])
+
+
+def claim_worker_index(worker_counter : WorkerCounter) -> int:
+	if isinstance(worker_counter, Synchronized):
+		with worker_counter.get_lock():
+			worker_index = worker_counter.value
+			worker_counter.value += 1
+		return worker_index
+	return next(worker_counter)
+
+
+def init_device_frame_totals(device_frame_totals : DeviceFrameTotals) -> None:
+	global DEVICE_FRAME_TOTALS
+
+	DEVICE_FRAME_TOTALS = device_frame_totals
+
+
+def get_device_frame_lock() -> threading.Lock:
+	if isinstance(DEVICE_FRAME_TOTALS, SynchronizedArray):
+		return DEVICE_FRAME_TOTALS.get_lock()
+	return thread_lock()
+
+
+def count_device_frame() -> None:
+	execution_device_ids = state_manager.get_item('execution_device_ids')
+	execution_device_id = inference_manager.get_execution_device_id()
+
+	if DEVICE_FRAME_TOTALS is not None and execution_device_id in execution_device_ids:
+		with get_device_frame_lock():
+			DEVICE_FRAME_TOTALS[execution_device_ids.index(execution_device_id)] += 1
+
+
+def get_device_frame_totals() -> Dict[int, int]:
+	execution_device_ids = state_manager.get_item('execution_device_ids')
+
+	if DEVICE_FRAME_TOTALS is not None:
+		return dict(zip(execution_device_ids, DEVICE_FRAME_TOTALS[:]))
+	return {}
+
+
+def create_frame_ring(frame_shape : Tuple[int, int, int], slot_total : int) -> Optional[SharedMemory]:
+	if state_manager.get_item('execution_mode') == 'process':
+		frame_ring = SharedMemory(create = True, size = int(numpy.prod(frame_shape)) * slot_total)
+		SHARED_MEMORY_SET[frame_ring.name] = frame_ring
+		return frame_ring
+	return None
+
+
+def get_frame_slot(shared_memory_name : str, frame_shape : Tuple[int, int, int], slot_index : int) -> VisionFrame:
+	if shared_memory_name not in SHARED_MEMORY_SET:
+		SHARED_MEMORY_SET[shared_memory_name] = SharedMemory(name = shared_memory_name)
+
+	frame_size = int(numpy.prod(frame_shape))
+	return numpy.ndarray(frame_shape, dtype = numpy.uint8, buffer = SHARED_MEMORY_SET.get(shared_memory_name).buf, offset = slot_index * frame_size)
+
+
+def clear_frame_ring(frame_ring : SharedMemory) -> None:
+	SHARED_MEMORY_SET.pop(frame_ring.name, None)
+	frame_ring.close()
+	frame_ring.unlink()
+
+
+def detach_frame_rings() -> None:
+	for shared_memory_name in list(SHARED_MEMORY_SET.keys()):
+		SHARED_MEMORY_SET.pop(shared_memory_name).close()
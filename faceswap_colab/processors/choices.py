@@ -23,5 +23,5 @@ from faceswap_colab.processors.modules.face_editor.choices import (  # noqa: F40
 from faceswap_colab.processors.modules.face_enhancer.choices import face_enhancer_blend_range, face_enhancer_models, face_enhancer_weight_range  # noqa: F401
 from faceswap_colab.processors.modules.face_swapper.choices import face_swapper_models, face_swapper_set, face_swapper_weight_range  # noqa: F401
 from faceswap_colab.processors.modules.frame_colorizer.choices import frame_colorizer_blend_range, frame_colorizer_models, frame_colorizer_sizes  # noqa: F401
-from faceswap_colab.processors.modules.frame_enhancer.choices import frame_enhancer_blend_range, frame_enhancer_models  # noqa: F401
+from faceswap_colab.processors.modules.frame_enhancer.choices import frame_enhancer_batch_size_range, frame_enhancer_blend_range, frame_enhancer_models  # noqa: F401
 from faceswap_colab.processors.modules.lip_syncer.choices import lip_syncer_models, lip_syncer_weight_range  # noqa: F401
@@ -12,13 +12,14 @@ from faceswap_colab.common_helper import create_int_metavar, is_macos
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from faceswap_colab.execution import has_execution_provider
 from faceswap_colab.face_analyser import scale_face
-from faceswap_colab.face_helper import merge_matrix, paste_back, scale_face_landmark_5, warp_face_by_face_landmark_5
+from faceswap_colab.face_helper import blend_paste_back, merge_matrix, scale_face_landmark_5, warp_face_by_face_landmark_5
 from faceswap_colab.face_masker import create_box_mask, create_occlusion_mask
 from faceswap_colab.face_selector import select_faces
 from faceswap_colab.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from faceswap_colab.processors.modules.age_modifier import choices as age_modifier_choices
 from faceswap_colab.processors.modules.age_modifier.types import AgeModifierDirection, AgeModifierInputs
 from faceswap_colab.processors.types import ProcessorOutputs
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.program_helper import find_argument_group
 from faceswap_colab.thread_helper import thread_semaphore
 from faceswap_colab.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
@@ -161,8 +162,8 @@ def modify_age(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFra
 	extend_affine_matrix *= (model_sizes.get('target')[0] * 4) / model_sizes.get('target_with_background')[0]
 	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
 	crop_mask = cv2.resize(crop_mask, (model_sizes.get('target')[0] * 4, model_sizes.get('target')[1] * 4))
-	paste_vision_frame = paste_back(temp_vision_frame, extend_vision_frame, crop_mask, extend_affine_matrix)
-	return paste_vision_frame
+	blend_paste_back(temp_vision_frame, extend_vision_frame, crop_mask, extend_affine_matrix)
+	return temp_vision_frame
 
 
 def forward(crop_vision_frame : VisionFrame, extend_vision_frame : VisionFrame, age_modifier_direction : AgeModifierDirection) -> VisionFrame:
@@ -180,7 +181,7 @@ def forward(crop_vision_frame : VisionFrame, extend_vision_frame : VisionFrame,
 		if age_modifier_input.name == 'direction':
 			age_modifier_inputs[age_modifier_input.name] = age_modifier_direction
 
-	with thread_semaphore():
+	with thread_semaphore(), profile_stage(inference_manager.get_inference_stage_name(age_modifier)):
 		crop_vision_frame = age_modifier.run(None, age_modifier_inputs)[0][0]
 
 	return crop_vision_frame
@@ -209,9 +210,11 @@ def process_frame(inputs : AgeModifierInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, inputs.get('reference_face'), inputs.get('target_vision_key'))
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
 			temp_vision_frame = modify_age(target_face, temp_vision_frame)
@@ -1,12 +1,13 @@
-from typing import Any, Literal, TypeAlias, TypedDict
+from typing import Any, Literal, Optional, TypeAlias, TypedDict
 
 from numpy.typing import NDArray
 
-from faceswap_colab.types import Mask, VisionFrame
+from faceswap_colab.types import Face, Mask, VisionFrame
 
 AgeModifierInputs = TypedDict('AgeModifierInputs',
 {
 	'reference_vision_frame' : VisionFrame,
+	'reference_face' : Optional[Face],
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
 	'temp_vision_mask' : Mask
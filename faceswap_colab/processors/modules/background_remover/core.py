@@ -16,6 +16,7 @@ from faceswap_colab.normalizer import normalize_color
 from faceswap_colab.processors.modules.background_remover import choices as background_remover_choices
 from faceswap_colab.processors.modules.background_remover.types import BackgroundRemoverInputs
 from faceswap_colab.processors.types import ProcessorOutputs
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.program_helper import find_argument_group
 from faceswap_colab.sanitizer import sanitize_int_range
 from faceswap_colab.thread_helper import thread_semaphore
@@ -472,7 +473,7 @@ def forward(temp_vision_frame : VisionFrame) -> VisionFrame:
 	background_remover = get_inference_pool().get('background_remover')
 	model_name = state_manager.get_item('background_remover_model')
 
-	with thread_semaphore():
+	with thread_semaphore(), profile_stage(inference_manager.get_inference_stage_name(background_remover)):
 		remove_vision_frame = background_remover.run(None,
 		{
 			'input': temp_vision_frame
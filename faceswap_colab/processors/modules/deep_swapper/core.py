@@ -12,13 +12,14 @@ from faceswap_colab import config, content_analyser, face_classifier, face_detec
 from faceswap_colab.common_helper import create_int_metavar
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url_by_provider
 from faceswap_colab.face_analyser import scale_face
-from faceswap_colab.face_helper import paste_back, warp_face_by_face_landmark_5
+from faceswap_colab.face_helper import blend_paste_back, warp_face_by_face_landmark_5
 from faceswap_colab.face_masker import create_area_mask, create_box_mask, create_occlusion_mask, create_region_mask
 from faceswap_colab.face_selector import select_faces
 from faceswap_colab.filesystem import get_file_name, in_directory, is_image, is_video, resolve_file_paths, resolve_relative_path, same_file_extension
 from faceswap_colab.processors.modules.deep_swapper import choices as deep_swapper_choices
 from faceswap_colab.processors.modules.deep_swapper.types import DeepSwapperInputs, DeepSwapperMorph
 from faceswap_colab.processors.types import ProcessorOutputs
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.program_helper import find_argument_group
 from faceswap_colab.thread_helper import thread_semaphore
 from faceswap_colab.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, Mask, ModelOptions, ModelSet, ProcessMode, VisionFrame
@@ -355,8 +356,8 @@ def swap_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFram
 		crop_masks.append(region_mask)
 
 	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	return paste_vision_frame
+	blend_paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+	return temp_vision_frame
 
 
 def forward(crop_vision_frame : VisionFrame, deep_swapper_morph : DeepSwapperMorph) -> Tuple[VisionFrame, Mask, Mask]:
@@ -369,7 +370,7 @@ def forward(crop_vision_frame : VisionFrame, deep_swapper_morph : DeepSwapperMor
 		if deep_swapper_input.name == 'morph_value:0':
 			deep_swapper_inputs[deep_swapper_input.name] = deep_swapper_morph
 
-	with thread_semaphore():
+	with thread_semaphore(), profile_stage(inference_manager.get_inference_stage_name(deep_swapper)):
 		crop_target_mask, crop_vision_frame, crop_source_mask = deep_swapper.run(None, deep_swapper_inputs)
 
 	return crop_vision_frame[0], crop_source_mask[0], crop_target_mask[0]
@@ -414,9 +415,11 @@ def process_frame(inputs : DeepSwapperInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, inputs.get('reference_face'), inputs.get('target_vision_key'))
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
 			temp_vision_frame = swap_face(target_face, temp_vision_frame)
@@ -1,12 +1,13 @@
-from typing import Any, TypeAlias, TypedDict
+from typing import Any, Optional, TypeAlias, TypedDict
 
 from numpy.typing import NDArray
 
-from faceswap_colab.types import Mask, VisionFrame
+from faceswap_colab.types import Face, Mask, VisionFrame
 
 DeepSwapperInputs = TypedDict('DeepSwapperInputs',
 {
 	'reference_vision_frame' : VisionFrame,
+	'reference_face' : Optional[Face],
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
 	'temp_vision_mask' : Mask
@@ -11,7 +11,7 @@ from faceswap_colab import config, content_analyser, face_classifier, face_detec
 from faceswap_colab.common_helper import create_int_metavar
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from faceswap_colab.face_analyser import scale_face
-from faceswap_colab.face_helper import paste_back, warp_face_by_face_landmark_5
+from faceswap_colab.face_helper import blend_paste_back, warp_face_by_face_landmark_5
 from faceswap_colab.face_masker import create_box_mask, create_occlusion_mask
 from faceswap_colab.face_selector import select_faces
 from faceswap_colab.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
@@ -170,8 +170,8 @@ def restore_expression(target_face : Face, target_vision_frame : VisionFrame, te
 	temp_crop_vision_frame = apply_restore(target_crop_vision_frame, temp_crop_vision_frame, expression_restorer_factor)
 	temp_crop_vision_frame = normalize_crop_frame(temp_crop_vision_frame)
 	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	paste_vision_frame = paste_back(temp_vision_frame, temp_crop_vision_frame, crop_mask, affine_matrix)
-	return paste_vision_frame
+	blend_paste_back(temp_vision_frame, temp_crop_vision_frame, crop_mask, affine_matrix)
+	return temp_vision_frame
 
 
 def apply_restore(target_crop_vision_frame : VisionFrame, temp_crop_vision_frame : VisionFrame, expression_restorer_factor : float) -> VisionFrame:
@@ -205,10 +205,10 @@ def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeat
 	feature_extractor = get_inference_pool().get('feature_extractor')
 
 	with conditional_thread_semaphore():
-		feature_volume = feature_extractor.run(None,
+		feature_volume = inference_manager.run_bound_inference(feature_extractor,
 		{
 			'input': crop_vision_frame
-		})[0]
+		}, keep_on_device = True)[0]
 
 	return feature_volume
 
@@ -217,7 +217,7 @@ def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortrai
 	motion_extractor = get_inference_pool().get('motion_extractor')
 
 	with conditional_thread_semaphore():
-		pitch, yaw, roll, scale, translation, expression, motion_points = motion_extractor.run(None,
+		pitch, yaw, roll, scale, translation, expression, motion_points = inference_manager.run_bound_inference(motion_extractor,
 		{
 			'input': crop_vision_frame
 		})
@@ -229,7 +229,7 @@ def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, target_mo
 	generator = get_inference_pool().get('generator')
 
 	with thread_semaphore():
-		crop_vision_frame = generator.run(None,
+		crop_vision_frame = inference_manager.run_bound_inference(generator,
 		{
 			'feature_volume': feature_volume,
 			'source': target_motion_points,
@@ -260,9 +260,11 @@ def process_frame(inputs : ExpressionRestorerInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, inputs.get('reference_face'), inputs.get('target_vision_key'))
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
 			temp_vision_frame = restore_expression(target_face, target_vision_frame, temp_vision_frame)
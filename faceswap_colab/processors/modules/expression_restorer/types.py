@@ -1,10 +1,11 @@
-from typing import List, Literal, TypedDict
+from typing import List, Literal, Optional, TypedDict
 
-from faceswap_colab.types import Mask, VisionFrame
+from faceswap_colab.types import Face, Mask, VisionFrame
 
 ExpressionRestorerInputs = TypedDict('ExpressionRestorerInputs',
 {
 	'reference_vision_frame' : VisionFrame,
+	'reference_face' : Optional[Face],
 	'source_vision_frames' : List[VisionFrame],
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
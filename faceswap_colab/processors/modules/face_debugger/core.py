@@ -223,7 +223,7 @@ def process_frame(inputs : FaceDebuggerInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, inputs.get('reference_face'), inputs.get('target_vision_key'))
 
 	if target_faces:
 		for target_face in target_faces:
@@ -11,7 +11,7 @@ from faceswap_colab import config, content_analyser, face_classifier, face_detec
 from faceswap_colab.common_helper import create_float_metavar
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from faceswap_colab.face_analyser import scale_face
-from faceswap_colab.face_helper import paste_back, scale_face_landmark_5, warp_face_by_face_landmark_5
+from faceswap_colab.face_helper import blend_paste_back, scale_face_landmark_5, warp_face_by_face_landmark_5
 from faceswap_colab.face_masker import create_box_mask
 from faceswap_colab.face_selector import select_faces
 from faceswap_colab.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
@@ -209,8 +209,8 @@ def edit_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFram
 	crop_vision_frame = prepare_crop_frame(crop_vision_frame)
 	crop_vision_frame = apply_edit(crop_vision_frame, target_face.landmark_set.get('68'))
 	crop_vision_frame = normalize_crop_frame(crop_vision_frame)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, box_mask, affine_matrix)
-	return paste_vision_frame
+	blend_paste_back(temp_vision_frame, crop_vision_frame, box_mask, affine_matrix)
+	return temp_vision_frame
 
 
 def apply_edit(crop_vision_frame : VisionFrame, face_landmark_68 : FaceLandmark68) -> VisionFrame:
@@ -242,10 +242,10 @@ def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeat
 	feature_extractor = get_inference_pool().get('feature_extractor')
 
 	with conditional_thread_semaphore():
-		feature_volume = feature_extractor.run(None,
+		feature_volume = inference_manager.run_bound_inference(feature_extractor,
 		{
 			'input': crop_vision_frame
-		})[0]
+		}, keep_on_device = True)[0]
 
 	return feature_volume
 
@@ -254,7 +254,7 @@ def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortrai
 	motion_extractor = get_inference_pool().get('motion_extractor')
 
 	with conditional_thread_semaphore():
-		pitch, yaw, roll, scale, translation, expression, motion_points = motion_extractor.run(None,
+		pitch, yaw, roll, scale, translation, expression, motion_points = inference_manager.run_bound_inference(motion_extractor,
 		{
 			'input': crop_vision_frame
 		})
@@ -266,7 +266,7 @@ def forward_retarget_eye(eye_motion_points : LivePortraitMotionPoints) -> LivePo
 	eye_retargeter = get_inference_pool().get('eye_retargeter')
 
 	with conditional_thread_semaphore():
-		eye_motion_points = eye_retargeter.run(None,
+		eye_motion_points = inference_manager.run_bound_inference(eye_retargeter,
 		{
 			'input': eye_motion_points
 		})[0]
@@ -278,7 +278,7 @@ def forward_retarget_lip(lip_motion_points : LivePortraitMotionPoints) -> LivePo
 	lip_retargeter = get_inference_pool().get('lip_retargeter')
 
 	with conditional_thread_semaphore():
-		lip_motion_points = lip_retargeter.run(None,
+		lip_motion_points = inference_manager.run_bound_inference(lip_retargeter,
 		{
 			'input': lip_motion_points
 		})[0]
@@ -290,11 +290,11 @@ def forward_stitch_motion_points(source_motion_points : LivePortraitMotionPoints
 	stitcher = get_inference_pool().get('stitcher')
 
 	with thread_semaphore():
-		motion_points = stitcher.run(None,
+		motion_points = inference_manager.run_bound_inference(stitcher,
 		{
 			'source': source_motion_points,
 			'target': target_motion_points
-		})[0]
+		}, keep_on_device = True)[0]
 
 	return motion_points
 
@@ -303,7 +303,7 @@ def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, source_mo
 	generator = get_inference_pool().get('generator')
 
 	with thread_semaphore():
-		crop_vision_frame = generator.run(None,
+		crop_vision_frame = inference_manager.run_bound_inference(generator,
 		{
 			'feature_volume': feature_volume,
 			'source': source_motion_points,
@@ -489,9 +489,11 @@ def process_frame(inputs : FaceEditorInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, inputs.get('reference_face'), inputs.get('target_vision_key'))
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
 			temp_vision_frame = edit_face(target_face, temp_vision_frame)
@@ -1,10 +1,11 @@
-from typing import Literal, TypedDict
+from typing import Literal, Optional, TypedDict
 
-from faceswap_colab.types import Mask, VisionFrame
+from faceswap_colab.types import Face, Mask, VisionFrame
 
 FaceEditorInputs = TypedDict('FaceEditorInputs',
 {
 	'reference_vision_frame' : VisionFrame,
+	'reference_face' : Optional[Face],
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
 	'temp_vision_mask' : Mask
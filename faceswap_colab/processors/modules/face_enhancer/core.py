@@ -9,17 +9,18 @@ from faceswap_colab import config, content_analyser, face_classifier, face_detec
 from faceswap_colab.common_helper import create_float_metavar, create_int_metavar
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from faceswap_colab.face_analyser import scale_face
-from faceswap_colab.face_helper import paste_back, warp_face_by_face_landmark_5
+from faceswap_colab.face_helper import blend_paste_back, warp_face_by_face_landmark_5
 from faceswap_colab.face_masker import create_box_mask, create_occlusion_mask
 from faceswap_colab.face_selector import select_faces
 from faceswap_colab.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from faceswap_colab.processors.modules.face_enhancer import choices as face_enhancer_choices
 from faceswap_colab.processors.modules.face_enhancer.types import FaceEnhancerInputs, FaceEnhancerWeight
 from faceswap_colab.processors.types import ProcessorOutputs
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.program_helper import find_argument_group
 from faceswap_colab.thread_helper import thread_semaphore
-from faceswap_colab.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
-from faceswap_colab.vision import blend_frame, read_static_image, read_static_video_frame
+from faceswap_colab.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, Mask, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from faceswap_colab.vision import read_static_image, read_static_video_frame
 
 
 @lru_cache()
@@ -358,8 +359,8 @@ def enhance_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionF
 	crop_vision_frame = forward(crop_vision_frame, face_enhancer_weight)
 	crop_vision_frame = normalize_crop_frame(crop_vision_frame)
 	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	temp_vision_frame = blend_paste_frame(temp_vision_frame, paste_vision_frame)
+	crop_mask = blend_crop_mask(crop_mask)
+	blend_paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
 	return temp_vision_frame
 
 
@@ -373,7 +374,7 @@ def forward(crop_vision_frame : VisionFrame, face_enhancer_weight : FaceEnhancer
 		if face_enhancer_input.name == 'weight':
 			face_enhancer_inputs[face_enhancer_input.name] = face_enhancer_weight
 
-	with thread_semaphore():
+	with thread_semaphore(), profile_stage(inference_manager.get_inference_stage_name(face_enhancer)):
 		crop_vision_frame = face_enhancer.run(None, face_enhancer_inputs)[0][0]
 
 	return crop_vision_frame
@@ -405,10 +406,9 @@ def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	return crop_vision_frame
 
 
-def blend_paste_frame(temp_vision_frame : VisionFrame, paste_vision_frame : VisionFrame) -> VisionFrame:
-	face_enhancer_blend = 1 - (state_manager.get_item('face_enhancer_blend') / 100)
-	temp_vision_frame = blend_frame(temp_vision_frame, paste_vision_frame, 1 - face_enhancer_blend)
-	return temp_vision_frame
+def blend_crop_mask(crop_mask : Mask) -> Mask:
+	face_enhancer_blend = state_manager.get_item('face_enhancer_blend') / 100
+	return crop_mask * face_enhancer_blend
 
 
 def process_frame(inputs : FaceEnhancerInputs) -> ProcessorOutputs:
@@ -416,9 +416,11 @@ def process_frame(inputs : FaceEnhancerInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, inputs.get('reference_face'), inputs.get('target_vision_key'))
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
 			temp_vision_frame = enhance_face(target_face, temp_vision_frame)
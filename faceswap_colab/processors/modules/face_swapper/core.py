@@ -1,9 +1,10 @@
 from argparse import ArgumentParser
 from functools import lru_cache
-from typing import List, Optional, Tuple
+from typing import Any, List, Tuple
 
 import cv2
 import numpy
+from numpy.typing import NDArray
 
 import faceswap_colab.choices
 import faceswap_colab.jobs.job_manager
@@ -12,21 +13,29 @@ from faceswap_colab import config, content_analyser, face_classifier, face_detec
 from faceswap_colab.common_helper import get_first, is_macos
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from faceswap_colab.execution import has_execution_provider
-from faceswap_colab.face_analyser import get_average_face, get_many_faces, get_one_face, scale_face
-from faceswap_colab.face_helper import paste_back, warp_face_by_face_landmark_5
+from faceswap_colab.face_analyser import get_many_faces, get_one_face, scale_face
+from faceswap_colab.face_helper import blend_paste_back, warp_face_by_face_landmark_5
 from faceswap_colab.face_masker import create_area_mask, create_box_mask, create_occlusion_mask, create_region_mask
-from faceswap_colab.face_selector import select_faces, sort_faces_by_order
+from faceswap_colab.face_selector import extract_source_face, select_faces
 from faceswap_colab.filesystem import filter_image_paths, has_image, in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from faceswap_colab.model_helper import get_static_model_initializer
 from faceswap_colab.processors.modules.face_swapper import choices as face_swapper_choices
-from faceswap_colab.processors.modules.face_swapper.types import FaceSwapperInputs
+from faceswap_colab.processors.modules.face_swapper.types import FaceSwapperInputs, SourceEmbeddingStore
 from faceswap_colab.processors.pixel_boost import explode_pixel_boost, implode_pixel_boost
 from faceswap_colab.processors.types import ProcessorOutputs
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.program_helper import find_argument_group
-from faceswap_colab.thread_helper import conditional_thread_semaphore
+from faceswap_colab.thread_helper import conditional_thread_semaphore, thread_lock
 from faceswap_colab.types import ApplyStateItem, Args, DownloadScope, Embedding, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from faceswap_colab.vision import read_static_image, read_static_images, read_static_video_frame, unpack_resolution
 
+SOURCE_EMBEDDING_STORE : SourceEmbeddingStore =\
+{
+	'source_embeddings': {},
+	'hit_count': 0,
+	'miss_count': 0
+}
+
 
 @lru_cache()
 def create_static_model_set(download_scope : DownloadScope) -> ModelSet:
@@ -495,6 +504,7 @@ def get_inference_pool() -> InferencePool:
 def clear_inference_pool() -> None:
 	model_names = [ get_model_name() ]
 	inference_manager.clear_inference_pool(__name__, model_names)
+	clear_source_embeddings()
 
 
 def get_model_options() -> ModelOptions:
@@ -563,6 +573,8 @@ def pre_process(mode : ProcessMode) -> bool:
 
 
 def post_process() -> None:
+	logger.debug(translator.get('source_embedding_statistics', __package__).format(hit_count = SOURCE_EMBEDDING_STORE.get('hit_count'), miss_count = SOURCE_EMBEDDING_STORE.get('miss_count')), __name__)
+	clear_source_embeddings()
 	read_static_image.cache_clear()
 	read_static_video_frame.cache_clear()
 	video_manager.clear_video_pool()
@@ -578,74 +590,97 @@ def post_process() -> None:
 		face_recognizer.clear_inference_pool()
 
 
-def swap_face(source_face : Face, target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
+def swap_faces(source_face : Face, target_faces : List[Face], temp_vision_frame : VisionFrame) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
 	pixel_boost_size = unpack_resolution(state_manager.get_item('face_swapper_pixel_boost'))
 	pixel_boost_total = pixel_boost_size[0] // model_size[0]
-	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
-	temp_vision_frames = []
-	crop_masks = []
+	affine_matrices = []
+	crop_masks_set = []
+	source_inputs = []
+	pixel_boost_vision_frames = []
+
+	for target_face in target_faces:
+		crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), model_template, pixel_boost_size)
+		source_input = prepare_source_input(source_face, target_face)
+		crop_masks = []
+
+		if 'box' in state_manager.get_item('face_mask_types'):
+			box_mask = create_box_mask(crop_vision_frame, state_manager.get_item('face_mask_blur'), state_manager.get_item('face_mask_padding'))
+			crop_masks.append(box_mask)
+
+		if 'occlusion' in state_manager.get_item('face_mask_types'):
+			occlusion_mask = create_occlusion_mask(crop_vision_frame)
+			crop_masks.append(occlusion_mask)
+
+		for pixel_boost_vision_frame in implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size):
+			pixel_boost_vision_frames.append(prepare_crop_frame(pixel_boost_vision_frame))
+			source_inputs.append(source_input)
+
+		affine_matrices.append(affine_matrix)
+		crop_masks_set.append(crop_masks)
 
-	if 'box' in state_manager.get_item('face_mask_types'):
-		box_mask = create_box_mask(crop_vision_frame, state_manager.get_item('face_mask_blur'), state_manager.get_item('face_mask_padding'))
-		crop_masks.append(box_mask)
+	pixel_boost_vision_frames = forward_swap_face(numpy.concatenate(source_inputs), numpy.concatenate(pixel_boost_vision_frames))
+	temp_vision_frame = temp_vision_frame.copy()
 
-	if 'occlusion' in state_manager.get_item('face_mask_types'):
-		occlusion_mask = create_occlusion_mask(crop_vision_frame)
-		crop_masks.append(occlusion_mask)
+	for index, (target_face, affine_matrix, crop_masks) in enumerate(zip(target_faces, affine_matrices, crop_masks_set)):
+		temp_vision_frames = [ normalize_crop_frame(pixel_boost_vision_frame) for pixel_boost_vision_frame in pixel_boost_vision_frames[index * pixel_boost_total ** 2:(index + 1) * pixel_boost_total ** 2] ]
+		crop_vision_frame = explode_pixel_boost(temp_vision_frames, pixel_boost_total, model_size, pixel_boost_size)
 
-	pixel_boost_vision_frames = implode_pixel_boost(crop_vision_frame, pixel_boost_total, model_size)
-	for pixel_boost_vision_frame in pixel_boost_vision_frames:
-		pixel_boost_vision_frame = prepare_crop_frame(pixel_boost_vision_frame)
-		pixel_boost_vision_frame = forward_swap_face(source_face, target_face, pixel_boost_vision_frame)
-		pixel_boost_vision_frame = normalize_crop_frame(pixel_boost_vision_frame)
-		temp_vision_frames.append(pixel_boost_vision_frame)
-	crop_vision_frame = explode_pixel_boost(temp_vision_frames, pixel_boost_total, model_size, pixel_boost_size)
+		if 'area' in state_manager.get_item('face_mask_types'):
+			face_landmark_68 = cv2.transform(target_face.landmark_set.get('68').reshape(1, -1, 2), affine_matrix).reshape(-1, 2)
+			area_mask = create_area_mask(crop_vision_frame, face_landmark_68, state_manager.get_item('face_mask_areas'))
+			crop_masks.append(area_mask)
 
-	if 'area' in state_manager.get_item('face_mask_types'):
-		face_landmark_68 = cv2.transform(target_face.landmark_set.get('68').reshape(1, -1, 2), affine_matrix).reshape(-1, 2)
-		area_mask = create_area_mask(crop_vision_frame, face_landmark_68, state_manager.get_item('face_mask_areas'))
-		crop_masks.append(area_mask)
+		if 'region' in state_manager.get_item('face_mask_types'):
+			region_mask = create_region_mask(crop_vision_frame, state_manager.get_item('face_mask_regions'))
+			crop_masks.append(region_mask)
 
-	if 'region' in state_manager.get_item('face_mask_types'):
-		region_mask = create_region_mask(crop_vision_frame, state_manager.get_item('face_mask_regions'))
-		crop_masks.append(region_mask)
+		crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
+		blend_paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
 
-	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	return paste_vision_frame
+	return temp_vision_frame
 
 
-def forward_swap_face(source_face : Face, target_face : Face, crop_vision_frame : VisionFrame) -> VisionFrame:
+def forward_swap_face(source_inputs : NDArray[Any], crop_vision_frames : VisionFrame) -> VisionFrame:
 	face_swapper = get_inference_pool().get('face_swapper')
 	model_type = get_model_options().get('type')
-	face_swapper_inputs = {}
+	batch_size = inference_manager.detect_batch_size(face_swapper) or len(crop_vision_frames)
+	output_vision_frames = []
 
 	if is_macos() and has_execution_provider('coreml') and model_type in [ 'ghost', 'uniface' ]:
 		face_swapper.set_providers([ faceswap_colab.choices.execution_provider_set.get('cpu') ])
 
-	for face_swapper_input in face_swapper.get_inputs():
-		if face_swapper_input.name == 'source':
-			if model_type in [ 'blendswap', 'uniface' ]:
-				face_swapper_inputs[face_swapper_input.name] = prepare_source_frame(source_face)
-			else:
-				source_embedding = prepare_source_embedding(source_face)
-				source_embedding = balance_source_embedding(source_embedding, target_face.embedding)
-				face_swapper_inputs[face_swapper_input.name] = source_embedding
-		if face_swapper_input.name == 'target':
-			face_swapper_inputs[face_swapper_input.name] = crop_vision_frame
+	for batch_start in range(0, len(crop_vision_frames), batch_size):
+		batch_end = batch_start + batch_size
+		face_swapper_inputs = {}
 
-	with conditional_thread_semaphore():
-		crop_vision_frame = face_swapper.run(None, face_swapper_inputs)[0][0]
+		for face_swapper_input in face_swapper.get_inputs():
+			if face_swapper_input.name == 'source':
+				face_swapper_inputs[face_swapper_input.name] = source_inputs[batch_start:batch_end]
+			if face_swapper_input.name == 'target':
+				face_swapper_inputs[face_swapper_input.name] = crop_vision_frames[batch_start:batch_end]
 
-	return crop_vision_frame
+		output_vision_frames.extend(inference_manager.run_inference(face_swapper, face_swapper_inputs, conditional_thread_semaphore())[0])
+
+	return numpy.stack(output_vision_frames)
+
+
+def prepare_source_input(source_face : Face, target_face : Face) -> NDArray[Any]:
+	model_type = get_model_options().get('type')
+
+	if model_type in [ 'blendswap', 'uniface' ]:
+		return prepare_source_frame(source_face)
+
+	source_embedding = prepare_source_embedding(source_face)
+	source_embedding = balance_source_embedding(source_embedding, target_face.embedding)
+	return source_embedding.astype(numpy.float32)
 
 
 def forward_convert_embedding(face_embedding : Embedding) -> Embedding:
 	embedding_converter = get_inference_pool().get('embedding_converter')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(), profile_stage(inference_manager.get_inference_stage_name(embedding_converter)):
 		face_embedding = embedding_converter.run(None,
 		{
 			'input': face_embedding
@@ -671,6 +706,23 @@ def prepare_source_frame(source_face : Face) -> VisionFrame:
 
 
 def prepare_source_embedding(source_face : Face) -> Embedding:
+	source_embedding_key = (get_model_name(), hash(source_face.embedding.tobytes()))
+	source_embedding = SOURCE_EMBEDDING_STORE.get('source_embeddings').get(source_embedding_key)
+
+	if source_embedding is None:
+		with profile_stage('source_embedding.miss'):
+			source_embedding = create_source_embedding(source_face)
+
+		with thread_lock():
+			SOURCE_EMBEDDING_STORE['source_embeddings'][source_embedding_key] = source_embedding
+			SOURCE_EMBEDDING_STORE['miss_count'] += 1
+	else:
+		with profile_stage('source_embedding.hit'), thread_lock():
+			SOURCE_EMBEDDING_STORE['hit_count'] += 1
+	return source_embedding
+
+
+def create_source_embedding(source_face : Face) -> Embedding:
 	model_type = get_model_options().get('type')
 
 	if model_type == 'ghost':
@@ -717,6 +769,13 @@ def convert_source_embedding(source_embedding : Embedding) -> Tuple[Embedding, E
 	return source_embedding, source_embedding_norm
 
 
+def clear_source_embeddings() -> None:
+	with thread_lock():
+		SOURCE_EMBEDDING_STORE['source_embeddings'].clear()
+		SOURCE_EMBEDDING_STORE['hit_count'] = 0
+		SOURCE_EMBEDDING_STORE['miss_count'] = 0
+
+
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	model_mean = get_model_options().get('mean')
 	model_standard_deviation = get_model_options().get('standard_deviation')
@@ -743,32 +802,17 @@ def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 	return crop_vision_frame
 
 
-def extract_source_face(source_vision_frames : List[VisionFrame]) -> Optional[Face]:
-	source_faces = []
-
-	if source_vision_frames:
-		for source_vision_frame in source_vision_frames:
-			temp_faces = get_many_faces([source_vision_frame])
-			temp_faces = sort_faces_by_order(temp_faces, 'large-small')
-
-			if temp_faces:
-				source_faces.append(get_first(temp_faces))
-
-	return get_average_face(source_faces)
-
-
 def process_frame(inputs : FaceSwapperInputs) -> ProcessorOutputs:
 	reference_vision_frame = inputs.get('reference_vision_frame')
 	source_vision_frames = inputs.get('source_vision_frames')
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	source_face = extract_source_face(source_vision_frames)
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	source_face = inputs.get('source_face') or extract_source_face(source_vision_frames)
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, inputs.get('reference_face'), inputs.get('target_vision_key'))
 
 	if source_face and target_faces:
-		for target_face in target_faces:
-			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
-			temp_vision_frame = swap_face(source_face, target_face, temp_vision_frame)
+		target_faces = [ scale_face(target_face, target_vision_frame, temp_vision_frame) for target_face in target_faces ]
+		temp_vision_frame = swap_faces(source_face, target_faces, temp_vision_frame)
 
 	return temp_vision_frame, temp_vision_mask
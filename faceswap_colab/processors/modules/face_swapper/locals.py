@@ -4,6 +4,7 @@ LOCALS : Locals =\
 {
 	'en':
 	{
+		'source_embedding_statistics': 'source embedding cache had {hit_count} hits and {miss_count} misses in the main process',
 		'help':
 		{
 			'model': 'choose the model responsible for swapping the face',
@@ -1,10 +1,12 @@
-from typing import Dict, List, Literal, TypeAlias, TypedDict
+from typing import Dict, List, Literal, Optional, Tuple, TypeAlias, TypedDict
 
-from faceswap_colab.types import Mask, VisionFrame
+from faceswap_colab.types import Embedding, Face, Mask, VisionFrame
 
 FaceSwapperInputs = TypedDict('FaceSwapperInputs',
 {
 	'reference_vision_frame' : VisionFrame,
+	'reference_face' : Optional[Face],
+	'source_face' : Optional[Face],
 	'source_vision_frames' : List[VisionFrame],
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
@@ -16,3 +18,11 @@ FaceSwapperModel = Literal['blendswap_256', 'ghost_1_256', 'ghost_2_256', 'ghost
 FaceSwapperWeight : TypeAlias = float
 
 FaceSwapperSet : TypeAlias = Dict[FaceSwapperModel, List[str]]
+
+SourceEmbeddingKey : TypeAlias = Tuple[str, int]
+SourceEmbeddingStore = TypedDict('SourceEmbeddingStore',
+{
+	'source_embeddings' : Dict[SourceEmbeddingKey, Embedding],
+	'hit_count' : int,
+	'miss_count' : int
+})
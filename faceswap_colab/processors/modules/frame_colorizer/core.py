@@ -15,6 +15,7 @@ from faceswap_colab.filesystem import in_directory, is_image, is_video, resolve_
 from faceswap_colab.processors.modules.frame_colorizer import choices as frame_colorizer_choices
 from faceswap_colab.processors.modules.frame_colorizer.types import FrameColorizerInputs
 from faceswap_colab.processors.types import ProcessorOutputs
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.program_helper import find_argument_group
 from faceswap_colab.thread_helper import thread_semaphore
 from faceswap_colab.types import ApplyStateItem, Args, DownloadScope, ExecutionProvider, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
@@ -237,7 +238,7 @@ def colorize_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 def forward(color_vision_frame : VisionFrame) -> VisionFrame:
 	frame_colorizer = get_inference_pool().get('frame_colorizer')
 
-	with thread_semaphore():
+	with thread_semaphore(), profile_stage(inference_manager.get_inference_stage_name(frame_colorizer)):
 		color_vision_frame = frame_colorizer.run(None,
 		{
 			'input': color_vision_frame
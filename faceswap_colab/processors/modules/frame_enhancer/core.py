@@ -1,5 +1,7 @@
+import threading
 from argparse import ArgumentParser
 from functools import lru_cache
+from typing import Dict, Optional
 
 import cv2
 import numpy
@@ -12,13 +14,17 @@ from faceswap_colab.download import conditional_download_hashes, conditional_dow
 from faceswap_colab.execution import has_execution_provider
 from faceswap_colab.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from faceswap_colab.processors.modules.frame_enhancer import choices as frame_enhancer_choices
-from faceswap_colab.processors.modules.frame_enhancer.types import FrameEnhancerInputs
+from faceswap_colab.processors.modules.frame_enhancer.types import FrameEnhancerInputs, FrameEnhancerTile, FrameEnhancerTileKey
 from faceswap_colab.processors.types import ProcessorOutputs
 from faceswap_colab.program_helper import find_argument_group
 from faceswap_colab.thread_helper import conditional_thread_semaphore
 from faceswap_colab.types import ApplyStateItem, Args, DownloadScope, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
 from faceswap_colab.vision import blend_frame, create_tile_frames, merge_tile_frames, read_static_image, read_static_video_frame
 
+FRAME_ENHANCER_TILE_SET : Dict[FrameEnhancerTileKey, FrameEnhancerTile] = {}
+FRAME_ENHANCER_TILE_LOCK : threading.Lock = threading.Lock()
+FRAME_ENHANCER_TILE_TOLERANCE : int = 2
+
 
 @lru_cache()
 def create_static_model_set(download_scope : DownloadScope) -> ModelSet:
@@ -575,12 +581,16 @@ def register_args(program : ArgumentParser) -> None:
 	if group_processors:
 		group_processors.add_argument('--frame-enhancer-model', help = translator.get('help.model', __package__), default = config.get_str_value('processors', 'frame_enhancer_model', 'span_kendata_x4'), choices = frame_enhancer_choices.frame_enhancer_models)
 		group_processors.add_argument('--frame-enhancer-blend', help = translator.get('help.blend', __package__), type = int, default = config.get_int_value('processors', 'frame_enhancer_blend', '80'), choices = frame_enhancer_choices.frame_enhancer_blend_range, metavar = create_int_metavar(frame_enhancer_choices.frame_enhancer_blend_range))
-		faceswap_colab.jobs.job_store.register_step_keys([ 'frame_enhancer_model', 'frame_enhancer_blend' ])
+		group_processors.add_argument('--frame-enhancer-batch-size', help = translator.get('help.batch_size', __package__), type = int, default = config.get_int_value('processors', 'frame_enhancer_batch_size', '4'), choices = frame_enhancer_choices.frame_enhancer_batch_size_range, metavar = create_int_metavar(frame_enhancer_choices.frame_enhancer_batch_size_range))
+		group_processors.add_argument('--frame-enhancer-tile-cache', help = translator.get('help.tile_cache', __package__), action = 'store_true', default = config.get_bool_value('processors', 'frame_enhancer_tile_cache'))
+		faceswap_colab.jobs.job_store.register_step_keys([ 'frame_enhancer_model', 'frame_enhancer_blend', 'frame_enhancer_batch_size', 'frame_enhancer_tile_cache' ])
 
 
 def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('frame_enhancer_model', args.get('frame_enhancer_model'))
 	apply_state_item('frame_enhancer_blend', args.get('frame_enhancer_blend'))
+	apply_state_item('frame_enhancer_batch_size', args.get('frame_enhancer_batch_size'))
+	apply_state_item('frame_enhancer_tile_cache', args.get('frame_enhancer_tile_cache'))
 
 
 def pre_check() -> bool:
@@ -607,6 +617,7 @@ def post_process() -> None:
 	read_static_image.cache_clear()
 	read_static_video_frame.cache_clear()
 	video_manager.clear_video_pool()
+	clear_tile_cache()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
 	if state_manager.get_item('video_memory_strategy') == 'strict':
@@ -618,40 +629,93 @@ def enhance_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	model_scale = get_model_options().get('scale')
 	temp_height, temp_width = temp_vision_frame.shape[:2]
 	tile_vision_frames, pad_width, pad_height = create_tile_frames(temp_vision_frame, model_size)
+	tile_keys = [ (get_frame_enhancer_model(), temp_vision_frame.shape, tile_index) for tile_index in range(len(tile_vision_frames)) ]
+	enhance_tile_frames = numpy.empty((len(tile_vision_frames), model_size[0] * model_scale, model_size[0] * model_scale, 3), dtype = numpy.uint8)
+	tile_indices = list(range(len(tile_vision_frames)))
+
+	if state_manager.get_item('frame_enhancer_tile_cache'):
+		tile_indices = []
+
+		for tile_index, tile_key in enumerate(tile_keys):
+			cached_tile_frame = get_cached_tile_frame(tile_key, tile_vision_frames[tile_index])
 
-	for index, tile_vision_frame in enumerate(tile_vision_frames):
-		tile_vision_frame = prepare_tile_frame(tile_vision_frame)
-		tile_vision_frame = forward(tile_vision_frame)
-		tile_vision_frames[index] = normalize_tile_frame(tile_vision_frame)
+			if cached_tile_frame is None:
+				tile_indices.append(tile_index)
+			else:
+				enhance_tile_frames[tile_index] = cached_tile_frame
 
-	merge_vision_frame = merge_tile_frames(tile_vision_frames, temp_width * model_scale, temp_height * model_scale, pad_width * model_scale, pad_height * model_scale, (model_size[0] * model_scale, model_size[1] * model_scale, model_size[2] * model_scale))
+	if tile_indices:
+		enhance_tile_frames[tile_indices] = normalize_tile_frames(forward_batch(prepare_tile_frames(tile_vision_frames[tile_indices])))
+
+		if state_manager.get_item('frame_enhancer_tile_cache'):
+			for tile_index in tile_indices:
+				set_cached_tile_frame(tile_keys[tile_index], tile_vision_frames[tile_index], enhance_tile_frames[tile_index].copy())
+
+	merge_vision_frame = merge_tile_frames(enhance_tile_frames, temp_width * model_scale, temp_height * model_scale, pad_width * model_scale, pad_height * model_scale, (model_size[0] * model_scale, model_size[1] * model_scale, model_size[2] * model_scale))
 	temp_vision_frame = blend_merge_frame(temp_vision_frame, merge_vision_frame)
 	return temp_vision_frame
 
 
-def forward(tile_vision_frame : VisionFrame) -> VisionFrame:
+def forward_batch(tile_vision_frames : VisionFrame) -> VisionFrame:
 	frame_enhancer = get_inference_pool().get('frame_enhancer')
+	batch_size = inference_manager.detect_batch_size(frame_enhancer) or state_manager.get_item('frame_enhancer_batch_size')
+	output_vision_frames = []
 
-	with conditional_thread_semaphore():
-		tile_vision_frame = frame_enhancer.run(None,
-		{
-			'input': tile_vision_frame
-		})[0]
+	for batch_start in range(0, len(tile_vision_frames), batch_size):
+		batch_end = batch_start + batch_size
+		output_vision_frames.append(forward(tile_vision_frames[batch_start:batch_end]))
+
+	return numpy.concatenate(output_vision_frames)
+
+
+def forward(tile_vision_frames : VisionFrame) -> VisionFrame:
+	frame_enhancer = get_inference_pool().get('frame_enhancer')
+
+	tile_vision_frames = inference_manager.run_inference(frame_enhancer,
+	{
+		'input': tile_vision_frames
+	}, conditional_thread_semaphore())[0]
 
-	return tile_vision_frame
+	return tile_vision_frames
+
+
+def prepare_tile_frames(tile_vision_frames : VisionFrame) -> VisionFrame:
+	tile_vision_frames = tile_vision_frames[:, :, :, ::-1].transpose(0, 3, 1, 2)
+	tile_vision_frames = numpy.ascontiguousarray(tile_vision_frames, dtype = numpy.float32) / 255.0
+	return tile_vision_frames
+
+
+def normalize_tile_frames(tile_vision_frames : VisionFrame) -> VisionFrame:
+	tile_vision_frames = tile_vision_frames.transpose(0, 2, 3, 1) * 255
+	tile_vision_frames = tile_vision_frames.clip(0, 255).astype(numpy.uint8)[:, :, :, ::-1]
+	return tile_vision_frames
+
+
+def get_cached_tile_frame(tile_key : FrameEnhancerTileKey, tile_vision_frame : VisionFrame) -> Optional[VisionFrame]:
+	with FRAME_ENHANCER_TILE_LOCK:
+		frame_enhancer_tile = FRAME_ENHANCER_TILE_SET.get(tile_key)
+
+	if frame_enhancer_tile and is_static_tile_frame(frame_enhancer_tile.get('tile_vision_frame'), tile_vision_frame):
+		return frame_enhancer_tile.get('enhance_vision_frame')
+	return None
+
+
+def set_cached_tile_frame(tile_key : FrameEnhancerTileKey, tile_vision_frame : VisionFrame, enhance_vision_frame : VisionFrame) -> None:
+	with FRAME_ENHANCER_TILE_LOCK:
+		FRAME_ENHANCER_TILE_SET[tile_key] =\
+		{
+			'tile_vision_frame': tile_vision_frame.copy(),
+			'enhance_vision_frame': enhance_vision_frame
+		}
 
 
-def prepare_tile_frame(tile_vision_frame : VisionFrame) -> VisionFrame:
-	tile_vision_frame = numpy.expand_dims(tile_vision_frame[:, :, ::-1], axis = 0)
-	tile_vision_frame = tile_vision_frame.transpose(0, 3, 1, 2)
-	tile_vision_frame = tile_vision_frame.astype(numpy.float32) / 255.0
-	return tile_vision_frame
+def is_static_tile_frame(previous_vision_frame : VisionFrame, tile_vision_frame : VisionFrame) -> bool:
+	return bool(cv2.norm(previous_vision_frame, tile_vision_frame, cv2.NORM_INF) <= FRAME_ENHANCER_TILE_TOLERANCE)
 
 
-def normalize_tile_frame(tile_vision_frame : VisionFrame) -> VisionFrame:
-	tile_vision_frame = tile_vision_frame.transpose(0, 2, 3, 1).squeeze(0) * 255
-	tile_vision_frame = tile_vision_frame.clip(0, 255).astype(numpy.uint8)[:, :, ::-1]
-	return tile_vision_frame
+def clear_tile_cache() -> None:
+	with FRAME_ENHANCER_TILE_LOCK:
+		FRAME_ENHANCER_TILE_SET.clear()
 
 
 def blend_merge_frame(temp_vision_frame : VisionFrame, merge_vision_frame : VisionFrame) -> VisionFrame:
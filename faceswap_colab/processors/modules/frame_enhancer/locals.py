@@ -7,7 +7,9 @@ LOCALS : Locals =\
 		'help':
 		{
 			'model': 'choose the model responsible for enhancing the frame',
-			'blend': 'blend the enhanced into the previous frame'
+			'blend': 'blend the enhanced into the previous frame',
+			'batch_size': 'specify the amount of tiles enhanced per inference run',
+			'tile_cache': 'reuse the enhanced tiles whose content is unchanged since the previous frame'
 		},
 		'uis':
 		{
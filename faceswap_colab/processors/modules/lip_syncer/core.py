@@ -11,13 +11,14 @@ from faceswap_colab.audio import read_static_voice
 from faceswap_colab.common_helper import create_float_metavar
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from faceswap_colab.face_analyser import scale_face
-from faceswap_colab.face_helper import create_bounding_box, paste_back, warp_face_by_bounding_box, warp_face_by_face_landmark_5
+from faceswap_colab.face_helper import blend_paste_back, create_bounding_box, warp_face_by_bounding_box, warp_face_by_face_landmark_5
 from faceswap_colab.face_masker import create_area_mask, create_box_mask, create_occlusion_mask
 from faceswap_colab.face_selector import select_faces
 from faceswap_colab.filesystem import has_audio, resolve_relative_path
 from faceswap_colab.processors.modules.lip_syncer import choices as lip_syncer_choices
 from faceswap_colab.processors.modules.lip_syncer.types import LipSyncerInputs, LipSyncerWeight
 from faceswap_colab.processors.types import ProcessorOutputs
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.program_helper import find_argument_group
 from faceswap_colab.thread_helper import conditional_thread_semaphore
 from faceswap_colab.types import ApplyStateItem, Args, AudioFrame, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
@@ -204,14 +205,14 @@ def sync_lip(target_face : Face, source_voice_frame : AudioFrame, temp_vision_fr
 		crop_vision_frame = cv2.warpAffine(area_vision_frame, cv2.invertAffineTransform(area_matrix), (512, 512), borderMode = cv2.BORDER_REPLICATE)
 
 	crop_mask = numpy.minimum.reduce(crop_masks)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	return paste_vision_frame
+	blend_paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
+	return temp_vision_frame
 
 
 def forward_edtalk(temp_audio_frame : AudioFrame, crop_vision_frame : VisionFrame, lip_syncer_weight : LipSyncerWeight) -> VisionFrame:
 	lip_syncer = get_inference_pool().get('lip_syncer')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(), profile_stage(inference_manager.get_inference_stage_name(lip_syncer)):
 		crop_vision_frame = lip_syncer.run(None,
 		{
 			'source': temp_audio_frame,
@@ -225,7 +226,7 @@ def forward_edtalk(temp_audio_frame : AudioFrame, crop_vision_frame : VisionFram
 def forward_wav2lip(temp_audio_frame : AudioFrame, area_vision_frame : VisionFrame) -> VisionFrame:
 	lip_syncer = get_inference_pool().get('lip_syncer')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(), profile_stage(inference_manager.get_inference_stage_name(lip_syncer)):
 		area_vision_frame = lip_syncer.run(None,
 		{
 			'source': temp_audio_frame,
@@ -286,9 +287,11 @@ def process_frame(inputs : LipSyncerInputs) -> ProcessorOutputs:
 	target_vision_frame = inputs.get('target_vision_frame')
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
+	target_faces = select_faces(reference_vision_frame, target_vision_frame, inputs.get('reference_face'), inputs.get('target_vision_key'))
 
 	if target_faces:
+		temp_vision_frame = temp_vision_frame.copy()
+
 		for target_face in target_faces:
 			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
 			temp_vision_frame = sync_lip(target_face, source_voice_frame, temp_vision_frame)
@@ -1,12 +1,13 @@
-from typing import Any, Literal, TypeAlias, TypedDict
+from typing import Any, Literal, Optional, TypeAlias, TypedDict
 
 from numpy.typing import NDArray
 
-from faceswap_colab.types import AudioFrame, Mask, VisionFrame
+from faceswap_colab.types import AudioFrame, Face, Mask, VisionFrame
 
 LipSyncerInputs = TypedDict('LipSyncerInputs',
 {
 	'reference_vision_frame' : VisionFrame,
+	'reference_face' : Optional[Face],
 	'source_voice_frame' : AudioFrame,
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
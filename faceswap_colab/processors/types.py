@@ -17,4 +17,5 @@ LivePortraitTranslation : TypeAlias = NDArray[Any]
 ProcessorStateKey = str
 ProcessorState : TypeAlias = Dict[ProcessorStateKey, Any]
 ProcessorStateSet : TypeAlias = Dict[AppContext, ProcessorState]
+ProcessorInputs : TypeAlias = Dict[str, Any]
 ProcessorOutputs : TypeAlias = Tuple[VisionFrame, Mask]
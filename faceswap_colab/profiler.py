@@ -0,0 +1,141 @@
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from faceswap_colab.json import write_json
+from faceswap_colab.types import Content, Profiler, ProfilerFormat, ProfilerSample, ProfilerSummary
+
+PROFILER : Profiler =\
+{
+	'is_enabled': False,
+	'start_time': 0.0,
+	'samples': []
+}
+PROFILER_LOCK : threading.Lock = threading.Lock()
+PROFILER_PERCENTILES : List[int] = [ 50, 90, 99 ]
+
+
+def enable_profiler() -> None:
+	PROFILER['is_enabled'] = True
+
+
+def disable_profiler() -> None:
+	PROFILER['is_enabled'] = False
+
+
+def is_profiler_enabled() -> bool:
+	return PROFILER.get('is_enabled')
+
+
+@contextmanager
+def profile_stage(stage_name : str) -> Iterator[None]:
+	if not is_profiler_enabled():
+		yield
+		return
+
+	start_time = perf_counter()
+
+	try:
+		yield
+	finally:
+		record_stage(stage_name, start_time, perf_counter() - start_time)
+
+
+def profile(stage_name : Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+	def decorator(function : Callable[..., Any]) -> Callable[..., Any]:
+		function_stage_name = stage_name or function.__module__.split('.')[-1] + '.' + function.__name__
+
+		@wraps(function)
+		def wrapper(*args : Any, **kwargs : Any) -> Any:
+			with profile_stage(function_stage_name):
+				return function(*args, **kwargs)
+
+		return wrapper
+
+	return decorator
+
+
+def record_stage(stage_name : str, start_time : float, duration : float) -> None:
+	profiler_sample : ProfilerSample =\
+	{
+		'stage_name': stage_name,
+		'start_time': start_time,
+		'duration': duration,
+		'thread_id': threading.get_ident()
+	}
+
+	with PROFILER_LOCK:
+		PROFILER.get('samples').append(profiler_sample)
+
+
+def summarize_profiler() -> List[ProfilerSummary]:
+	stage_durations : Dict[str, List[float]] = {}
+	profiler_summaries = []
+
+	with PROFILER_LOCK:
+		for profiler_sample in PROFILER.get('samples'):
+			stage_durations.setdefault(profiler_sample.get('stage_name'), []).append(profiler_sample.get('duration'))
+
+	for stage_name, durations in stage_durations.items():
+		durations.sort()
+		p50_time, p90_time, p99_time = [ calculate_percentile(durations, percentile) for percentile in PROFILER_PERCENTILES ]
+		profiler_summaries.append(
+		{
+			'stage_name': stage_name,
+			'call_count': len(durations),
+			'total_time': round(sum(durations) * 1000, 3),
+			'average_time': round(sum(durations) / len(durations) * 1000, 3),
+			'p50_time': round(p50_time * 1000, 3),
+			'p90_time': round(p90_time * 1000, 3),
+			'p99_time': round(p99_time * 1000, 3)
+		})
+
+	return sorted(profiler_summaries, key = lambda profiler_summary: profiler_summary.get('total_time'), reverse = True)
+
+
+def calculate_percentile(durations : List[float], percentile : int) -> float:
+	duration_index = min(len(durations) - 1, round(percentile / 100 * (len(durations) - 1)))
+	return durations[duration_index]
+
+
+def create_trace_events() -> List[Dict[str, Any]]:
+	trace_events = []
+
+	with PROFILER_LOCK:
+		for profiler_sample in PROFILER.get('samples'):
+			trace_events.append(
+			{
+				'name': profiler_sample.get('stage_name'),
+				'cat': profiler_sample.get('stage_name').split('.')[0],
+				'ph': 'X',
+				'ts': round((profiler_sample.get('start_time') - PROFILER.get('start_time')) * 1000000, 1),
+				'dur': round(profiler_sample.get('duration') * 1000000, 1),
+				'pid': os.getpid(),
+				'tid': profiler_sample.get('thread_id')
+			})
+
+	return trace_events
+
+
+def export_profiler(profiler_path : str, profiler_format : ProfilerFormat) -> bool:
+	if profiler_format == 'trace':
+		profiler_content : Content =\
+		{
+			'traceEvents': create_trace_events(),
+			'displayTimeUnit': 'ms'
+		}
+	else:
+		profiler_content =\
+		{
+			'stages': summarize_profiler()
+		}
+	return write_json(profiler_path, profiler_content)
+
+
+def clear_profiler() -> None:
+	with PROFILER_LOCK:
+		PROFILER.get('samples').clear()
+		PROFILER['start_time'] = perf_counter()
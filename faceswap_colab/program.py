@@ -104,7 +104,8 @@ def create_face_detector_program() -> ArgumentParser:
 	group_face_detector.add_argument('--face-detector-margin', help = translator.get('help.face_detector_margin'), type = partial(sanitize_int_range, int_range = faceswap_colab.choices.face_detector_margin_range), default = config.get_int_list('face_detector', 'face_detector_margin', '0 0 0 0'), nargs = '+')
 	group_face_detector.add_argument('--face-detector-angles', help = translator.get('help.face_detector_angles'), type = int, default = config.get_int_list('face_detector', 'face_detector_angles', '0'), choices = faceswap_colab.choices.face_detector_angles, nargs = '+', metavar = 'FACE_DETECTOR_ANGLES')
 	group_face_detector.add_argument('--face-detector-score', help = translator.get('help.face_detector_score'), type = float, default = config.get_float_value('face_detector', 'face_detector_score', '0.5'), choices = faceswap_colab.choices.face_detector_score_range, metavar = create_float_metavar(faceswap_colab.choices.face_detector_score_range))
-	job_store.register_step_keys([ 'face_detector_model', 'face_detector_size', 'face_detector_margin', 'face_detector_angles', 'face_detector_score' ])
+	group_face_detector.add_argument('--face-tracker-interval', help = translator.get('help.face_tracker_interval'), type = int, default = config.get_int_value('face_detector', 'face_tracker_interval', '1'), choices = faceswap_colab.choices.face_tracker_interval_range, metavar = create_int_metavar(faceswap_colab.choices.face_tracker_interval_range))
+	job_store.register_step_keys([ 'face_detector_model', 'face_detector_size', 'face_detector_margin', 'face_detector_angles', 'face_detector_score', 'face_tracker_interval' ])
 	return program
 
 
@@ -161,8 +162,9 @@ def create_frame_extraction_program() -> ArgumentParser:
 	group_frame_extraction.add_argument('--trim-frame-start', help = translator.get('help.trim_frame_start'), type = int, default = faceswap_colab.config.get_int_value('frame_extraction', 'trim_frame_start'))
 	group_frame_extraction.add_argument('--trim-frame-end', help = translator.get('help.trim_frame_end'), type = int, default = faceswap_colab.config.get_int_value('frame_extraction', 'trim_frame_end'))
 	group_frame_extraction.add_argument('--temp-frame-format', help = translator.get('help.temp_frame_format'), default = config.get_str_value('frame_extraction', 'temp_frame_format', 'png'), choices = faceswap_colab.choices.temp_frame_formats)
+	group_frame_extraction.add_argument('--frame-pipeline', help = translator.get('help.frame_pipeline'), default = config.get_str_value('frame_extraction', 'frame_pipeline', 'stream'), choices = faceswap_colab.choices.frame_pipelines)
 	group_frame_extraction.add_argument('--keep-temp', help = translator.get('help.keep_temp'), action = 'store_true', default = config.get_bool_value('frame_extraction', 'keep_temp'))
-	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'keep_temp' ])
+	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'frame_pipeline', 'keep_temp' ])
 	return program
 
 
@@ -227,6 +229,12 @@ def create_benchmark_program() -> ArgumentParser:
 	group_benchmark.add_argument('--benchmark-mode', help = translator.get('help.benchmark_mode'), default = config.get_str_value('benchmark', 'benchmark_mode', 'warm'), choices = faceswap_colab.choices.benchmark_modes)
 	group_benchmark.add_argument('--benchmark-resolutions', help = translator.get('help.benchmark_resolutions'), default = config.get_str_list('benchmark', 'benchmark_resolutions', get_first(faceswap_colab.choices.benchmark_resolutions)), choices = faceswap_colab.choices.benchmark_resolutions, nargs = '+')
 	group_benchmark.add_argument('--benchmark-cycle-count', help = translator.get('help.benchmark_cycle_count'), type = int, default = config.get_int_value('benchmark', 'benchmark_cycle_count', '5'), choices = faceswap_colab.choices.benchmark_cycle_count_range)
+	group_benchmark.add_argument('--benchmark-suite', help = translator.get('help.benchmark_suite'), action = 'store_true', default = config.get_bool_value('benchmark', 'benchmark_suite'))
+	group_benchmark.add_argument('--benchmark-models', help = translator.get('help.benchmark_models'), default = config.get_str_list('benchmark', 'benchmark_models'), nargs = '+')
+	group_benchmark.add_argument('--benchmark-thread-counts', help = translator.get('help.benchmark_thread_counts'), type = int, default = config.get_int_list('benchmark', 'benchmark_thread_counts', '1'), choices = faceswap_colab.choices.execution_thread_count_range, nargs = '+', metavar = create_int_metavar(faceswap_colab.choices.execution_thread_count_range))
+	group_benchmark.add_argument('--benchmark-face-counts', help = translator.get('help.benchmark_face_counts'), type = int, default = config.get_int_list('benchmark', 'benchmark_face_counts', '1'), choices = faceswap_colab.choices.benchmark_face_count_range, nargs = '+', metavar = create_int_metavar(faceswap_colab.choices.benchmark_face_count_range))
+	group_benchmark.add_argument('--benchmark-output-path', help = translator.get('help.benchmark_output_path'), default = config.get_str_value('benchmark', 'benchmark_output_path'))
+	group_benchmark.add_argument('--benchmark-compare-path', help = translator.get('help.benchmark_compare_path'), default = config.get_str_value('benchmark', 'benchmark_compare_path'))
 	return program
 
 
@@ -237,7 +245,9 @@ def create_execution_program() -> ArgumentParser:
 	group_execution.add_argument('--execution-device-ids', help = translator.get('help.execution_device_ids'), type = int, default = config.get_int_list('execution', 'execution_device_ids', '0'), nargs = '+', metavar = 'EXECUTION_DEVICE_IDS')
 	group_execution.add_argument('--execution-providers', help = translator.get('help.execution_providers').format(choices = ', '.join(available_execution_providers)), default = config.get_str_list('execution', 'execution_providers', get_first(available_execution_providers)), choices = available_execution_providers, nargs = '+', metavar = 'EXECUTION_PROVIDERS')
 	group_execution.add_argument('--execution-thread-count', help = translator.get('help.execution_thread_count'), type = int, default = config.get_int_value('execution', 'execution_thread_count', '8'), choices = faceswap_colab.choices.execution_thread_count_range, metavar = create_int_metavar(faceswap_colab.choices.execution_thread_count_range))
-	job_store.register_job_keys([ 'execution_device_ids', 'execution_providers', 'execution_thread_count' ])
+	group_execution.add_argument('--execution-mode', help = translator.get('help.execution_mode'), default = config.get_str_value('execution', 'execution_mode', 'thread'), choices = faceswap_colab.choices.execution_modes)
+	group_execution.add_argument('--execution-batch-size', help = translator.get('help.execution_batch_size'), type = int, default = config.get_int_value('execution', 'execution_batch_size', '1'), choices = faceswap_colab.choices.execution_batch_size_range, metavar = create_int_metavar(faceswap_colab.choices.execution_batch_size_range))
+	job_store.register_job_keys([ 'execution_device_ids', 'execution_providers', 'execution_thread_count', 'execution_mode', 'execution_batch_size' ])
 	return program
 
 
@@ -266,6 +276,15 @@ def create_halt_on_error_program() -> ArgumentParser:
 	return program
 
 
+def create_profiler_program() -> ArgumentParser:
+	program = ArgumentParser(add_help = False)
+	group_misc = program.add_argument_group('misc')
+	group_misc.add_argument('--profiler-path', help = translator.get('help.profiler_path'), default = config.get_str_value('misc', 'profiler_path'))
+	group_misc.add_argument('--profiler-format', help = translator.get('help.profiler_format'), default = config.get_str_value('misc', 'profiler_format', 'json'), choices = faceswap_colab.choices.profiler_formats)
+	job_store.register_job_keys([ 'profiler_path', 'profiler_format' ])
+	return program
+
+
 def create_job_id_program() -> ArgumentParser:
 	program = ArgumentParser(add_help = False)
 	program.add_argument('job_id', help = translator.get('help.job_id'))
@@ -290,7 +309,7 @@ def collect_step_program() -> ArgumentParser:
 
 
 def collect_job_program() -> ArgumentParser:
-	return ArgumentParser(parents = [ create_execution_program(), create_download_providers_program(), create_memory_program(), create_log_level_program() ], add_help = False)
+	return ArgumentParser(parents = [ create_execution_program(), create_download_providers_program(), create_memory_program(), create_log_level_program(), create_profiler_program() ], add_help = False)
 
 
 def create_program() -> ArgumentParser:
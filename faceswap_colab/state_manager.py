@@ -1,14 +1,17 @@
-from typing import Any, Union
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Any, Optional, Union
 
 from faceswap_colab.app_context import detect_app_context
 from faceswap_colab.processors.types import ProcessorState, ProcessorStateKey, ProcessorStateSet
-from faceswap_colab.types import State, StateKey, StateSet
+from faceswap_colab.types import State, StateKey, StateSet, StateSnapshot
 
 STATE_SET : Union[StateSet, ProcessorStateSet] =\
 {
 	'cli': {}, #type:ignore[assignment]
 	'ui': {} #type:ignore[assignment]
 }
+STATE_SNAPSHOT : ContextVar[Optional[StateSnapshot]] = ContextVar('state_snapshot', default = None)
 
 
 def get_state() -> Union[State, ProcessorState]:
@@ -20,12 +23,28 @@ def sync_state() -> None:
 	STATE_SET['cli'] = STATE_SET.get('ui') #type:ignore[assignment]
 
 
+def create_state_snapshot() -> StateSnapshot:
+	return MappingProxyType(dict(get_state()))
+
+
+def get_state_snapshot() -> Optional[StateSnapshot]:
+	return STATE_SNAPSHOT.get()
+
+
+def set_state_snapshot(state_snapshot : Optional[StateSnapshot]) -> None:
+	STATE_SNAPSHOT.set(state_snapshot)
+
+
 def init_item(key : Union[StateKey, ProcessorStateKey], value : Any) -> None:
 	STATE_SET['cli'][key] = value #type:ignore[literal-required]
 	STATE_SET['ui'][key] = value #type:ignore[literal-required]
 
 
 def get_item(key : Union[StateKey, ProcessorStateKey]) -> Any:
+	state_snapshot = STATE_SNAPSHOT.get()
+
+	if state_snapshot is not None:
+		return state_snapshot.get(key)
 	return get_state().get(key) #type:ignore[literal-required]
 
 
@@ -1,47 +1,91 @@
 import os
 import subprocess
+import time
 from collections import deque
 from concurrent.futures import ThreadPoolExecutor
-from typing import Deque, Iterator
+from typing import Deque, Iterator, Optional, Tuple
 
 import cv2
 import numpy
 from tqdm import tqdm
 
 from faceswap_colab import ffmpeg_builder, logger, state_manager, translator
+from faceswap_colab.app_context import set_app_context
 from faceswap_colab.audio import create_empty_audio_frame
 from faceswap_colab.content_analyser import analyse_stream
 from faceswap_colab.ffmpeg import open_ffmpeg
 from faceswap_colab.filesystem import is_directory
 from faceswap_colab.processors.core import get_processors_modules
-from faceswap_colab.types import Fps, StreamMode, VisionFrame
+from faceswap_colab.types import Fps, StreamFrame, StreamMode, StreamStatistics, VisionFrame
 from faceswap_colab.vision import extract_vision_mask, read_static_images
 
+STREAM_STATISTICS : StreamStatistics =\
+{
+	'frame_total': 0,
+	'drop_total': 0,
+	'capture_latency': 0.0
+}
+STREAM_LATENCY_SMOOTHING : float = 0.1
 
-def multi_process_capture(camera_capture : cv2.VideoCapture, camera_fps : Fps) -> Iterator[VisionFrame]:
-	capture_deque : Deque[VisionFrame] = deque()
 
-	with tqdm(desc = translator.get('streaming'), unit = 'frame', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
-		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
-			futures = []
+def multi_process_capture(camera_capture : cv2.VideoCapture, camera_fps : Fps, stream_latency : int) -> Iterator[VisionFrame]:
+	stream_deque : Deque[StreamFrame] = deque()
+	pending_frame : Optional[Tuple[float, VisionFrame]] = None
+	stream_window = state_manager.get_item('execution_thread_count')
+	clear_stream_statistics()
 
+	with tqdm(desc = translator.get('streaming'), unit = 'frame', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), initializer = set_app_context, initargs = ('cli',)) as executor:
 			while camera_capture and camera_capture.isOpened():
 				_, capture_frame = camera_capture.read()
+				capture_time = time.perf_counter()
 				if analyse_stream(capture_frame, camera_fps):
 					camera_capture.release()
 
 				if numpy.any(capture_frame):
-					future = executor.submit(process_stream_frame, capture_frame)
-					futures.append(future)
+					if pending_frame:
+						count_stream_drop()
+					pending_frame = capture_time, capture_frame
+
+				if pending_frame and len(stream_deque) < stream_window:
+					pending_time, pending_vision_frame = pending_frame
+					stream_deque.append((pending_time, executor.submit(process_stream_frame, pending_vision_frame)))
+					pending_frame = None
+
+				while stream_deque and stream_deque[0][1].done():
+					stream_time, stream_future = stream_deque.popleft()
 
-				for future_done in [ future for future in futures if future.done() ]:
-					capture_frame = future_done.result()
-					capture_deque.append(capture_frame)
-					futures.remove(future_done)
+					if is_stream_expired(stream_time, stream_latency) and stream_deque and stream_deque[0][1].done():
+						count_stream_drop()
+						continue
 
-				while capture_deque:
+					count_stream_frame(stream_time)
 					progress.update()
-					yield capture_deque.popleft()
+					yield stream_future.result()
+
+
+def is_stream_expired(stream_time : float, stream_latency : int) -> bool:
+	return (time.perf_counter() - stream_time) * 1000 > stream_latency
+
+
+def count_stream_frame(stream_time : float) -> None:
+	capture_latency = (time.perf_counter() - stream_time) * 1000
+	STREAM_STATISTICS['frame_total'] += 1
+	STREAM_STATISTICS['capture_latency'] += (capture_latency - STREAM_STATISTICS.get('capture_latency')) * STREAM_LATENCY_SMOOTHING
+
+
+def count_stream_drop() -> None:
+	STREAM_STATISTICS['drop_total'] += 1
+
+
+def get_stream_statistics() -> StreamStatistics:
+	return STREAM_STATISTICS
+
+
+def clear_stream_statistics() -> None:
+	STREAM_STATISTICS['frame_total'] = 0
+	STREAM_STATISTICS['drop_total'] = 0
+	STREAM_STATISTICS['capture_latency'] = 0.0
 
 
 def process_stream_frame(target_vision_frame : VisionFrame) -> VisionFrame:
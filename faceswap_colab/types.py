@@ -1,10 +1,14 @@
-from collections import namedtuple
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypeAlias, TypedDict
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from multiprocessing.sharedctypes import Synchronized, SynchronizedArray
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Literal, Mapping, Optional, Set, Tuple, TypeAlias, TypedDict, Union
 
 import cv2
 import numpy
 from numpy.typing import NDArray
-from onnxruntime import InferenceSession
+from onnxruntime import InferenceSession, IOBinding, OrtValue
 
 Scale : TypeAlias = float
 Score : TypeAlias = float
@@ -16,6 +20,10 @@ Prediction : TypeAlias = NDArray[Any]
 BoundingBox : TypeAlias = NDArray[Any]
 FaceLandmark5 : TypeAlias = NDArray[Any]
 FaceLandmark68 : TypeAlias = NDArray[Any]
+BoundingBoxes : TypeAlias = NDArray[Any]
+Scores : TypeAlias = NDArray[Any]
+FaceLandmarks5 : TypeAlias = NDArray[Any]
+FaceDetection : TypeAlias = Tuple[BoundingBoxes, Scores, FaceLandmarks5]
 FaceLandmarkSet = TypedDict('FaceLandmarkSet',
 {
 	'5' : FaceLandmark5, #type:ignore[valid-type]
@@ -44,10 +52,21 @@ Face = namedtuple('Face',
 	'age',
 	'race'
 ])
+FaceAttribute = Literal['embedding', 'classification']
 FaceSet : TypeAlias = Dict[str, List[Face]]
+FaceTracker = TypedDict('FaceTracker',
+{
+	'vision_frame' : Optional[NDArray[Any]],
+	'faces' : List[Face],
+	'keyframe_number' : int
+})
 FaceStore = TypedDict('FaceStore',
 {
-	'static_faces' : FaceSet
+	'static_faces' : FaceSet,
+	'static_bytes' : int,
+	'hit_count' : int,
+	'miss_count' : int,
+	'evict_count' : int
 })
 
 Language = Literal['en']
@@ -62,6 +81,19 @@ VideoPoolSet = TypedDict('VideoPoolSet',
 	'capture': VideoCaptureSet,
 	'writer': VideoWriterSet
 })
+VideoIndex = TypedDict('VideoIndex',
+{
+	'video_capture' : cv2.VideoCapture,
+	'frame_total' : int,
+	'fps' : float,
+	'resolution' : Tuple[int, int],
+	'start_time' : Optional[float],
+	'keyframe_numbers' : List[int],
+	'keyframe_windows' : Set[int],
+	'frame_position' : int,
+	'vision_frames' : Dict[int, NDArray[Any]]
+})
+VideoIndexSet : TypeAlias = Dict[str, VideoIndex]
 CameraPoolSet = TypedDict('CameraPoolSet',
 {
 	'capture': CameraCaptureSet
@@ -134,6 +166,7 @@ AudioFormat = Literal['flac', 'm4a', 'mp3', 'ogg', 'opus', 'wav']
 ImageFormat = Literal['bmp', 'jpeg', 'png', 'tiff', 'webp']
 VideoFormat = Literal['avi', 'm4v', 'mkv', 'mov', 'mp4', 'mpeg', 'mxf', 'webm', 'wmv']
 TempFrameFormat = Literal['bmp', 'jpeg', 'png', 'tiff']
+FramePipeline = Literal['stream', 'disk']
 AudioTypeSet : TypeAlias = Dict[AudioFormat, str]
 ImageTypeSet : TypeAlias = Dict[ImageFormat, str]
 VideoTypeSet : TypeAlias = Dict[VideoFormat, str]
@@ -159,14 +192,109 @@ BenchmarkCycleSet = TypedDict('BenchmarkCycleSet',
 	'slowest_run' : float,
 	'relative_fps' : float
 })
+MicroBenchmarkSet = TypedDict('MicroBenchmarkSet',
+{
+	'method_name' : str,
+	'resolution' : str,
+	'cycle_count' : int,
+	'average_run' : float,
+	'peak_memory' : float
+})
+
+BenchmarkSuiteKey : TypeAlias = Tuple[str, str, str, int, int]
+BenchmarkSuiteSet = TypedDict('BenchmarkSuiteSet',
+{
+	'processor' : str,
+	'model' : str,
+	'resolution' : str,
+	'thread_count' : int,
+	'face_count' : int,
+	'cycle_count' : int,
+	'process_time' : float,
+	'io_time' : float,
+	'relative_fps' : float,
+	'peak_rss' : float,
+	'stages' : List['ProfilerSummary']
+})
+BenchmarkAnalysisSet = TypedDict('BenchmarkAnalysisSet',
+{
+	'configuration' : str,
+	'face_attributes' : str,
+	'resolution' : str,
+	'face_count' : int,
+	'cycle_count' : int,
+	'analysis_time' : float,
+	'relative_fps' : float,
+	'full_fps' : float
+})
+
+ProfilerFormat = Literal['json', 'trace']
+ProfilerSample = TypedDict('ProfilerSample',
+{
+	'stage_name' : str,
+	'start_time' : float,
+	'duration' : float,
+	'thread_id' : int
+})
+Profiler = TypedDict('Profiler',
+{
+	'is_enabled' : bool,
+	'start_time' : float,
+	'samples' : List[ProfilerSample]
+})
+ProfilerSummary = TypedDict('ProfilerSummary',
+{
+	'stage_name' : str,
+	'call_count' : int,
+	'total_time' : float,
+	'average_time' : float,
+	'p50_time' : float,
+	'p90_time' : float,
+	'p99_time' : float
+})
 
 WebcamMode = Literal['inline', 'udp', 'v4l2']
 StreamMode = Literal['udp', 'v4l2']
+StreamFrame : TypeAlias = Tuple[float, Future[VisionFrame]]
+StreamStatistics = TypedDict('StreamStatistics',
+{
+	'frame_total' : int,
+	'drop_total' : int,
+	'capture_latency' : float
+})
+
+ContentAnalysis = TypedDict('ContentAnalysis',
+{
+	'sample_total' : int,
+	'sample_count' : int,
+	'nsfw_count' : int,
+	'vision_frames' : List[VisionFrame]
+})
+
+ContentAnalyserStatistics = TypedDict('ContentAnalyserStatistics',
+{
+	'run_count' : int,
+	'save_count' : int
+})
+
+JobContext = TypedDict('JobContext',
+{
+	'reference_vision_frame' : VisionFrame,
+	'reference_face' : Optional[Face],
+	'source_vision_frames' : List[VisionFrame],
+	'source_face' : Optional[Face],
+	'source_audio_path' : Optional[str],
+	'temp_video_fps' : Fps,
+	'processor_modules' : List[ModuleType]
+})
 
 ModelOptions : TypeAlias = Dict[str, Any]
 ModelSet : TypeAlias = Dict[str, ModelOptions]
 ModelInitializer : TypeAlias = NDArray[Any]
 
+ExecutionMode = Literal['thread', 'process']
+WorkerCounter : TypeAlias = Union[Synchronized, Iterator[int]]
+DeviceFrameTotals : TypeAlias = Union[SynchronizedArray, List[int]]
 ExecutionProvider = Literal['cpu', 'coreml', 'cuda', 'directml', 'openvino', 'migraphx', 'rocm', 'tensorrt']
 ExecutionProviderValue = Literal['CPUExecutionProvider', 'CoreMLExecutionProvider', 'CUDAExecutionProvider', 'DmlExecutionProvider', 'OpenVINOExecutionProvider', 'MIGraphXExecutionProvider', 'ROCMExecutionProvider', 'TensorrtExecutionProvider']
 ExecutionProviderSet : TypeAlias = Dict[ExecutionProvider, ExecutionProviderValue]
@@ -231,6 +359,31 @@ AppContext = Literal['cli', 'ui']
 
 InferencePool : TypeAlias = Dict[str, InferenceSession]
 InferencePoolSet : TypeAlias = Dict[AppContext, Dict[str, InferencePool]]
+InferenceInputs : TypeAlias = Dict[str, Any]
+InferenceOutputs : TypeAlias = List[Any]
+InferenceValue : TypeAlias = Union[NDArray[Any], OrtValue]
+InferenceBinding = TypedDict('InferenceBinding',
+{
+	'io_binding' : IOBinding,
+	'input_values' : Dict[str, OrtValue],
+	'output_values' : Dict[str, OrtValue]
+})
+InferenceBindingSet : TypeAlias = 'OrderedDict[Tuple[Any, ...], InferenceBinding]'
+InferenceThreadBindingSet : TypeAlias = Dict[int, InferenceBindingSet]
+InferenceRequest = TypedDict('InferenceRequest',
+{
+	'inputs' : InferenceInputs,
+	'outputs' : Optional[InferenceOutputs],
+	'exception' : Optional[Exception]
+})
+InferenceBatch = TypedDict('InferenceBatch',
+{
+	'condition' : threading.Condition,
+	'requests' : List[InferenceRequest],
+	'batch_size' : Optional[int],
+	'has_batch_outputs' : bool,
+	'is_running' : bool
+})
 
 UiWorkflow = Literal['instant_runner', 'job_runner', 'job_manager']
 
@@ -273,11 +426,18 @@ StateKey = Literal\
 	'benchmark_mode',
 	'benchmark_resolutions',
 	'benchmark_cycle_count',
+	'benchmark_suite',
+	'benchmark_models',
+	'benchmark_thread_counts',
+	'benchmark_face_counts',
+	'benchmark_output_path',
+	'benchmark_compare_path',
 	'face_detector_model',
 	'face_detector_size',
 	'face_detector_margin',
 	'face_detector_angles',
 	'face_detector_score',
+	'face_tracker_interval',
 	'face_landmarker_model',
 	'face_landmarker_score',
 	'face_selector_mode',
@@ -300,6 +460,7 @@ StateKey = Literal\
 	'trim_frame_start',
 	'trim_frame_end',
 	'temp_frame_format',
+	'frame_pipeline',
 	'keep_temp',
 	'output_image_quality',
 	'output_image_scale',
@@ -318,10 +479,14 @@ StateKey = Literal\
 	'execution_device_ids',
 	'execution_providers',
 	'execution_thread_count',
+	'execution_mode',
+	'execution_batch_size',
 	'video_memory_strategy',
 	'system_memory_limit',
 	'log_level',
 	'halt_on_error',
+	'profiler_path',
+	'profiler_format',
 	'job_id',
 	'job_status',
 	'step_index'
@@ -343,11 +508,18 @@ State = TypedDict('State',
 	'benchmark_mode' : BenchmarkMode,
 	'benchmark_resolutions' : List[BenchmarkResolution],
 	'benchmark_cycle_count' : int,
+	'benchmark_suite' : bool,
+	'benchmark_models' : List[str],
+	'benchmark_thread_counts' : List[int],
+	'benchmark_face_counts' : List[int],
+	'benchmark_output_path' : Optional[str],
+	'benchmark_compare_path' : Optional[str],
 	'face_detector_model' : FaceDetectorModel,
 	'face_detector_size' : str,
 	'face_detector_margin': Margin,
 	'face_detector_angles' : List[Angle],
 	'face_detector_score' : Score,
+	'face_tracker_interval' : int,
 	'face_landmarker_model' : FaceLandmarkerModel,
 	'face_landmarker_score' : Score,
 	'face_selector_mode' : FaceSelectorMode,
@@ -370,6 +542,7 @@ State = TypedDict('State',
 	'trim_frame_start' : int,
 	'trim_frame_end' : int,
 	'temp_frame_format' : TempFrameFormat,
+	'frame_pipeline' : FramePipeline,
 	'keep_temp' : bool,
 	'output_image_quality' : int,
 	'output_image_scale' : Scale,
@@ -388,14 +561,19 @@ State = TypedDict('State',
 	'execution_device_ids' : List[int],
 	'execution_providers' : List[ExecutionProvider],
 	'execution_thread_count' : int,
+	'execution_mode' : ExecutionMode,
+	'execution_batch_size' : int,
 	'video_memory_strategy' : VideoMemoryStrategy,
 	'system_memory_limit' : int,
 	'log_level' : LogLevel,
 	'halt_on_error' : bool,
+	'profiler_path' : Optional[str],
+	'profiler_format' : ProfilerFormat,
 	'job_id' : str,
 	'job_status' : JobStatus,
 	'step_index' : int
 })
 ApplyStateItem : TypeAlias = Callable[[Any, Any], None]
 StateSet : TypeAlias = Dict[AppContext, State]
+StateSnapshot : TypeAlias = Mapping[str, Any]
 
@@ -1,5 +1,6 @@
-from typing import Dict, List
+from typing import Dict, List, Sequence
 
+from faceswap_colab.common_helper import create_int_range
 from faceswap_colab.types import Color, WebcamMode
 from faceswap_colab.uis.types import JobManagerAction, JobRunnerAction, PreviewMode
 
@@ -13,6 +14,7 @@ preview_resolutions : List[str] = [ '512x512', '768x768', '1024x1024' ]
 
 webcam_modes : List[WebcamMode] = [ 'inline', 'udp', 'v4l2' ]
 webcam_resolutions : List[str] = [ '320x240', '640x480', '800x600', '1024x768', '1280x720', '1280x960', '1920x1080' ]
+webcam_latency_range : Sequence[int] = create_int_range(50, 1000, 50)
 
 background_remover_colors : Dict[str, Color] =\
 {
@@ -6,6 +6,7 @@ import gradio
 import numpy
 
 from faceswap_colab import logger, process_manager, state_manager, translator
+from faceswap_colab.app_context import use_app_context
 from faceswap_colab.audio import create_empty_audio_frame, get_voice_frame
 from faceswap_colab.common_helper import get_first
 from faceswap_colab.content_analyser import analyse_frame
@@ -218,6 +219,7 @@ def clear_and_update_preview_image(preview_mode : PreviewMode, preview_resolutio
 	return update_preview_image(preview_mode, preview_resolution, frame_number)
 
 
+@use_app_context('ui')
 def process_preview_frame(reference_vision_frame : VisionFrame, source_vision_frames : List[VisionFrame], source_audio_frame : AudioFrame, source_voice_frame : AudioFrame, target_vision_frame : VisionFrame, preview_mode : PreviewMode, preview_resolution : str) -> VisionFrame:
 	target_vision_frame = restrict_frame(target_vision_frame, unpack_resolution(preview_resolution))
 	temp_vision_frame = target_vision_frame.copy()
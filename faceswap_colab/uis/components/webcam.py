@@ -6,7 +6,7 @@ import gradio
 from faceswap_colab import state_manager, translator
 from faceswap_colab.camera_manager import clear_camera_pool, get_local_camera_capture
 from faceswap_colab.filesystem import has_image
-from faceswap_colab.streamer import multi_process_capture, open_stream
+from faceswap_colab.streamer import get_stream_statistics, multi_process_capture, open_stream
 from faceswap_colab.types import Fps, VisionFrame, WebcamMode
 from faceswap_colab.uis.core import get_ui_component
 from faceswap_colab.uis.types import File
@@ -14,6 +14,7 @@ from faceswap_colab.vision import unpack_resolution
 
 SOURCE_FILE : Optional[gradio.File] = None
 WEBCAM_IMAGE : Optional[gradio.Image] = None
+WEBCAM_STATISTICS_TEXTBOX : Optional[gradio.Textbox] = None
 WEBCAM_START_BUTTON : Optional[gradio.Button] = None
 WEBCAM_STOP_BUTTON : Optional[gradio.Button] = None
 
@@ -21,6 +22,7 @@ WEBCAM_STOP_BUTTON : Optional[gradio.Button] = None
 def render() -> None:
 	global SOURCE_FILE
 	global WEBCAM_IMAGE
+	global WEBCAM_STATISTICS_TEXTBOX
 	global WEBCAM_START_BUTTON
 	global WEBCAM_STOP_BUTTON
 
@@ -35,6 +37,12 @@ def render() -> None:
 		format = 'jpeg',
 		visible = False
 	)
+	WEBCAM_STATISTICS_TEXTBOX = gradio.Textbox(
+		label = translator.get('uis.webcam_statistics_textbox'),
+		value = read_stream_statistics,
+		every = 0.5,
+		visible = False
+	)
 	WEBCAM_START_BUTTON = gradio.Button(
 		value = translator.get('uis.start_button'),
 		variant = 'primary',
@@ -53,13 +61,14 @@ def listen() -> None:
 	webcam_mode_radio = get_ui_component('webcam_mode_radio')
 	webcam_resolution_dropdown = get_ui_component('webcam_resolution_dropdown')
 	webcam_fps_slider = get_ui_component('webcam_fps_slider')
+	webcam_latency_slider = get_ui_component('webcam_latency_slider')
 
-	if webcam_device_id_dropdown and webcam_mode_radio and webcam_resolution_dropdown and webcam_fps_slider:
-		WEBCAM_START_BUTTON.click(pre_start, outputs = [ SOURCE_FILE, WEBCAM_IMAGE, WEBCAM_START_BUTTON, WEBCAM_STOP_BUTTON ])
-		start_event = WEBCAM_START_BUTTON.click(start, inputs = [ webcam_device_id_dropdown, webcam_mode_radio, webcam_resolution_dropdown, webcam_fps_slider ], outputs = WEBCAM_IMAGE)
+	if webcam_device_id_dropdown and webcam_mode_radio and webcam_resolution_dropdown and webcam_fps_slider and webcam_latency_slider:
+		WEBCAM_START_BUTTON.click(pre_start, outputs = [ SOURCE_FILE, WEBCAM_IMAGE, WEBCAM_STATISTICS_TEXTBOX, WEBCAM_START_BUTTON, WEBCAM_STOP_BUTTON ])
+		start_event = WEBCAM_START_BUTTON.click(start, inputs = [ webcam_device_id_dropdown, webcam_mode_radio, webcam_resolution_dropdown, webcam_fps_slider, webcam_latency_slider ], outputs = WEBCAM_IMAGE)
 		start_event.then(pre_stop)
 		WEBCAM_STOP_BUTTON.click(stop, cancels = start_event, outputs = WEBCAM_IMAGE)
-		WEBCAM_STOP_BUTTON.click(pre_stop, outputs = [ SOURCE_FILE, WEBCAM_IMAGE, WEBCAM_START_BUTTON, WEBCAM_STOP_BUTTON ])
+		WEBCAM_STOP_BUTTON.click(pre_stop, outputs = [ SOURCE_FILE, WEBCAM_IMAGE, WEBCAM_STATISTICS_TEXTBOX, WEBCAM_START_BUTTON, WEBCAM_STOP_BUTTON ])
 
 
 def update_source(files : List[File]) -> gradio.File:
@@ -74,15 +83,25 @@ def update_source(files : List[File]) -> gradio.File:
 	return gradio.File(value = None)
 
 
-def pre_start() -> Tuple[gradio.File, gradio.Image, gradio.Button, gradio.Button]:
-	return gradio.File(visible = False), gradio.Image(visible = True), gradio.Button(visible = False), gradio.Button(visible = True)
+def pre_start() -> Tuple[gradio.File, gradio.Image, gradio.Textbox, gradio.Button, gradio.Button]:
+	return gradio.File(visible = False), gradio.Image(visible = True), gradio.Textbox(visible = True), gradio.Button(visible = False), gradio.Button(visible = True)
+
 
+def pre_stop() -> Tuple[gradio.File, gradio.Image, gradio.Textbox, gradio.Button, gradio.Button]:
+	return gradio.File(visible = True), gradio.Image(visible = False), gradio.Textbox(visible = False), gradio.Button(visible = True), gradio.Button(visible = False)
 
-def pre_stop() -> Tuple[gradio.File, gradio.Image, gradio.Button, gradio.Button]:
-	return gradio.File(visible = True), gradio.Image(visible = False), gradio.Button(visible = True), gradio.Button(visible = False)
+
+def read_stream_statistics() -> str:
+	stream_statistics = get_stream_statistics()
+
+	return translator.get('streaming_statistics').format(
+		capture_latency = round(stream_statistics.get('capture_latency')),
+		drop_total = stream_statistics.get('drop_total'),
+		frame_total = stream_statistics.get('frame_total')
+	)
 
 
-def start(webcam_device_id : int, webcam_mode : WebcamMode, webcam_resolution : str, webcam_fps : Fps) -> Iterator[VisionFrame]:
+def start(webcam_device_id : int, webcam_mode : WebcamMode, webcam_resolution : str, webcam_fps : Fps, webcam_latency : int) -> Iterator[VisionFrame]:
 	state_manager.init_item('face_selector_mode', 'one')
 	state_manager.sync_state()
 
@@ -98,7 +117,7 @@ def start(webcam_device_id : int, webcam_mode : WebcamMode, webcam_resolution :
 		camera_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, webcam_height)
 		camera_capture.set(cv2.CAP_PROP_FPS, webcam_fps)
 
-		for capture_frame in multi_process_capture(camera_capture, webcam_fps):
+		for capture_frame in multi_process_capture(camera_capture, webcam_fps, int(webcam_latency)):
 			capture_frame = cv2.cvtColor(capture_frame, cv2.COLOR_BGR2RGB)
 
 			if webcam_mode == 'inline':
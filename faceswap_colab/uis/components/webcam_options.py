@@ -4,7 +4,7 @@ import gradio
 
 from faceswap_colab import translator
 from faceswap_colab.camera_manager import detect_local_camera_ids
-from faceswap_colab.common_helper import get_first
+from faceswap_colab.common_helper import calculate_int_step, get_first
 from faceswap_colab.uis import choices as uis_choices
 from faceswap_colab.uis.core import register_ui_component
 
@@ -12,6 +12,7 @@ WEBCAM_DEVICE_ID_DROPDOWN : Optional[gradio.Dropdown] = None
 WEBCAM_MODE_RADIO : Optional[gradio.Radio] = None
 WEBCAM_RESOLUTION_DROPDOWN : Optional[gradio.Dropdown] = None
 WEBCAM_FPS_SLIDER : Optional[gradio.Slider] = None
+WEBCAM_LATENCY_SLIDER : Optional[gradio.Slider] = None
 
 
 def render() -> None:
@@ -19,6 +20,7 @@ def render() -> None:
 	global WEBCAM_MODE_RADIO
 	global WEBCAM_RESOLUTION_DROPDOWN
 	global WEBCAM_FPS_SLIDER
+	global WEBCAM_LATENCY_SLIDER
 
 	local_camera_ids = detect_local_camera_ids(0, 10) or [ 'none' ] #type:ignore[list-item]
 	WEBCAM_DEVICE_ID_DROPDOWN = gradio.Dropdown(
@@ -43,7 +45,15 @@ def render() -> None:
 		minimum = 1,
 		maximum = 30
 	)
+	WEBCAM_LATENCY_SLIDER = gradio.Slider(
+		label = translator.get('uis.webcam_latency_slider'),
+		value = 200,
+		step = calculate_int_step(uis_choices.webcam_latency_range),
+		minimum = uis_choices.webcam_latency_range[0],
+		maximum = uis_choices.webcam_latency_range[-1]
+	)
 	register_ui_component('webcam_device_id_dropdown', WEBCAM_DEVICE_ID_DROPDOWN)
 	register_ui_component('webcam_mode_radio', WEBCAM_MODE_RADIO)
 	register_ui_component('webcam_resolution_dropdown', WEBCAM_RESOLUTION_DROPDOWN)
 	register_ui_component('webcam_fps_slider', WEBCAM_FPS_SLIDER)
+	register_ui_component('webcam_latency_slider', WEBCAM_LATENCY_SLIDER)
@@ -85,6 +85,7 @@ ComponentName = Literal\
 	'ui_workflow_dropdown',
 	'webcam_device_id_dropdown',
 	'webcam_fps_slider',
+	'webcam_latency_slider',
 	'webcam_mode_radio',
 	'webcam_resolution_dropdown'
 ]
@@ -0,0 +1,152 @@
+import bisect
+import shutil
+import subprocess
+from collections import OrderedDict
+from typing import List, Optional
+
+import cv2
+
+from faceswap_colab.thread_helper import thread_semaphore
+from faceswap_colab.types import Fps, VideoIndex, VideoIndexSet, VisionFrame
+
+VIDEO_INDEX_SET : VideoIndexSet = {}
+VIDEO_INDEX_FRAME_LIMIT : int = 16
+VIDEO_INDEX_GRAB_LIMIT : int = 30
+VIDEO_INDEX_PROBE_WINDOW : int = 10
+
+
+def get_video_index(video_path : str, video_capture : Optional[cv2.VideoCapture]) -> Optional[VideoIndex]:
+	if video_capture and video_capture.isOpened():
+		with thread_semaphore():
+			video_index = VIDEO_INDEX_SET.get(video_path)
+
+			if not video_index or video_index.get('video_capture') is not video_capture:
+				video_index = create_video_index(video_capture)
+				VIDEO_INDEX_SET[video_path] = video_index
+			return video_index
+
+	return None
+
+
+def create_video_index(video_capture : cv2.VideoCapture) -> VideoIndex:
+	return\
+	{
+		'video_capture': video_capture,
+		'frame_total': int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+		'fps': video_capture.get(cv2.CAP_PROP_FPS),
+		'resolution': (int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))),
+		'start_time': None,
+		'keyframe_numbers': [],
+		'keyframe_windows': set(),
+		'frame_position': 0,
+		'vision_frames': OrderedDict()
+	}
+
+
+def read_video_index_frame(video_path : str, video_index : VideoIndex, frame_position : int) -> Optional[VisionFrame]:
+	with thread_semaphore():
+		vision_frame = video_index.get('vision_frames').get(frame_position)
+
+		if vision_frame is not None:
+			video_index.get('vision_frames').move_to_end(frame_position)
+			return vision_frame.copy()
+
+		video_capture = video_index.get('video_capture')
+
+		if is_sequential_read(video_path, video_index, frame_position):
+			step_video_index(video_index, frame_position)
+		else:
+			video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_position)
+
+		has_vision_frame, vision_frame = video_capture.read()
+		video_index['frame_position'] = frame_position + 1
+
+		if has_vision_frame:
+			store_video_index_frame(video_index, frame_position, vision_frame)
+			return vision_frame.copy()
+
+	return None
+
+
+def is_sequential_read(video_path : str, video_index : VideoIndex, frame_position : int) -> bool:
+	current_position = video_index.get('frame_position')
+	video_fps = video_index.get('fps')
+
+	if frame_position == current_position:
+		return True
+	if frame_position < current_position or not video_fps:
+		return False
+	if frame_position - current_position > video_fps * VIDEO_INDEX_PROBE_WINDOW:
+		return False
+	if probe_keyframe_windows(video_path, video_index, current_position, frame_position):
+		keyframe_numbers = video_index.get('keyframe_numbers')
+		return bisect.bisect_right(keyframe_numbers, frame_position) == bisect.bisect_right(keyframe_numbers, current_position)
+	return frame_position - current_position <= VIDEO_INDEX_GRAB_LIMIT
+
+
+def step_video_index(video_index : VideoIndex, frame_position : int) -> None:
+	video_capture = video_index.get('video_capture')
+
+	for step_position in range(video_index.get('frame_position'), frame_position):
+		if frame_position - step_position > VIDEO_INDEX_FRAME_LIMIT // 2:
+			video_capture.grab()
+		else:
+			has_vision_frame, vision_frame = video_capture.read()
+
+			if has_vision_frame:
+				store_video_index_frame(video_index, step_position, vision_frame)
+
+
+def store_video_index_frame(video_index : VideoIndex, frame_position : int, vision_frame : VisionFrame) -> None:
+	vision_frames = video_index.get('vision_frames')
+	vision_frames[frame_position] = vision_frame
+
+	while len(vision_frames) > VIDEO_INDEX_FRAME_LIMIT:
+		vision_frames.popitem(last = False)
+
+
+def probe_keyframe_windows(video_path : str, video_index : VideoIndex, start_position : int, end_position : int) -> bool:
+	video_fps = video_index.get('fps')
+
+	if shutil.which('ffprobe'):
+		if video_index.get('start_time') is None:
+			video_index['start_time'] = probe_start_time(video_path)
+
+		for window_index in range(int(start_position / video_fps) // VIDEO_INDEX_PROBE_WINDOW, int(end_position / video_fps) // VIDEO_INDEX_PROBE_WINDOW + 1):
+			if window_index not in video_index.get('keyframe_windows'):
+				keyframe_numbers = probe_keyframe_numbers(video_path, video_fps, video_index.get('start_time'), window_index * VIDEO_INDEX_PROBE_WINDOW)
+				video_index['keyframe_numbers'] = sorted(set(video_index.get('keyframe_numbers')).union(keyframe_numbers))
+				video_index.get('keyframe_windows').add(window_index)
+		return True
+
+	return False
+
+
+def probe_start_time(video_path : str) -> float:
+	commands = [ shutil.which('ffprobe'), '-loglevel', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=start_time', '-of', 'csv=print_section=0', video_path ]
+	process = subprocess.run(commands, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL)
+	start_time = process.stdout.decode().strip()
+
+	if start_time and start_time != 'N/A':
+		return float(start_time)
+	return 0
+
+
+def probe_keyframe_numbers(video_path : str, video_fps : Fps, start_time : float, window_time : int) -> List[int]:
+	read_interval = str(start_time + window_time) + '%+' + str(VIDEO_INDEX_PROBE_WINDOW)
+	commands = [ shutil.which('ffprobe'), '-loglevel', 'error', '-select_streams', 'v:0', '-read_intervals', read_interval, '-show_entries', 'packet=pts_time,flags', '-of', 'csv=print_section=0', video_path ]
+	process = subprocess.run(commands, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL)
+	keyframe_numbers = []
+
+	for packet_line in process.stdout.decode().splitlines():
+		pts_time, _, flags = packet_line.partition(',')
+
+		if pts_time and pts_time != 'N/A' and 'K' in flags:
+			keyframe_numbers.append(round((float(pts_time) - start_time) * video_fps))
+
+	return keyframe_numbers
+
+
+def clear_video_index() -> None:
+	with thread_semaphore():
+		VIDEO_INDEX_SET.clear()
@@ -1,5 +1,6 @@
 import cv2
 
+from faceswap_colab import video_index
 from faceswap_colab.types import VideoPoolSet
 
 VIDEO_POOL_SET : VideoPoolSet =\
@@ -30,6 +31,8 @@ def get_video_writer(video_path : str) -> cv2.VideoWriter:
 
 
 def clear_video_pool() -> None:
+	video_index.clear_video_index()
+
 	for video_capture in VIDEO_POOL_SET.get('capture').values():
 		video_capture.release()
 
@@ -1,17 +1,23 @@
 import math
+import threading
 from functools import lru_cache
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 import cv2
 import numpy
 from cv2.typing import Size
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.typing import DTypeLike, NDArray
 
 from faceswap_colab.common_helper import is_windows
 from faceswap_colab.filesystem import get_file_extension, is_image, is_video
-from faceswap_colab.thread_helper import thread_semaphore
+from faceswap_colab.profiler import profile
 from faceswap_colab.types import ColorMode, Duration, Fps, Mask, Orientation, Resolution, Scale, VisionFrame
+from faceswap_colab.video_index import get_video_index, read_video_index_frame
 from faceswap_colab.video_manager import get_video_capture
 
+TILE_FRAME_BUFFER : threading.local = threading.local()
+
 
 def read_static_images(image_paths : List[str], color_mode : ColorMode = 'rgb') -> List[VisionFrame]:
 	vision_frames = []
@@ -27,6 +33,7 @@ def read_static_image(image_path : str, color_mode : ColorMode = 'rgb') -> Optio
 	return read_image(image_path, color_mode)
 
 
+@profile()
 def read_image(image_path : str, color_mode : ColorMode = 'rgb') -> Optional[VisionFrame]:
 	if is_image(image_path):
 		flag = cv2.IMREAD_COLOR
@@ -41,6 +48,7 @@ def read_image(image_path : str, color_mode : ColorMode = 'rgb') -> Optional[Vis
 	return None
 
 
+@profile()
 def write_image(image_path : str, vision_frame : VisionFrame) -> bool:
 	if image_path:
 		if is_windows():
@@ -77,29 +85,21 @@ def read_static_video_frame(video_path : str, frame_number : int = 0) -> Optiona
 
 def read_video_frame(video_path : str, frame_number : int = 0) -> Optional[VisionFrame]:
 	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
-
-		if video_capture and video_capture.isOpened():
-			frame_total = video_capture.get(cv2.CAP_PROP_FRAME_COUNT)
-
-			with thread_semaphore():
-				video_capture.set(cv2.CAP_PROP_POS_FRAMES, min(frame_total, frame_number - 1))
-				has_vision_frame, vision_frame = video_capture.read()
+		video_index = get_video_index(video_path, get_video_capture(video_path))
 
-			if has_vision_frame:
-				return vision_frame
+		if video_index:
+			frame_position = max(min(video_index.get('frame_total'), frame_number - 1), 0)
+			return read_video_index_frame(video_path, video_index, frame_position)
 
 	return None
 
 
 def count_video_frame_total(video_path : str) -> int:
 	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
+		video_index = get_video_index(video_path, get_video_capture(video_path))
 
-		if video_capture and video_capture.isOpened():
-			with thread_semaphore():
-				video_frame_total = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-				return video_frame_total
+		if video_index:
+			return video_index.get('frame_total')
 
 	return 0
 
@@ -114,12 +114,10 @@ def predict_video_frame_total(video_path : str, fps : Fps, trim_frame_start : in
 
 def detect_video_fps(video_path : str) -> Optional[float]:
 	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
+		video_index = get_video_index(video_path, get_video_capture(video_path))
 
-		if video_capture and video_capture.isOpened():
-			with thread_semaphore():
-				video_fps = video_capture.get(cv2.CAP_PROP_FPS)
-				return video_fps
+		if video_index:
+			return video_index.get('fps')
 
 	return None
 
@@ -167,13 +165,10 @@ def restrict_trim_frame(video_path : str, trim_frame_start : Optional[int], trim
 
 def detect_video_resolution(video_path : str) -> Optional[Resolution]:
 	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
+		video_index = get_video_index(video_path, get_video_capture(video_path))
 
-		if video_capture and video_capture.isOpened():
-			with thread_semaphore():
-				width = video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)
-				height = video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
-				return int(width), int(height)
+		if video_index:
+			return video_index.get('resolution')
 
 	return None
 
@@ -307,46 +302,40 @@ def blend_vision_frames(source_vision_frame : VisionFrame, target_vision_frame :
 	return blend_vision_frame
 
 
-def create_tile_frames(vision_frame : VisionFrame, size : Size) -> Tuple[List[VisionFrame], int, int]:
+def create_tile_frames(vision_frame : VisionFrame, size : Size) -> Tuple[VisionFrame, int, int]:
+	vision_height, vision_width, vision_channel = vision_frame.shape
 	tile_width = size[0] - 2 * size[2]
 	pad_size_top = size[1] + size[2]
-	pad_size_bottom = pad_size_top + tile_width - (vision_frame.shape[0] + 2 * size[1]) % tile_width
-	pad_size_right = pad_size_top + tile_width - (vision_frame.shape[1] + 2 * size[1]) % tile_width
-	pad_vision_frame = numpy.pad(vision_frame, ((pad_size_top, pad_size_bottom), (pad_size_top, pad_size_right), (0, 0)))
-	pad_height, pad_width = pad_vision_frame.shape[:2]
-	row_range = range(size[2], pad_height - size[2], tile_width)
-	col_range = range(size[2], pad_width - size[2], tile_width)
-	tile_vision_frames = []
-
-	for row_vision_frame in row_range:
-		top = row_vision_frame - size[2]
-		bottom = row_vision_frame + size[2] + tile_width
-
-		for column_vision_frame in col_range:
-			left = column_vision_frame - size[2]
-			right = column_vision_frame + size[2] + tile_width
-			tile_vision_frames.append(pad_vision_frame[top:bottom, left:right, :])
-
+	pad_size_bottom = pad_size_top + tile_width - (vision_height + 2 * size[1]) % tile_width
+	pad_size_right = pad_size_top + tile_width - (vision_width + 2 * size[1]) % tile_width
+	pad_height = pad_size_top + vision_height + pad_size_bottom
+	pad_width = pad_size_top + vision_width + pad_size_right
+	pad_vision_frame = get_tile_frame_buffer('pad_vision_frame', (pad_height, pad_width, vision_channel), vision_frame.dtype)
+	pad_vision_frame[pad_size_top:pad_size_top + vision_height, pad_size_top:pad_size_top + vision_width] = vision_frame
+	tile_vision_frames = sliding_window_view(pad_vision_frame, (size[0], size[0]), axis = (0, 1))[::tile_width, ::tile_width]
+	tile_vision_frames = tile_vision_frames.transpose(0, 1, 3, 4, 2).reshape(-1, size[0], size[0], vision_channel)
 	return tile_vision_frames, pad_width, pad_height
 
 
-def merge_tile_frames(tile_vision_frames : List[VisionFrame], temp_width : int, temp_height : int, pad_width : int, pad_height : int, size : Size) -> VisionFrame:
-	merge_vision_frame = numpy.zeros((pad_height, pad_width, 3)).astype(numpy.uint8)
-	tile_width = tile_vision_frames[0].shape[1] - 2 * size[2]
-	tiles_per_row = min(pad_width // tile_width, len(tile_vision_frames))
+def merge_tile_frames(tile_vision_frames : VisionFrame, temp_width : int, temp_height : int, pad_width : int, pad_height : int, size : Size) -> VisionFrame:
+	tile_width = tile_vision_frames.shape[2] - 2 * size[2]
+	merge_height = pad_height - 2 * size[2]
+	merge_width = pad_width - 2 * size[2]
+	row_total = merge_height // tile_width
+	column_total = merge_width // tile_width
+	merge_vision_frame = get_tile_frame_buffer('merge_vision_frame', (merge_height, merge_width, tile_vision_frames.shape[3]), tile_vision_frames.dtype)
+	tile_vision_frames = tile_vision_frames.reshape(row_total, column_total, *tile_vision_frames.shape[1:])
+	merge_vision_frame.reshape(row_total, tile_width, column_total, tile_width, -1).transpose(0, 2, 1, 3, 4)[:] = tile_vision_frames[:, :, size[2]:size[2] + tile_width, size[2]:size[2] + tile_width]
+	return merge_vision_frame[size[1]:size[1] + temp_height, size[1]:size[1] + temp_width].copy()
+
 
-	for index, tile_vision_frame in enumerate(tile_vision_frames):
-		tile_vision_frame = tile_vision_frame[size[2]:-size[2], size[2]:-size[2]]
-		row_index = index // tiles_per_row
-		col_index = index % tiles_per_row
-		top = row_index * tile_vision_frame.shape[0]
-		bottom = top + tile_vision_frame.shape[0]
-		left = col_index * tile_vision_frame.shape[1]
-		right = left + tile_vision_frame.shape[1]
-		merge_vision_frame[top:bottom, left:right, :] = tile_vision_frame
+def get_tile_frame_buffer(buffer_name : str, buffer_shape : Tuple[int, ...], buffer_dtype : DTypeLike) -> NDArray[Any]:
+	tile_frame_buffer = getattr(TILE_FRAME_BUFFER, buffer_name, None)
 
-	merge_vision_frame = merge_vision_frame[size[1] : size[1] + temp_height, size[1]: size[1] + temp_width, :]
-	return merge_vision_frame
+	if tile_frame_buffer is None or tile_frame_buffer.shape != buffer_shape or tile_frame_buffer.dtype != buffer_dtype:
+		tile_frame_buffer = numpy.zeros(buffer_shape, dtype = buffer_dtype)
+		setattr(TILE_FRAME_BUFFER, buffer_name, tile_frame_buffer)
+	return tile_frame_buffer
 
 
 def extract_vision_mask(vision_frame : VisionFrame) -> Mask:
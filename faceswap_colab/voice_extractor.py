@@ -7,6 +7,7 @@ import scipy
 from faceswap_colab import inference_manager, state_manager
 from faceswap_colab.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from faceswap_colab.filesystem import resolve_relative_path
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.thread_helper import thread_semaphore
 from faceswap_colab.types import Audio, AudioChunk, DownloadScope, DownloadSet, InferencePool, ModelSet, Voice, VoiceChunk
 
@@ -152,7 +153,7 @@ def extract_voice(temp_audio_chunk : AudioChunk) -> VoiceChunk:
 def forward(temp_audio_chunk : AudioChunk) -> AudioChunk:
 	voice_extractor = get_inference_pool().get(state_manager.get_item('voice_extractor_model'))
 
-	with thread_semaphore():
+	with thread_semaphore(), profile_stage(inference_manager.get_inference_stage_name(voice_extractor)):
 		temp_audio_chunk = voice_extractor.run(None,
 		{
 			'input': temp_audio_chunk
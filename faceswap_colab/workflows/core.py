@@ -1,4 +1,4 @@
-from faceswap_colab import logger, process_manager, translator
+from faceswap_colab import logger, process_manager, profiler, state_manager, translator
 
 
 def is_process_stopping() -> bool:
@@ -6,3 +6,21 @@ def is_process_stopping() -> bool:
 		process_manager.end()
 		logger.info(translator.get('processing_stopped'), __name__)
 	return process_manager.is_pending()
+
+
+def start_profiler() -> None:
+	if state_manager.get_item('profiler_path'):
+		profiler.clear_profiler()
+		profiler.enable_profiler()
+
+
+def finish_profiler() -> None:
+	profiler_path = state_manager.get_item('profiler_path')
+
+	if profiler_path:
+		profiler.disable_profiler()
+
+		if profiler.export_profiler(profiler_path, state_manager.get_item('profiler_format')):
+			logger.info(translator.get('exporting_profiler_succeeded').format(profiler_path = profiler_path), __name__)
+		else:
+			logger.warn(translator.get('exporting_profiler_failed').format(profiler_path = profiler_path), __name__)
@@ -1,5 +1,9 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import subprocess
+from collections import deque
+from concurrent.futures import Future, as_completed
 from functools import partial
+from time import time
+from typing import Deque, List, Optional, Tuple
 
 import numpy
 from tqdm import tqdm
@@ -8,52 +12,237 @@ from faceswap_colab import ffmpeg
 from faceswap_colab import logger, process_manager, state_manager, translator, video_manager
 from faceswap_colab.audio import create_empty_audio_frame, get_audio_frame, get_voice_frame
 from faceswap_colab.common_helper import get_first
-from faceswap_colab.content_analyser import analyse_video
+from faceswap_colab.content_analyser import clear_content_analyser_statistics, collect_content_frame, create_content_analysis, finalize_content_analysis, get_content_analyser_statistics, is_content_sample, resolve_content_analysis
+from faceswap_colab.face_store import clear_static_faces, create_frame_key, get_face_store, set_static_faces
+from faceswap_colab.face_tracker import clear_face_tracker, track_faces
 from faceswap_colab.filesystem import filter_audio_paths, is_video
+from faceswap_colab.process_pool import clear_frame_ring, count_device_frame, create_executor, create_frame_ring, get_device_frame_totals, get_frame_slot
 from faceswap_colab.processors.core import get_processors_modules
+from faceswap_colab.profiler import profile_stage
 from faceswap_colab.temp_helper import clear_temp_directory, create_temp_directory, move_temp_file, resolve_temp_frame_paths
 from faceswap_colab.time_helper import calculate_end_time
-from faceswap_colab.types import ErrorCode
-from faceswap_colab.vision import conditional_merge_vision_mask, detect_video_resolution, extract_vision_mask, pack_resolution, read_static_image, read_static_images, read_static_video_frame, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, scale_resolution, write_image
-from faceswap_colab.workflows.core import is_process_stopping
+from faceswap_colab.types import ErrorCode, Face, VisionFrame
+from faceswap_colab.vision import conditional_merge_vision_mask, detect_video_resolution, extract_vision_mask, merge_vision_mask, normalize_resolution, pack_resolution, predict_video_frame_total, read_image, read_static_image, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, scale_resolution, write_image
+from faceswap_colab.workflows.core import finish_profiler, is_process_stopping, start_profiler
+from faceswap_colab.workflows.job_context import clear_job_context, get_job_context
 
 
 def process(start_time : float) -> ErrorCode:
 	tasks =\
 	[
 		setup,
-		extract_frames,
-		process_video,
-		merge_frames,
+		process_frames,
 		restore_audio,
 		partial(finalize_video, start_time)
 	]
 	process_manager.start()
+	start_profiler()
 
 	for task in tasks:
-		error_code = task() # type:ignore[operator]
+		with profile_stage('image_to_video.' + getattr(task, 'func', task).__name__):
+			error_code = task() # type:ignore[operator]
 
 		if error_code > 0:
 			process_manager.end()
+			finish_profiler()
 			return error_code
 
 	process_manager.end()
+	finish_profiler()
 	return 0
 
 
 def setup() -> ErrorCode:
-	trim_frame_start, trim_frame_end = restrict_trim_frame(state_manager.get_item('target_path'), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
-
-	if analyse_video(state_manager.get_item('target_path'), trim_frame_start, trim_frame_end):
-		return 3
-
+	clear_content_analyser_statistics()
 	logger.debug(translator.get('clearing_temp'), __name__)
 	clear_temp_directory(state_manager.get_item('target_path'))
 	logger.debug(translator.get('creating_temp'), __name__)
 	create_temp_directory(state_manager.get_item('target_path'))
+	clear_static_faces()
+	clear_job_context()
+	get_job_context()
+	return 0
+
+
+def process_frames() -> ErrorCode:
+	if state_manager.get_item('frame_pipeline') == 'stream' and not state_manager.get_item('keep_temp'):
+		with profile_stage('image_to_video.stream_frames'):
+			error_code = stream_frames()
+
+		if error_code != 1:
+			return error_code
+		logger.warn(translator.get('streaming_frames_failed'), __name__)
+
+	for task in [ extract_frames, analyse_frames, process_video, merge_frames ]:
+		with profile_stage('image_to_video.' + task.__name__):
+			error_code = task()
+
+		if error_code > 0:
+			return error_code
 	return 0
 
 
+def stream_frames() -> ErrorCode:
+	trim_frame_start, trim_frame_end = restrict_trim_frame(state_manager.get_item('target_path'), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
+	output_video_resolution = scale_resolution(detect_video_resolution(state_manager.get_item('target_path')), state_manager.get_item('output_video_scale'))
+	temp_video_resolution = normalize_resolution(restrict_video_resolution(state_manager.get_item('target_path'), output_video_resolution))
+	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+	stream_frame_total = predict_video_frame_total(state_manager.get_item('target_path'), temp_video_fps, trim_frame_start, trim_frame_end)
+	pixel_format, channel_total = resolve_pipe_format()
+	temp_video_width, temp_video_height = temp_video_resolution
+	frame_shape = (temp_video_height, temp_video_width, channel_total)
+	frame_size = temp_video_width * temp_video_height * channel_total
+	reorder_deque : Deque[Tuple[Future[Optional[VisionFrame]], Optional[VisionFrame]]] = deque()
+	reorder_limit = state_manager.get_item('execution_thread_count') * 2
+	frame_ring = create_frame_ring(frame_shape, reorder_limit)
+	content_analysis = create_content_analysis(stream_frame_total, temp_video_fps)
+	frame_number = 0
+	is_piped = True
+	is_nsfw = False
+
+	clear_face_tracker()
+	logger.info(translator.get('streaming_frames').format(resolution = pack_resolution(temp_video_resolution), fps = temp_video_fps), __name__)
+	decode_process = ffmpeg.open_video_decoder(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end, pixel_format)
+	encode_process = ffmpeg.open_video_encoder(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, output_video_resolution, state_manager.get_item('output_video_fps'), pixel_format)
+
+	process_start_time = time()
+	is_failed = True
+
+	try:
+		with tqdm(total = stream_frame_total, desc = translator.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+			progress.set_postfix(execution_providers = state_manager.get_item('execution_providers'))
+
+			with create_executor() as executor:
+				try:
+					while is_piped and not is_nsfw and not is_process_stopping():
+						vision_buffer = decode_process.stdout.read(frame_size)
+
+						if len(vision_buffer) < frame_size:
+							break
+
+						target_vision_frame = numpy.frombuffer(vision_buffer, dtype = numpy.uint8).reshape(frame_shape)
+						target_faces = None
+
+						if is_content_sample(frame_number, temp_video_fps):
+							collect_content_frame(content_analysis, target_vision_frame[:, :, :3])
+							is_nsfw = resolve_content_analysis(content_analysis) is True
+
+						if state_manager.get_item('face_tracker_interval') > 1:
+							target_faces = track_faces(target_vision_frame, create_frame_key(state_manager.get_item('target_path'), frame_number), frame_number)
+
+						if frame_ring:
+							frame_slot = get_frame_slot(frame_ring.name, frame_shape, frame_number % reorder_limit)
+							frame_slot[:] = target_vision_frame
+							reorder_deque.append((executor.submit(process_shared_frame, frame_ring.name, frame_shape, frame_number % reorder_limit, frame_number, target_faces), frame_slot))
+						else:
+							reorder_deque.append((executor.submit(process_vision_frame, target_vision_frame, frame_number), None))
+						frame_number += 1
+
+						while is_piped and len(reorder_deque) >= reorder_limit:
+							is_piped = pipe_vision_frame(encode_process, collect_vision_frame(reorder_deque.popleft()), channel_total)
+							progress.update()
+
+					while is_piped and reorder_deque and not is_nsfw and not is_process_stopping():
+						is_piped = pipe_vision_frame(encode_process, collect_vision_frame(reorder_deque.popleft()), channel_total)
+						progress.update()
+				finally:
+					for future, _ in reorder_deque:
+						future.cancel()
+		is_failed = False
+	except Exception as exception:
+		logger.debug(str(exception), __name__)
+	finally:
+		reorder_deque.clear()
+		frame_slot = None
+
+		if frame_ring:
+			clear_frame_ring(frame_ring)
+		if is_failed:
+			decode_process.terminate()
+			encode_process.terminate()
+
+	report_device_frames(process_start_time)
+
+	if is_failed:
+		return 1
+
+	if is_process_stopping():
+		decode_process.terminate()
+		encode_process.terminate()
+		return 4
+
+	if is_nsfw or finalize_content_analysis(content_analysis):
+		decode_process.terminate()
+		encode_process.terminate()
+		clear_temp_directory(state_manager.get_item('target_path'))
+		return 3
+
+	close_pipe(decode_process, encode_process)
+
+	for processor_module in get_processors_modules(state_manager.get_item('processors')):
+		processor_module.post_process()
+
+	if is_piped and frame_number > 0 and encode_process.returncode == 0:
+		logger.debug(translator.get('streaming_frames_succeeded'), __name__)
+		return 0
+	return 1
+
+
+def resolve_pipe_format() -> Tuple[str, int]:
+	if ffmpeg.resolve_video_encoder(state_manager.get_item('target_path')) == 'libvpx-vp9':
+		return 'bgra', 4
+	return 'bgr24', 3
+
+
+def process_shared_frame(shared_memory_name : str, frame_shape : Tuple[int, int, int], slot_index : int, frame_number : int, target_faces : Optional[List[Face]]) -> None:
+	frame_slot = get_frame_slot(shared_memory_name, frame_shape, slot_index)
+	target_vision_frame = frame_slot.copy()
+
+	if target_faces is not None:
+		set_static_faces(create_frame_key(state_manager.get_item('target_path'), frame_number), target_faces)
+
+	frame_slot[:] = conform_vision_frame(process_vision_frame(target_vision_frame, frame_number), frame_shape[2])
+
+
+def collect_vision_frame(reorder_item : Tuple[Future[Optional[VisionFrame]], Optional[VisionFrame]]) -> VisionFrame:
+	future, frame_slot = reorder_item
+	vision_frame = future.result()
+
+	if frame_slot is not None:
+		return frame_slot
+	return vision_frame
+
+
+def conform_vision_frame(vision_frame : VisionFrame, channel_total : int) -> VisionFrame:
+	if channel_total == 4 and vision_frame.shape[2] == 3:
+		vision_frame = merge_vision_mask(vision_frame, extract_vision_mask(vision_frame))
+	if channel_total == 3:
+		vision_frame = vision_frame[:, :, :3]
+	return vision_frame
+
+
+def pipe_vision_frame(encode_process : subprocess.Popen[bytes], vision_frame : VisionFrame, channel_total : int) -> bool:
+	vision_frame = conform_vision_frame(vision_frame, channel_total)
+
+	try:
+		encode_process.stdin.write(vision_frame.tobytes())
+		return True
+	except OSError:
+		return False
+
+
+def close_pipe(decode_process : subprocess.Popen[bytes], encode_process : subprocess.Popen[bytes]) -> None:
+	decode_process.stdout.close()
+	decode_process.terminate()
+	decode_process.wait()
+
+	try:
+		encode_process.stdin.close()
+	except OSError:
+		pass
+	encode_process.wait()
+
+
 def extract_frames() -> ErrorCode:
 	trim_frame_start, trim_frame_end = restrict_trim_frame(state_manager.get_item('target_path'), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
 	output_video_resolution = scale_resolution(detect_video_resolution(state_manager.get_item('target_path')), state_manager.get_item('output_video_scale'))
@@ -71,6 +260,24 @@ def extract_frames() -> ErrorCode:
 	return 0
 
 
+def analyse_frames() -> ErrorCode:
+	temp_frame_paths = resolve_temp_frame_paths(state_manager.get_item('target_path'))
+	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+	content_analysis = create_content_analysis(len(temp_frame_paths), temp_video_fps)
+
+	for frame_number, temp_frame_path in enumerate(temp_frame_paths):
+		if resolve_content_analysis(content_analysis) is not None:
+			break
+
+		if is_content_sample(frame_number, temp_video_fps):
+			collect_content_frame(content_analysis, read_image(temp_frame_path))
+
+	if finalize_content_analysis(content_analysis):
+		clear_temp_directory(state_manager.get_item('target_path'))
+		return 3
+	return 0
+
+
 def process_video() -> ErrorCode:
 	temp_frame_paths = resolve_temp_frame_paths(state_manager.get_item('target_path'))
 
@@ -78,11 +285,20 @@ def process_video() -> ErrorCode:
 		with tqdm(total = len(temp_frame_paths), desc = translator.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
 			progress.set_postfix(execution_providers = state_manager.get_item('execution_providers'))
 
-			with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
+			process_start_time = time()
+
+			clear_face_tracker()
+
+			with create_executor() as executor:
 				futures = []
 
 				for frame_number, temp_frame_path in enumerate(temp_frame_paths):
-					future = executor.submit(process_temp_frame, temp_frame_path, frame_number)
+					target_faces = None
+
+					if state_manager.get_item('face_tracker_interval') > 1:
+						target_faces = track_faces(read_static_image(temp_frame_path, 'rgba'), create_frame_key(state_manager.get_item('target_path'), frame_number), frame_number)
+
+					future = executor.submit(process_temp_frame, temp_frame_path, frame_number, target_faces)
 					futures.append(future)
 
 				for future in as_completed(futures):
@@ -94,6 +310,8 @@ def process_video() -> ErrorCode:
 						future.result()
 						progress.update()
 
+		report_device_frames(process_start_time)
+
 		for processor_module in get_processors_modules(state_manager.get_item('processors')):
 			processor_module.post_process()
 
@@ -152,40 +370,62 @@ def restore_audio() -> ErrorCode:
 	return 0
 
 
-def process_temp_frame(temp_frame_path : str, frame_number : int) -> bool:
-	reference_vision_frame = read_static_video_frame(state_manager.get_item('target_path'), state_manager.get_item('reference_frame_number'))
-	source_vision_frames = read_static_images(state_manager.get_item('source_paths'))
-	source_audio_path = get_first(filter_audio_paths(state_manager.get_item('source_paths')))
-	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+def process_temp_frame(temp_frame_path : str, frame_number : int, target_faces : Optional[List[Face]]) -> bool:
 	target_vision_frame = read_static_image(temp_frame_path, 'rgba')
+
+	if target_faces is not None:
+		set_static_faces(create_frame_key(state_manager.get_item('target_path'), frame_number), target_faces)
+
+	temp_vision_frame = process_vision_frame(target_vision_frame, frame_number)
+	return write_image(temp_frame_path, temp_vision_frame)
+
+
+def process_vision_frame(target_vision_frame : VisionFrame, frame_number : int) -> VisionFrame:
+	job_context = get_job_context()
+	target_vision_key = create_frame_key(state_manager.get_item('target_path'), frame_number)
 	temp_vision_frame = target_vision_frame.copy()
 	temp_vision_mask = extract_vision_mask(temp_vision_frame)
 
-	source_audio_frame = get_audio_frame(source_audio_path, temp_video_fps, frame_number)
-	source_voice_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
+	source_audio_frame = get_audio_frame(job_context.get('source_audio_path'), job_context.get('temp_video_fps'), frame_number)
+	source_voice_frame = get_voice_frame(job_context.get('source_audio_path'), job_context.get('temp_video_fps'), frame_number)
 
 	if not numpy.any(source_audio_frame):
 		source_audio_frame = create_empty_audio_frame()
 	if not numpy.any(source_voice_frame):
 		source_voice_frame = create_empty_audio_frame()
 
-	for processor_module in get_processors_modules(state_manager.get_item('processors')):
+	for processor_module in job_context.get('processor_modules'):
 		temp_vision_frame, temp_vision_mask = processor_module.process_frame(
 		{
-			'reference_vision_frame': reference_vision_frame,
-			'source_vision_frames': source_vision_frames,
+			'reference_vision_frame': job_context.get('reference_vision_frame'),
+			'reference_face': job_context.get('reference_face'),
+			'source_vision_frames': job_context.get('source_vision_frames'),
+			'source_face': job_context.get('source_face'),
 			'source_audio_frame': source_audio_frame,
 			'source_voice_frame': source_voice_frame,
 			'target_vision_frame': target_vision_frame[:, :, :3],
+			'target_vision_key': target_vision_key,
 			'temp_vision_frame': temp_vision_frame[:, :, :3],
 			'temp_vision_mask': temp_vision_mask
 		})
 
-	temp_vision_frame = conditional_merge_vision_mask(temp_vision_frame, temp_vision_mask)
-	return write_image(temp_frame_path, temp_vision_frame)
+	count_device_frame()
+	return conditional_merge_vision_mask(temp_vision_frame, temp_vision_mask)
+
+
+def report_device_frames(start_time : float) -> None:
+	process_seconds = max(time() - start_time, 0.001)
+
+	for execution_device_id, frame_total in get_device_frame_totals().items():
+		logger.info(translator.get('processing_device_frames').format(execution_device_id = execution_device_id, frame_total = frame_total, fps = round(frame_total / process_seconds, 2)), __name__)
 
 
 def finalize_video(start_time : float) -> ErrorCode:
+	face_store = get_face_store()
+	content_analyser_statistics = get_content_analyser_statistics()
+	clear_job_context()
+	logger.debug(translator.get('content_analyser_statistics').format(run_count = content_analyser_statistics.get('run_count'), save_count = content_analyser_statistics.get('save_count')), __name__)
+	logger.debug(translator.get('face_store_statistics').format(hit_count = face_store.get('hit_count'), miss_count = face_store.get('miss_count'), evict_count = face_store.get('evict_count')), __name__)
 	logger.debug(translator.get('clearing_temp'), __name__)
 	clear_temp_directory(state_manager.get_item('target_path'))
 
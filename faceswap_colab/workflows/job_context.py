@@ -0,0 +1,53 @@
+import threading
+from typing import Optional
+
+from faceswap_colab import state_manager
+from faceswap_colab.common_helper import get_first
+from faceswap_colab.face_selector import extract_reference_face, extract_source_face
+from faceswap_colab.filesystem import filter_audio_paths
+from faceswap_colab.processors.core import get_processors_modules
+from faceswap_colab.types import JobContext
+from faceswap_colab.vision import read_static_images, read_static_video_frame, restrict_video_fps
+
+JOB_CONTEXT : Optional[JobContext] = None
+JOB_CONTEXT_LOCK : threading.Lock = threading.Lock()
+
+
+def get_job_context() -> JobContext:
+	global JOB_CONTEXT
+
+	with JOB_CONTEXT_LOCK:
+		if JOB_CONTEXT is None:
+			JOB_CONTEXT = create_job_context()
+	return JOB_CONTEXT
+
+
+def create_job_context() -> JobContext:
+	reference_vision_frame = read_static_video_frame(state_manager.get_item('target_path'), state_manager.get_item('reference_frame_number'))
+	source_vision_frames = read_static_images(state_manager.get_item('source_paths'))
+	reference_face = None
+	source_face = None
+
+	if state_manager.get_item('face_selector_mode') == 'reference':
+		reference_face = extract_reference_face(reference_vision_frame)
+
+	if 'face_swapper' in state_manager.get_item('processors'):
+		source_face = extract_source_face(source_vision_frames)
+
+	return\
+	{
+		'reference_vision_frame': reference_vision_frame,
+		'reference_face': reference_face,
+		'source_vision_frames': source_vision_frames,
+		'source_face': source_face,
+		'source_audio_path': get_first(filter_audio_paths(state_manager.get_item('source_paths'))),
+		'temp_video_fps': restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps')),
+		'processor_modules': get_processors_modules(state_manager.get_item('processors'))
+	}
+
+
+def clear_job_context() -> None:
+	global JOB_CONTEXT
+
+	with JOB_CONTEXT_LOCK:
+		JOB_CONTEXT = None